@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import DailySalesRollup, DailyOrderRollup, InventoryForecast, ProductListing, RollupCheckpoint
 
-# Register your models here.
+admin.site.register(DailySalesRollup)
+admin.site.register(DailyOrderRollup)
+admin.site.register(RollupCheckpoint)
+admin.site.register(ProductListing)
+admin.site.register(InventoryForecast)
@@ -0,0 +1,180 @@
+"""
+Streaming izvoz (NDJSON / CSV) za narudžbe, proizvode i inventar.
+
+Redovi se čitaju u serijama preko `values()` (bez ModelSerializer-a po redu)
+i odmah šalju klijentu, opciono gzip-ovani u letu, pa memorija ostaje ista
+bez obzira na broj redova. Filteri i pretraga dolaze iz odgovarajućeg
+viewseta, tako da `?category=3&search=lap` radi isto kao na listi; redovi
+se uvijek izvoze po rastućem `id`.
+
+Za velike izvoze `export_to_file()` (posao `dashboard.export`) upisuje isti
+sadržaj, gzip-ovan, u storage umjesto u odgovor.
+"""
+
+import csv
+import datetime
+import io
+import tempfile
+import uuid
+import zlib
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, QueryDict
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework.request import Request
+
+from shop.views import ProductViewSet
+from store.views import InventoryViewSet, OrderViewSet
+
+CHUNK_SIZE = 2000
+
+EXPORT_RESOURCES = {
+    "products": {
+        "viewset": ProductViewSet,
+        "annotations": {"category_name": F("category__name")},
+        "columns": [
+            "id", "name", "sku", "price", "category", "category_name",
+            "description", "created", "updated",
+        ],
+    },
+    "orders": {
+        "viewset": OrderViewSet,
+        "annotations": {
+            "user_name": F("user__username"),
+            "item_count": Coalesce(Sum("items__quantity"), 0),
+            "total": Coalesce(
+                Sum(F("items__quantity") * F("items__final_price")),
+                Value(0),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        },
+        "columns": [
+            "id", "user", "user_name", "payment", "shipping_address",
+            "time_created", "time_updated", "status", "item_count", "total",
+        ],
+    },
+    "inventory": {
+        "viewset": InventoryViewSet,
+        "annotations": {
+            "product_name": F("product__name"),
+            "sku": F("product__sku"),
+        },
+        "columns": [
+            "id", "product", "product_name", "sku", "quantity_in",
+            "quantity_out", "stock", "status", "discount",
+        ],
+    },
+}
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def filtered_queryset(resource, request):
+    """
+    Primjenjuje filter backend-e viewseta (DjangoFilterBackend, SearchFilter,
+    OrderingFilter) na osnovni queryset resursa.
+    """
+    config = EXPORT_RESOURCES[resource]
+    view = config["viewset"](
+        request=Request(request), format_kwarg=None, action="list", kwargs={}
+    )
+    queryset = view.filter_queryset(view.queryset.all())
+    return queryset.annotate(**config["annotations"])
+
+
+def iter_rows(queryset, columns, chunk_size=CHUNK_SIZE):
+    """
+    Čita redove u serijama po primarnom ključu (keyset), umjesto jednog
+    velikog upita — mysqlclient inače cijeli rezultat drži u memoriji.
+    """
+    queryset = queryset.order_by()
+    last_pk = None
+    while True:
+        batch = queryset.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        rows = list(batch.values(*columns)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1]["id"]
+        if len(rows) < chunk_size:
+            return
+
+
+def _encode_ndjson(rows, columns):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return "".join(encoder.encode(row) + "\n" for row in rows)
+
+
+def _csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([[_csv_value(row[column]) for column in columns] for row in rows])
+    return buffer.getvalue()
+
+
+ENCODERS = {
+    "ndjson": _encode_ndjson,
+    "csv": _encode_csv,
+}
+
+
+def stream_export(queryset, columns, export_format, compress=False):
+    """
+    Generator koji vraća bajtove izvoza, serija po serija.
+    """
+    encode = ENCODERS[export_format]
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def emit(text):
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    if export_format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(columns)
+        yield emit(header.getvalue())
+
+    for rows in iter_rows(queryset, columns):
+        chunk = emit(encode(rows, columns))
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
+
+
+def export_to_file(resource, export_format, params):
+    """
+    Izvoz u gzip fajl u storage-u (`exports/`), sa istim filterima kao
+    `?params` na listi. Vraća ime i URL fajla.
+    """
+    request = HttpRequest()
+    request.method = "GET"
+    request.GET = QueryDict(mutable=True)
+    for key, values in params.items():
+        request.GET.setlist(key, values if isinstance(values, list) else [values])
+
+    queryset = filtered_queryset(resource, request)
+    columns = EXPORT_RESOURCES[resource]["columns"]
+    with tempfile.TemporaryFile() as output:
+        for chunk in stream_export(queryset, columns, export_format, compress=True):
+            output.write(chunk)
+        output.seek(0)
+        name = default_storage.save(
+            f"exports/{resource}-{uuid.uuid4().hex[:12]}.{export_format}.gz", File(output)
+        )
+    return {"file": name, "url": default_storage.url(name)}
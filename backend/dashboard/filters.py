@@ -0,0 +1,37 @@
+import django_filters
+
+from shop.filters import ProductFilter
+from .models import InventoryForecast, ProductListing
+
+
+# -----------------------------
+# ✅ ProductListing filteri
+# -----------------------------
+class ProductListingFilter(django_filters.FilterSet):
+    category__descendants = django_filters.NumberFilter(method="filter_descendants")
+
+    class Meta:
+        model = ProductListing
+        fields = {
+            "category": ["exact"],
+            "status": ["exact"],
+            "effective_price": ["gte", "lte"],
+            "stock": ["gte", "lte"],
+        }
+
+    # Isto kao na /api/products/: putanja kategorije je na povezanoj Category
+    filter_descendants = ProductFilter.filter_descendants
+
+
+# -----------------------------
+# ✅ InventoryForecast filteri
+# -----------------------------
+class InventoryForecastFilter(django_filters.FilterSet):
+    class Meta:
+        model = InventoryForecast
+        fields = {
+            "category": ["exact"],
+            "needs_reorder": ["exact"],
+            "days_of_cover": ["lte", "gte"],
+            "stock": ["lte"],
+        }
@@ -0,0 +1,265 @@
+"""
+Prognoza brzine prodaje i pokrivenosti zalihe po proizvodu.
+
+Dnevna prodaja (komadi) iz store.OrderItem za posljednjih HISTORY_DAYS
+završenih dana učita se jednim grupisanim upitom po seriji proizvoda u
+NumPy matricu (proizvod x dan). Nad cijelom matricom se odjednom računa:
+
+- pokretni prosjek zadnjih MA_DAYS dana i eksponencijalno izglađena brzina
+  (EWMA, raspon EWMA_SPAN dana),
+- dani pokrivenosti: zaliha / EWMA brzina,
+- tačka ponovnog naručivanja: brzina * vrijeme isporuke + sigurnosna
+  zaliha (z * σ dnevne prodaje * √vremena isporuke).
+
+Rezultat se čuva u InventoryForecast. Puno preračunavanje se radi kad se
+promijeni dan (pomjera se prozor istorije); inače se preračunavaju samo
+proizvodi sa promijenjenom zalihom, narudžbama iz prozora (high-water mark
+na Order.time_updated) ili bez reda u tabeli.
+"""
+
+import math
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.registry import enqueue
+from shop.bulk import BATCH_SIZE, chunks
+from shop.models import Product
+from store.models import Inventory, Order, OrderItem
+from .models import InventoryForecast, RollupCheckpoint
+
+CHECKPOINT_NAME = "inventory_forecast"
+
+HISTORY_DAYS = 56
+MA_DAYS = 28
+EWMA_SPAN = 14
+# Otkazane narudžbe ne ulaze u prodaju
+EXCLUDED_STATUSES = ("canceled",)
+
+UPDATE_FIELDS = [
+    "name", "sku", "category", "stock", "units_sold", "velocity_ma", "velocity_ewma",
+    "days_of_cover", "reorder_point", "needs_reorder", "computed_for", "refreshed_at",
+]
+
+
+def lead_time_days():
+    return getattr(settings, "FORECAST_LEAD_TIME_DAYS", 7)
+
+
+def service_level_z():
+    # 1.65 ≈ 95% vjerovatnoća da zaliha pokrije potražnju tokom isporuke
+    return getattr(settings, "FORECAST_SERVICE_LEVEL_Z", 1.65)
+
+
+def forecast_day():
+    return timezone.localdate()
+
+
+def compute(sales, stock, lead_time=None, z=None):
+    """
+    Vektorizovana prognoza. `sales` je matrica (proizvodi x dani, najstariji
+    dan prvi), `stock` niz zaliha. Vraća dict nizova dužine broja proizvoda.
+    """
+    lead_time = lead_time_days() if lead_time is None else lead_time
+    z = service_level_z() if z is None else z
+    sales = np.asarray(sales, dtype=np.float64)
+    stock = np.asarray(stock, dtype=np.float64)
+
+    recent = sales[:, -MA_DAYS:]
+    velocity_ma = recent.mean(axis=1)
+    alpha = 2.0 / (EWMA_SPAN + 1)
+    # Najnoviji dan ima težinu 1, svaki stariji (1 - alpha) puta manju
+    weights = (1 - alpha) ** np.arange(sales.shape[1])[::-1]
+    velocity_ewma = sales @ weights / weights.sum()
+    sigma = recent.std(axis=1)
+
+    selling = velocity_ewma > 0
+    days_of_cover = np.full(len(stock), np.nan)
+    np.divide(np.maximum(stock, 0), velocity_ewma, out=days_of_cover, where=selling)
+    # Zaokruživanje prije ceil: 2.0000000001 * 7 ne smije postati 15
+    reorder_point = np.ceil(np.round(velocity_ewma * lead_time + z * sigma * math.sqrt(lead_time), 6))
+    return {
+        "units_sold": sales.sum(axis=1).astype(np.int64),
+        "velocity_ma": velocity_ma,
+        "velocity_ewma": velocity_ewma,
+        "days_of_cover": days_of_cover,
+        "reorder_point": reorder_point.astype(np.int64),
+        "needs_reorder": (reorder_point > 0) & (stock <= reorder_point),
+    }
+
+
+def _history_bounds(day):
+    start = day - timedelta(days=HISTORY_DAYS)
+    tz = timezone.get_current_timezone()
+    return start, datetime.combine(start, time.min, tz), datetime.combine(day, time.min, tz)
+
+
+def load_sales(product_ids, day):
+    """
+    Matrica dnevne prodaje za `product_ids` (redovi u tom redoslijedu) za
+    HISTORY_DAYS dana prije `day`.
+    """
+    start, since, until = _history_bounds(day)
+    index = {product_id: row for row, product_id in enumerate(product_ids)}
+    rows = list(
+        OrderItem.objects.filter(
+            product_id__in=product_ids,
+            order__time_created__gte=since,
+            order__time_created__lt=until,
+        )
+        .exclude(order__status__in=EXCLUDED_STATUSES)
+        .annotate(day=TruncDate("order__time_created"))
+        .values("product_id", "day")
+        .annotate(units=Sum("quantity"))
+        .values_list("product_id", "day", "units")
+        .order_by()
+    )
+    sales = np.zeros((len(product_ids), HISTORY_DAYS))
+    if rows:
+        product_col, day_col, units = zip(*rows)
+        np.add.at(
+            sales,
+            (
+                np.fromiter((index[p] for p in product_col), dtype=np.intp, count=len(rows)),
+                np.fromiter(((d - start).days for d in day_col), dtype=np.intp, count=len(rows)),
+            ),
+            np.asarray(units, dtype=np.float64),
+        )
+    return sales
+
+
+def _stock_by_product(product_ids=None):
+    inventory = Inventory.objects.all()
+    if product_ids is not None:
+        inventory = inventory.filter(product_id__in=product_ids)
+    return dict(
+        inventory.values("product_id")
+        .annotate(total=Sum("stock"))
+        .values_list("product_id", "total")
+        .order_by()
+    )
+
+
+def build_rows(product_ids, day):
+    """
+    Gradi (nesačuvane) InventoryForecast instance za zadane proizvode.
+    """
+    products = list(
+        Product.objects.filter(id__in=product_ids).order_by("id").values_list("id", "name", "sku", "category_id")
+    )
+    ids = [product[0] for product in products]
+    stock = _stock_by_product(ids)
+    result = compute(load_sales(ids, day), [stock.get(product_id) or 0 for product_id in ids])
+
+    def rounded(value):
+        return None if math.isnan(value) else round(float(value), 3)
+
+    return [
+        InventoryForecast(
+            product_id=product_id,
+            name=name,
+            sku=sku,
+            category_id=category_id,
+            stock=stock.get(product_id) or 0,
+            units_sold=int(result["units_sold"][row]),
+            velocity_ma=rounded(result["velocity_ma"][row]),
+            velocity_ewma=rounded(result["velocity_ewma"][row]),
+            days_of_cover=rounded(result["days_of_cover"][row]),
+            reorder_point=int(result["reorder_point"][row]),
+            needs_reorder=bool(result["needs_reorder"][row]),
+            computed_for=day,
+        )
+        for row, (product_id, name, sku, category_id) in enumerate(products)
+    ]
+
+
+def refresh_forecasts(product_ids, day=None):
+    """
+    Upisuje/ažurira prognozu za zadane proizvode. Vraća broj redova.
+    """
+    day = day or forecast_day()
+    conflict_kwargs = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_kwargs["unique_fields"] = ["product"]
+
+    total = 0
+    for chunk in chunks(sorted(set(product_ids))):
+        rows = build_rows(chunk, day)
+        with transaction.atomic():
+            InventoryForecast.objects.bulk_create(
+                rows,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                update_fields=UPDATE_FIELDS,
+                **conflict_kwargs,
+            )
+        total += len(rows)
+    return total
+
+
+def _changed_products(checkpoint, day):
+    _, since, _ = _history_bounds(day)
+    changed = set(
+        OrderItem.objects.filter(
+            order__time_updated__gt=checkpoint.high_water_mark,
+            order__time_created__gte=since,
+        )
+        .values_list("product_id", flat=True)
+        .distinct()
+    )
+    stored = dict(InventoryForecast.objects.values_list("product_id", "stock"))
+    current = _stock_by_product()
+    changed.update(
+        product_id for product_id in stored.keys() | current.keys()
+        if (current.get(product_id) or 0) != stored.get(product_id)
+    )
+    changed.update(Product.objects.filter(forecast__isnull=True).values_list("id", flat=True))
+    return changed
+
+
+def refresh_forecast(full=False):
+    """
+    Puno preračunavanje pri promjeni dana (ili `full`), inače samo izmijenjeni
+    proizvodi. Vraća broj preračunatih proizvoda.
+    """
+    day = forecast_day()
+    checkpoint, _ = RollupCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+    high_water_mark = Order.objects.aggregate(latest=Max("time_updated"))["latest"]
+
+    stale = InventoryForecast.objects.exclude(computed_for=day).exists()
+    if full or stale or checkpoint.high_water_mark is None:
+        count = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Product.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:BATCH_SIZE]
+            )
+            if not ids:
+                break
+            count += refresh_forecasts(ids, day)
+            last_id = ids[-1]
+    else:
+        count = refresh_forecasts(_changed_products(checkpoint, day), day)
+
+    checkpoint.high_water_mark = high_water_mark or timezone.now()
+    checkpoint.save(update_fields=["high_water_mark"])
+    return count
+
+
+def ensure_forecast():
+    """
+    Ništa ne računa u zahtjevu: dok prognoza nikad nije izgrađena, dodaje
+    puno preračunavanje u pozadinski red i vraća taj posao (view odgovara
+    503); zastarjelu (od juče) osvježava u pozadini i vraća None. Pri
+    deployu je gradi `manage.py refresh_inventory_forecast --full`.
+    """
+    if not RollupCheckpoint.objects.filter(name=CHECKPOINT_NAME, high_water_mark__isnull=False).exists():
+        return enqueue("dashboard.refresh_inventory_forecast", full=True, unique=True)
+    if InventoryForecast.objects.exclude(computed_for=forecast_day()).exists():
+        enqueue("dashboard.refresh_inventory_forecast", unique=True)
+    return None
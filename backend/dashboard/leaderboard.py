@@ -0,0 +1,129 @@
+"""
+Rang liste (top N) proizvoda i kategorija po prihodu ili količini.
+
+Rangiranje se radi jednim grupisanim upitom nad store.OrderItem (join na
+narudžbu zbog vremena i na proizvod/kategoriju zbog imena). Prozor
+(`30d`, `12h`, `4w`, `all`) se računa od početka trenutnog "bucketa" od
+LEADERBOARD_BUCKET_SECONDS sekundi, pa svi zahtjevi u istom bucketu imaju
+iste granice i dijele isti keširani rezultat. Nove narudžbe se vide
+najkasnije u sljedećem bucketu.
+"""
+
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from store.models import OrderItem
+
+CACHE_PREFIX = "leaderboard"
+DEFAULT_BUCKET_SECONDS = 300
+
+GROUPINGS = {
+    "product": ("product_id", "product__name"),
+    "category": ("product__category_id", "product__category__name"),
+}
+METRICS = ("revenue", "quantity")
+MAX_LIMIT = 100
+# Najduži prozor; duži se odbija (i ne bi stao u datetime)
+MAX_WINDOW = timedelta(days=3650)
+
+_WINDOW_RE = re.compile(r"^(\d+)([hdw])$")
+_WINDOW_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_window(window):
+    """
+    `30d` -> timedelta(days=30), `all` -> None; ValueError za ostalo,
+    uključujući prozore duže od MAX_WINDOW.
+    """
+    if window == "all":
+        return None
+    match = _WINDOW_RE.match(window or "")
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(window)
+    try:
+        delta = timedelta(**{_WINDOW_UNITS[match.group(2)]: int(match.group(1))})
+    except OverflowError:
+        raise ValueError(window) from None
+    if delta > MAX_WINDOW:
+        raise ValueError(window)
+    return delta
+
+
+def bucket_seconds():
+    return getattr(settings, "LEADERBOARD_BUCKET_SECONDS", DEFAULT_BUCKET_SECONDS)
+
+
+def current_bucket(now=None):
+    """
+    (broj bucketa, početak bucketa kao aware datetime).
+    """
+    size = bucket_seconds()
+    bucket = int((now if now is not None else time.time()) // size)
+    return bucket, datetime.fromtimestamp(bucket * size, tz=timezone.utc)
+
+
+def top(by="product", metric="revenue", since=None, limit=10, status=None):
+    """
+    Lista `{"id", "name", "revenue", "quantity", "order_count"}` sortirana
+    opadajuće po `metric`. Stavke bez cijene ulaze u količinu, ne u prihod.
+    """
+    key, name = GROUPINGS[by]
+    items = OrderItem.objects.all()
+    if since is not None:
+        items = items.filter(order__time_created__gte=since)
+    if status:
+        items = items.filter(order__status=status)
+
+    rows = (
+        items.values(key, name)
+        .annotate(
+            revenue=Coalesce(
+                Sum(F("quantity") * F("final_price")),
+                Value(0),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+            quantity=Coalesce(Sum("quantity"), 0),
+            order_count=Count("order", distinct=True),
+        )
+        .order_by(f"-{metric}", key)[:limit]
+    )
+    return [
+        {
+            "id": row[key],
+            "name": row[name],
+            "revenue": row["revenue"],
+            "quantity": row["quantity"],
+            "order_count": row["order_count"],
+        }
+        for row in rows
+    ]
+
+
+def cached_top(by, metric, window, limit, status=None):
+    """
+    `top()` za prozor `window` keširan po bucketu; vraća i granice prozora.
+    """
+    delta = parse_window(window)
+    bucket, bucket_start = current_bucket()
+    since = bucket_start - delta if delta is not None else None
+
+    cache = caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+    key = f"{CACHE_PREFIX}:{by}:{metric}:{window}:{limit}:{status or ''}:{bucket}"
+    data = cache.get(key)
+    if data is None:
+        data = {
+            "by": by,
+            "metric": metric,
+            "window": window,
+            "since": since,
+            "bucket_start": bucket_start,
+            "results": top(by, metric, since, limit, status),
+        }
+        cache.set(key, data, bucket_seconds())
+    return data
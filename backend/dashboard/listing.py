@@ -0,0 +1,147 @@
+"""
+Održavanje ProductListing read modela: jedan red po proizvodu sa cijenom
+nakon popusta, zalihom i statusom, nazivom kategorije i primarnom slikom
+(original + najmanji thumbnail).
+
+Red se gradi iz shop.Product, store.Inventory (zbir zalihe), store.Discount
+i prve slike proizvoda. Osvježavanje radi u serijama sa fiksnim brojem
+upita po seriji, bez obzira na broj proizvoda.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Max, Min, Sum
+
+from shop.bulk import BATCH_SIZE, chunks
+from shop.models import Product, ProductImage, stock_status
+from shop.thumbnails import thumbnail_sizes
+from store.models import Inventory
+from store.pricing import discounts_for_products, effective_price
+from .models import ProductListing, RollupCheckpoint
+
+CHECKPOINT_NAME = "product_listing"
+
+UPDATE_FIELDS = [
+    "name", "sku", "category", "category_name", "price", "effective_price",
+    "stock", "status", "image", "thumbnail", "refreshed_at",
+]
+
+
+def build_rows(product_ids):
+    """
+    Gradi (nesačuvane) ProductListing instance za zadane proizvode.
+    """
+    products = (
+        Product.objects.filter(id__in=product_ids)
+        .values_list(
+            "id", "name", "sku", "category_id", "category__name", "price",
+            "category__low_stock_threshold",
+        )
+    )
+    stock = dict(
+        Inventory.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(total=Sum("stock"))
+        .values_list("product_id", "total")
+        .order_by()
+    )
+    images = dict(
+        ProductImage.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(first=Min("id"))
+        .values_list("product_id", "first")
+        .order_by()
+    )
+    image_files = {
+        image_id: (name, thumbnails or {})
+        for image_id, name, thumbnails in ProductImage.objects.filter(id__in=images.values())
+        .values_list("id", "image", "thumbnails")
+    }
+    thumbnail_size = str(min(thumbnail_sizes()))
+    discounts = discounts_for_products(product_ids)
+
+    rows = []
+    for product_id, name, sku, category_id, category_name, price, threshold in products:
+        quantity = stock.get(product_id) or 0
+        image, thumbnails = image_files.get(images.get(product_id), ("", {}))
+        thumbnail = thumbnails.get(thumbnail_size, "") if thumbnails.get("source") == image else ""
+        rows.append(ProductListing(
+            product_id=product_id,
+            name=name,
+            sku=sku,
+            category_id=category_id,
+            category_name=category_name or "",
+            price=price,
+            effective_price=effective_price(price, discounts.get(product_id, ())),
+            stock=quantity,
+            status=stock_status(quantity, threshold),
+            image=image or "",
+            thumbnail=thumbnail,
+        ))
+    return rows
+
+
+def refresh_listings(product_ids):
+    """
+    Upisuje/ažurira listing redove za zadane proizvode. Proizvodi koji više
+    ne postoje nemaju red (OneToOne CASCADE ga briše). Vraća broj redova.
+    """
+    conflict_kwargs = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_kwargs["unique_fields"] = ["product"]
+
+    total = 0
+    for chunk in chunks(set(product_ids)):
+        rows = build_rows(chunk)
+        with transaction.atomic():
+            ProductListing.objects.bulk_create(
+                rows,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                update_fields=UPDATE_FIELDS,
+                **conflict_kwargs,
+            )
+        total += len(rows)
+    return total
+
+
+def refresh_all():
+    """
+    Osvježava listing za sve proizvode (keyset po id-u, serija po serija).
+    """
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Product.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            return total
+        total += refresh_listings(ids)
+        last_id = ids[-1]
+
+
+def refresh_incremental(full=False):
+    """
+    Osvježava proizvode izmijenjene nakon posljednjeg checkpointa
+    (Product.updated) i proizvode koji još nemaju listing red.
+
+    Promjene zalihe, popusta i slika stižu preko signala; komanda je
+    rezervni put i za početno punjenje.
+    """
+    checkpoint, _ = RollupCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+    high_water_mark = Product.objects.aggregate(latest=Max("updated"))["latest"]
+
+    if full or checkpoint.high_water_mark is None:
+        count = refresh_all()
+    else:
+        changed = set(
+            Product.objects.filter(updated__gt=checkpoint.high_water_mark).values_list("id", flat=True)
+        )
+        changed.update(
+            Product.objects.filter(listing__isnull=True).values_list("id", flat=True)
+        )
+        count = refresh_listings(changed)
+
+    checkpoint.high_water_mark = high_water_mark
+    checkpoint.save(update_fields=["high_water_mark"])
+    return count
@@ -0,0 +1,204 @@
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ecommerce.urls import router
+from shop.models import Category, Product
+from store.models import Order
+
+
+# PerfMiddleware broji i upite iz drugih niti (async fan-out dashboarda)
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def _percentile(values, fraction):
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def scenarios():
+    """
+    (naziv, URL) za svaku rutu routera (lista + detalj) i česte kombinacije
+    filtera/pretrage/sortiranja na listama koje koristi frontend.
+    """
+    result = []
+    for prefix, viewset, basename in router.registry:
+        result.append((f"{prefix} list", reverse(f"{basename}-list")))
+        first = viewset.queryset.model.objects.order_by("pk").values_list("pk", flat=True).first()
+        if first is not None:
+            result.append((f"{prefix} detail", reverse(f"{basename}-detail", args=[first])))
+
+    category = Category.objects.order_by("pk").values_list("pk", flat=True).first()
+    word = (Product.objects.order_by("pk").values_list("name", flat=True).first() or "a").split()[-1]
+    products = reverse("product-list")
+    result += [
+        ("products ?category&price range", f"{products}?category={category}&price__gte=100&price__lte=500"),
+        ("products ?category__descendants", f"{products}?category__descendants={category}"),
+        ("products ?search", f"{products}?search={word}"),
+        ("products ?ordering=-price", f"{products}?ordering=-price"),
+        ("products page 50", f"{products}?page=50"),
+        ("products cursor ?ordering=price", f"{products}?pagination=cursor&ordering=price"),
+        ("inventory ?status&ordering=-stock", f"{reverse('inventory-list')}?status=low_stock&ordering=-stock"),
+        ("orders page_size=100", f"{reverse('order-list')}?page_size=100"),
+        ("categories tree", reverse("category-tree")),
+        ("product listing ?ordering=effective_price", f"{reverse('product-listing')}?ordering=effective_price"),
+        ("product listing ?category&status", f"{reverse('product-listing')}?category={category}&status=available"),
+        ("dashboard summary", reverse("dashboard-summary")),
+        ("orders-by-month", reverse("orders-by-month")),
+        ("orders-by-month ?status", f"{reverse('orders-by-month')}?status=paid"),
+        ("orders-by-day", reverse("orders-by-day")),
+    ]
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Pokreće benchmark svih API ruta kroz Django test client i upisuje "
+        "latenciju (p50/p95/p99), broj SQL upita i vršnu memoriju po endpointu kao JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Broj mjerenih zahtjeva po endpointu.")
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--warm-cache", action="store_true",
+                            help="Ne briše keš odgovora prije svakog zahtjeva (mjeri keširane odgovore).")
+        parser.add_argument("--only", help="Samo scenariji čiji naziv sadrži ovaj tekst.")
+        parser.add_argument("--output", help="Putanja JSON rezultata (podrazumijevano samo ispis).")
+        parser.add_argument("--compare", help="JSON prethodnog pokretanja za poređenje.")
+        parser.add_argument("--threshold", type=float, default=20.0,
+                            help="Procenat rasta p50 koji se smatra regresijom.")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        self.client = Client(SERVER_NAME="localhost")
+        self.options = options
+        selected = [
+            (name, url) for name, url in scenarios()
+            if not options["only"] or options["only"] in name
+        ]
+        if not selected:
+            raise CommandError("Nijedan scenario ne odgovara --only.")
+
+        results = {}
+        for name, url in selected:
+            results[name] = self._measure(url)
+            row = results[name]
+            self.stdout.write(
+                f"{name:<45} {row['status']}  p50 {row['p50_ms']:>8.1f}ms  p95 {row['p95_ms']:>8.1f}ms  "
+                f"{row['queries']:>3} upita  {row['peak_kb']:>8.0f} KB"
+            )
+
+        report = {"meta": self._meta(), "results": results}
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rezultat upisan u {options['output']}"))
+        if options["compare"]:
+            regressions = self._compare(results, options["compare"], options["threshold"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"Regresije: {', '.join(regressions)}")
+
+    def _get(self, url):
+        if not self.options["warm_cache"]:
+            cache.clear()
+        return self.client.get(url)
+
+    def _measure(self, url):
+        for _ in range(self.options["warmup"]):
+            self._get(url)
+
+        latencies = []
+        for _ in range(max(1, self.options["repeat"])):
+            started = time.perf_counter()
+            response = self._get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+
+        # Upiti i memorija u zasebnom prolazu — tracemalloc usporava mjerenje latencije
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = self._get(url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        content = b"".join(response.streaming_content) if response.streaming else response.content
+        match = SERVER_TIMING_QUERIES.search(response.get("Server-Timing", ""))
+        query_count = int(match.group(1)) if match else len(queries.captured_queries)
+        return {
+            "url": url,
+            "status": response.status_code,
+            "p50_ms": round(_percentile(latencies, 0.50), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+            "p99_ms": round(_percentile(latencies, 0.99), 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "min_ms": round(latencies[0], 2),
+            "max_ms": round(latencies[-1], 2),
+            "queries": query_count,
+            "peak_kb": round(peak / 1024, 1),
+            "bytes": len(content),
+        }
+
+    def _meta(self):
+        return {
+            "commit": _git_commit(),
+            "timestamp": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": self.options["repeat"],
+            "warm_cache": self.options["warm_cache"],
+            "rows": {
+                "products": Product.objects.count(),
+                "categories": Category.objects.count(),
+                "orders": Order.objects.count(),
+            },
+            "argv": sys.argv[1:],
+        }
+
+    def _compare(self, results, path, threshold):
+        with open(path, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        self.stdout.write(f"\nPoređenje sa {path} (commit {baseline['meta'].get('commit')}):")
+        regressions = []
+        for name, row in results.items():
+            before = baseline["results"].get(name)
+            if before is None:
+                continue
+            change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+            query_delta = row["queries"] - before["queries"]
+            regressed = change > threshold or query_delta > 0
+            if regressed:
+                regressions.append(name)
+            line = (
+                f"{name:<45} p50 {before['p50_ms']:>8.1f} -> {row['p50_ms']:>8.1f}ms ({change:+.0f}%)  "
+                f"upiti {before['queries']} -> {row['queries']}"
+            )
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        return regressions
@@ -0,0 +1,110 @@
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+SUMMARY_PATH = "/api/dashboard/summary/"
+
+
+def _percentile(values, fraction):
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Poredi end-to-end latenciju /api/dashboard/summary/ sa paralelnim "
+        "agregatima (asyncio.gather) i redom (?fanout=0), pod uvicorn-om."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="Bazni URL već pokrenutog servera (npr. http://127.0.0.1:8000). "
+                                          "Bez ovoga se pokreće uvicorn sa ecommerce.asgi.")
+        parser.add_argument("--requests", type=int, default=100, help="Broj zahtjeva po načinu rada.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Broj istovremenih klijenata.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--json", action="store_true", help="Ispisuje rezultat kao JSON.")
+
+    def handle(self, *args, **options):
+        server = None
+        base_url = options["url"]
+        if not base_url:
+            server, base_url = self._start_uvicorn()
+        try:
+            results = {
+                mode: self._measure(f"{base_url.rstrip('/')}{SUMMARY_PATH}?fanout={fanout}", options)
+                for mode, fanout in (("serial", 0), ("fanout", 1))
+            }
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for mode, stats in results.items():
+            self.stdout.write(
+                f"{mode:>7}: p50 {stats['p50_ms']:.1f}ms  p95 {stats['p95_ms']:.1f}ms  "
+                f"mean {stats['mean_ms']:.1f}ms  {stats['rps']:.1f} req/s"
+            )
+        speedup = results["serial"]["p50_ms"] / results["fanout"]["p50_ms"] if results["fanout"]["p50_ms"] else 0
+        self.stdout.write(self.style.SUCCESS(f"p50 ubrzanje: {speedup:.2f}x"))
+
+    def _start_uvicorn(self):
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            raise CommandError("uvicorn nije instaliran (pip install uvicorn) — ili proslijedi --url.")
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "ecommerce.asgi:application",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                urllib.request.urlopen(f"{base_url}/api/health/", timeout=1).read()
+                return server, base_url
+            except OSError:
+                if server.poll() is not None:
+                    raise CommandError("uvicorn se nije pokrenuo.")
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError("uvicorn nije odgovorio u roku od 30s.")
+
+    def _request(self, url):
+        started = time.perf_counter()
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            if response.status != 200:
+                raise CommandError(f"{url} -> {response.status}")
+        return (time.perf_counter() - started) * 1000
+
+    def _measure(self, url, options):
+        for _ in range(options["warmup"]):
+            self._request(url)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            latencies = sorted(pool.map(self._request, [url] * options["requests"]))
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": len(latencies),
+            "p50_ms": round(_percentile(latencies, 0.50), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "rps": round(len(latencies) / elapsed, 1),
+        }
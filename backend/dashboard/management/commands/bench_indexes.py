@@ -0,0 +1,131 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from dashboard.seed import clear_seed, seed
+from shop.models import Category, Product
+from shop.models import Inventory as ShopInventory
+from shop.models import Order as ShopOrder
+from store.models import CartItem, Inventory, Order
+
+# Modeli čiji Meta.indexes pokrivaju filtere viewsetova
+INDEXED_MODELS = [Product, ShopInventory, ShopOrder, Order, CartItem, Inventory]
+
+
+def _scenarios(context):
+    since = timezone.now() - timezone.timedelta(days=30)
+    return [
+        ("ProductViewSet ?category&price__gte&price__lte",
+         Product.objects.filter(category=context["category"], price__gte=100, price__lte=500).order_by("price")[:8]),
+        ("store InventoryViewSet ?product&status",
+         Inventory.objects.filter(product=context["product"], status="low_stock")),
+        ("shop InventoryViewSet ?product&status",
+         ShopInventory.objects.filter(product=context["product"], status="low_stock")),
+        ("shop OrderViewSet ?status ordering=-created_at",
+         ShopOrder.objects.filter(status="pending").order_by("-created_at")[:8]),
+        ("store Order status + zadnjih 30 dana",
+         Order.objects.filter(status="paid", time_created__gte=since).order_by("time_created")[:8]),
+        ("orders-by-month (TruncMonth + Count)",
+         Order.objects.filter(time_created__gte=since).annotate(month=TruncMonth("time_created"))
+         .values("month").annotate(order_count=Count("id")).order_by("month")),
+        ("CartItem ?user&status=active",
+         CartItem.objects.filter(user=context["user"], status="active")),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generiše N redova i za česte kombinacije filtera viewsetova ispisuje "
+        "EXPLAIN i vrijeme upita, sa i bez kompozitnih indeksa."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10000)
+        parser.add_argument("--orders", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=20, help="Broj ponavljanja po upitu.")
+        parser.add_argument("--no-seed", action="store_true", help="Koristi postojeće podatke.")
+        parser.add_argument("--keep", action="store_true", help="Ne briše generisane podatke na kraju.")
+        parser.add_argument("--no-compare", action="store_true",
+                            help="Mjeri samo sa indeksima (bez privremenog uklanjanja).")
+        parser.add_argument("--force", action="store_true",
+                            help="Dozvoljava generisanje podataka i uklanjanje indeksa i kada "
+                                 "baza nije SQLite, a DEBUG je isključen.")
+
+    def handle(self, *args, **options):
+        # Generisanje i privremeno uklanjanje indeksa mijenjaju konfigurisanu bazu
+        writes = not options["no_seed"] or not options["no_compare"]
+        if writes and not (settings.DEBUG or connection.vendor == "sqlite" or options["force"]):
+            raise CommandError(
+                f"bench_indexes upisuje podatke i uklanja indekse u bazi '{connection.settings_dict['NAME']}'. "
+                "Pokrenuti uz DEBUG=True ili na SQLite bazi, ili dodati --force "
+                "(za postojeće podatke i bez izmjena: --no-seed --no-compare)."
+            )
+        if not options["no_seed"]:
+            self.stdout.write("Generisanje podataka...")
+            counts = seed(products=options["products"], orders=options["orders"],
+                          cart_items=options["orders"])
+            self.stdout.write(f"Generisano: {counts}")
+
+        try:
+            product = Product.objects.order_by("?").first()
+            context = {
+                "category": Category.objects.order_by("?").first(),
+                "product": product,
+                "user": CartItem.objects.order_by("?").values_list("user", flat=True).first(),
+            }
+            if product is None:
+                self.stderr.write("Nema podataka za mjerenje.")
+                return
+
+            results = {}
+            if not options["no_compare"]:
+                self._drop_indexes()
+                try:
+                    results["bez indeksa"] = self._run(context, options)
+                finally:
+                    self._create_indexes()
+            results["sa indeksima"] = self._run(context, options)
+            self._report(results)
+        finally:
+            if not options["no_seed"] and not options["keep"]:
+                clear_seed()
+
+    def _drop_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.remove_index(model, index)
+
+    def _create_indexes(self):
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+
+    def _run(self, context, options):
+        timings = {}
+        for name, queryset in _scenarios(context):
+            plan = queryset.explain()
+            durations = []
+            for _ in range(options["repeat"]):
+                start = time.perf_counter()
+                list(queryset.all())
+                durations.append((time.perf_counter() - start) * 1000)
+            timings[name] = {"median_ms": statistics.median(durations), "plan": plan}
+        return timings
+
+    def _report(self, results):
+        phases = list(results)
+        for name in results[phases[-1]]:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for phase in phases:
+                timing = results[phase][name]
+                self.stdout.write(f"  {phase:>12}: {timing['median_ms']:8.2f} ms")
+                for line in timing["plan"].splitlines():
+                    self.stdout.write(f"      {line}")
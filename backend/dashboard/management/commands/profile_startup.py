@@ -0,0 +1,92 @@
+import json
+import statistics
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce.startup import run_probe
+
+PHASES = [
+    ("import_django_ms", "import Django-a"),
+    ("setup_ms", "django.setup() (modeli + ready)"),
+    ("middleware_ms", "učitavanje middleware-a"),
+    ("first_request_ms", "prvi zahtjev (sa URL konfiguracijom)"),
+    ("warm_up_ms", "warm_up()"),
+    ("warm_request_ms", "isti zahtjev nakon warm_up()"),
+]
+
+
+def _packages(modules):
+    """
+    Zbir sopstvenog vremena importa po paketu najvišeg nivoa.
+    """
+    totals = defaultdict(float)
+    for module in modules:
+        totals[module["module"].split(".")[0]] += module["self_ms"]
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mjeri hladan start u svježem procesu: faze do prvog odgovora, vrijeme "
+        "import_models()/ready() po aplikaciji i vrijeme importa po modulu (-X importtime)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/health/", help="Putanja prvog zahtjeva.")
+        parser.add_argument("--runs", type=int, default=3, help="Broj procesa; prikazuje se medijana.")
+        parser.add_argument("--limit", type=int, default=20, help="Broj modula/paketa u listi.")
+        parser.add_argument("--budget", type=float, default=None,
+                            help="Greška ako je medijana do prvog odgovora veća (ms). "
+                                 "Podrazumijevano COLD_START_BUDGET_MS.")
+        parser.add_argument("--json", action="store_true", help="Ispisuje rezultat kao JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            runs = [run_probe(options["path"]) for _ in range(max(1, options["runs"]))]
+        except RuntimeError as exc:
+            raise CommandError(f"Probe proces nije uspio:\n{exc}")
+
+        # Detalji iz procesa sa medijanom ukupnog vremena
+        runs.sort(key=lambda run: run["total_ms"])
+        result = runs[len(runs) // 2]
+        result["total_runs_ms"] = [run["total_ms"] for run in runs]
+        budget = options["budget"] if options["budget"] is not None else settings.COLD_START_BUDGET_MS
+        total = statistics.median(result["total_runs_ms"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self._report(result, options["limit"])
+
+        if total > budget:
+            raise CommandError(f"Hladan start {total:.0f}ms > budžet {budget:.0f}ms.")
+        if not options["json"]:
+            self.stdout.write(self.style.SUCCESS(f"Hladan start {total:.0f}ms (budžet {budget:.0f}ms)."))
+
+    def _report(self, result, limit):
+        write = self.stdout.write
+        write(f"{result['path']} -> {result['status']} ({result['bytes']} B), "
+              f"procesi: {', '.join(f'{ms:.0f}' for ms in result['total_runs_ms'])}ms do prvog odgovora, "
+              f"{result['process_ms']:.0f}ms sa startom interpretera")
+
+        write("\nFaze:")
+        for key, label in PHASES:
+            write(f"  {label:<40} {result['phases'][key]:>8.1f}ms")
+
+        write("\nAplikacije (import_models / ready):")
+        apps = sorted(result["apps"], key=lambda app: app.get("import_models_ms", 0) + app.get("ready_ms", 0),
+                      reverse=True)
+        for app in apps[:limit]:
+            write(f"  {app['app']:<24} {app.get('import_models_ms', 0):>8.1f}ms {app.get('ready_ms', 0):>8.1f}ms")
+
+        cold = [module for module in result["modules"] if module["cold"]]
+        write("\nPaketi do prvog odgovora (sopstveno vrijeme importa):")
+        for package, ms in _packages(cold)[:limit]:
+            write(f"  {package:<40} {ms:>8.1f}ms")
+
+        write("\nModuli do prvog odgovora (kumulativno vrijeme importa):")
+        modules = sorted(cold, key=lambda module: module["cumulative_ms"], reverse=True)
+        for module in modules[:limit]:
+            write(f"  {module['module']:<56} {module['cumulative_ms']:>8.1f}ms (sopstveno {module['self_ms']:.1f})")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.forecast import refresh_forecast
+
+
+class Command(BaseCommand):
+    help = "Osvježava prognozu zaliha (brzina prodaje, dani pokrivenosti, tačka naručivanja)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Preračunava prognozu za sve proizvode.",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_forecast(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Preračunato proizvoda: {count}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.listing import refresh_incremental
+
+
+class Command(BaseCommand):
+    help = "Osvježava ProductListing read model (high-water mark na Product.updated + proizvodi bez reda)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ponovo gradi listing za sve proizvode.",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_incremental(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Osvježeno proizvoda: {count}"))
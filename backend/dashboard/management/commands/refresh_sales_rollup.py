@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Inkrementalno osvježava dnevne rollup tabele prodaje (high-water mark na Order.time_updated)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Briše rollup i gradi ga ispočetka iz cijele istorije narudžbi.",
+        )
+
+    def handle(self, *args, **options):
+        days = refresh_rollups(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"Preračunato dana: {days}"))
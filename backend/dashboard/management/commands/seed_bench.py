@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.rollups import refresh_rollups
+from dashboard.seed import DEFAULT_PREFIX, clear_seed, seed
+
+SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def count(value):
+    """
+    Broj sa opcionim sufiksom: 500, 100k, 1M, 2.5m.
+    """
+    text = str(value).strip().lower().replace("_", "")
+    multiplier = SUFFIXES.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    try:
+        number = int(float(text) * multiplier)
+    except ValueError:
+        raise CommandError(f"Neispravan broj: {value}")
+    if number < 0:
+        raise CommandError(f"Broj ne može biti negativan: {value}")
+    return number
+
+
+class Command(BaseCommand):
+    help = (
+        "Generiše sintetičke podatke za benchmark (kategorije, proizvodi, inventar, "
+        "korpe, narudžbe, stavke) preko bulk_create u serijama, npr. "
+        "`seed_bench --products 100k --orders 1M`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=count, default=count("10k"))
+        parser.add_argument("--orders", type=count, default=count("100k"))
+        parser.add_argument("--items-per-order", type=int, default=3)
+        parser.add_argument("--users", type=count, default=count("1k"))
+        parser.add_argument("--categories", type=count, default=50)
+        parser.add_argument("--cart-items", type=count, default=None,
+                            help="Podrazumijevano 10%% broja narudžbi.")
+        parser.add_argument("--days", type=int, default=365, help="Raspon datuma narudžbi unazad.")
+        parser.add_argument("--prefix", default=DEFAULT_PREFIX)
+        parser.add_argument("--seed", type=int, default=42, help="Seed generatora (ponovljivi podaci).")
+        parser.add_argument("--clear", action="store_true", help="Prvo briše postojeće podatke sa prefiksom.")
+        parser.add_argument("--clear-only", action="store_true", help="Samo briše podatke sa prefiksom.")
+        parser.add_argument("--skip-rollups", action="store_true", help="Ne gradi rollup tabele nakon upisa.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if options["clear"] or options["clear_only"]:
+            started = time.perf_counter()
+            clear_seed(prefix)
+            self.stdout.write(f"Obrisani podaci sa prefiksom {prefix} ({time.perf_counter() - started:.1f}s)")
+            if options["clear_only"]:
+                return
+
+        cart_items = options["cart_items"]
+        if cart_items is None:
+            cart_items = options["orders"] // 10
+
+        started = time.perf_counter()
+        counts = seed(
+            products=options["products"],
+            orders=options["orders"],
+            items_per_order=options["items_per_order"],
+            users=max(1, options["users"]),
+            categories=max(1, options["categories"]),
+            cart_items=cart_items,
+            days=options["days"],
+            prefix=prefix,
+            seed_value=options["seed"],
+            stdout=self.stdout,
+        )
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(f"Generisano: {counts}")
+        self.stdout.write(f"{total} redova za {elapsed:.1f}s ({total / elapsed:.0f} redova/s)")
+
+        if not options["skip_rollups"]:
+            started = time.perf_counter()
+            days = refresh_rollups(full=True)
+            self.stdout.write(f"Rollup: {days} dana ({time.perf_counter() - started:.1f}s)")
+        self.stdout.write(self.style.SUCCESS("Gotovo."))
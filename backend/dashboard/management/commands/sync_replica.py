@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from ecommerce.db_router import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Kopira primarnu SQLite bazu u SQLite repliku (DB_REPLICA_NAME) — lokalna "
+        "zamjena za replikaciju. MySQL replika se puni replikacijom servera."
+    )
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError("Replika nije konfigurisana (DB_REPLICA_NAME).")
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_replica radi samo sa SQLite bazama.")
+
+        # Online backup kroz Django konekcije (radi i sa in-memory test bazom):
+        # konzistentna kopija i dok se u primarnu bazu piše
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+        self.stdout.write(self.style.SUCCESS(f"Replika osvježena: {replica.settings_dict['NAME']}"))
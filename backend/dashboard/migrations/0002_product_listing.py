@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('shop', '0006_category_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('sku', models.CharField(max_length=100)),
+                ('category_name', models.CharField(blank=True, default='', max_length=100)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('effective_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('stock', models.IntegerField(default=0)),
+                ('status', models.CharField(default='out_of_stock', max_length=50)),
+                ('image', models.CharField(blank=True, default='', max_length=255)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='shop.category')),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='listing', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', 'effective_price'], name='dash_listing_cat_price_idx'), models.Index(fields=['status', 'effective_price'], name='dash_listing_status_price_idx'), models.Index(fields=['effective_price'], name='dash_listing_price_idx'), models.Index(fields=['name'], name='dash_listing_name_idx')],
+            },
+        ),
+    ]
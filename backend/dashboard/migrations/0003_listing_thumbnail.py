@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_product_listing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productlisting',
+            name='thumbnail',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
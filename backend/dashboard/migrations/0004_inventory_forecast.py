@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_listing_thumbnail'),
+        ('shop', '0008_category_low_stock_threshold'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('sku', models.CharField(max_length=100)),
+                ('stock', models.IntegerField(default=0)),
+                ('units_sold', models.IntegerField(default=0)),
+                ('velocity_ma', models.FloatField(default=0)),
+                ('velocity_ewma', models.FloatField(default=0)),
+                ('days_of_cover', models.FloatField(blank=True, null=True)),
+                ('reorder_point', models.IntegerField(default=0)),
+                ('needs_reorder', models.BooleanField(default=False)),
+                ('computed_for', models.DateField()),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='shop.category')),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='forecast', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['days_of_cover'], name='dash_forecast_cover_idx'), models.Index(fields=['needs_reorder', 'days_of_cover'], name='dash_forecast_reorder_idx')],
+            },
+        ),
+    ]
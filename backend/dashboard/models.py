@@ -1,3 +1,112 @@
 from django.db import models
+from shop.models import Category, Product
 
-# Create your models here.
+
+# -----------------------------
+# ✅ Dnevni rollup po statusu i kategoriji
+# -----------------------------
+class DailySalesRollup(models.Model):
+    day = models.DateField()
+    status = models.CharField(max_length=50)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    order_count = models.IntegerField(default=0)
+    item_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["day", "status"])]
+
+    def __str__(self):
+        return f"{self.day} {self.status} ({self.category_id}) - {self.revenue}"
+
+
+# -----------------------------
+# ✅ Dnevni rollup po statusu (ukupno, bez duplog brojanja narudžbi)
+# -----------------------------
+class DailyOrderRollup(models.Model):
+    day = models.DateField()
+    status = models.CharField(max_length=50)
+    order_count = models.IntegerField(default=0)
+    item_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "status"], name="dashboard_dailyorderrollup_day_status"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status} - {self.order_count}"
+
+
+# -----------------------------
+# ✅ High-water mark za inkrementalno osvježavanje
+# -----------------------------
+class RollupCheckpoint(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    high_water_mark = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.high_water_mark}"
+
+
+# -----------------------------
+# ✅ Denormalizovan red za listu proizvoda (read model)
+# -----------------------------
+class ProductListing(models.Model):
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, related_name="listing")
+    name = models.CharField(max_length=200)
+    sku = models.CharField(max_length=100)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    category_name = models.CharField(max_length=100, blank=True, default="")
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    effective_price = models.DecimalField(max_digits=10, decimal_places=2)
+    stock = models.IntegerField(default=0)
+    status = models.CharField(max_length=50, default="out_of_stock")
+    image = models.CharField(max_length=255, blank=True, default="")
+    thumbnail = models.CharField(max_length=255, blank=True, default="")
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Grid: ?category=..&effective_price__gte=..&ordering=effective_price
+            models.Index(fields=["category", "effective_price"], name="dash_listing_cat_price_idx"),
+            models.Index(fields=["status", "effective_price"], name="dash_listing_status_price_idx"),
+            models.Index(fields=["effective_price"], name="dash_listing_price_idx"),
+            models.Index(fields=["name"], name="dash_listing_name_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.effective_price}"
+
+
+# -----------------------------
+# ✅ Prognoza prodaje i pokrivenosti zalihe (read model)
+# -----------------------------
+class InventoryForecast(models.Model):
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, related_name="forecast")
+    name = models.CharField(max_length=200)
+    sku = models.CharField(max_length=100)
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    stock = models.IntegerField(default=0)
+    # Prodato komada u periodu istorije i prosječna dnevna prodaja
+    units_sold = models.IntegerField(default=0)
+    velocity_ma = models.FloatField(default=0)
+    velocity_ewma = models.FloatField(default=0)
+    # Dana do isteka zalihe; null kad proizvod nema prodaje
+    days_of_cover = models.FloatField(null=True, blank=True)
+    reorder_point = models.IntegerField(default=0)
+    needs_reorder = models.BooleanField(default=False)
+    # Dan za koji je prognoza računata (istorija se završava dan ranije)
+    computed_for = models.DateField()
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # ?days_of_cover__lte=..&ordering=days_of_cover
+            models.Index(fields=["days_of_cover"], name="dash_forecast_cover_idx"),
+            models.Index(fields=["needs_reorder", "days_of_cover"], name="dash_forecast_reorder_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.sku} - {self.days_of_cover} dana"
@@ -0,0 +1,251 @@
+"""
+Generisanje sintetičkih podataka za benchmark-e (bulk_create u serijama).
+
+Svi generisani redovi nose prefiks (`BENCH` po defaultu) u SKU-u, imenu
+kategorije i korisničkom imenu, pa se mogu obrisati sa `clear_seed()`.
+
+`bulk_create` na MySQL-u ne vraća primarne ključeve, pa se id-evi upisanih
+redova ponovo čitaju (po SKU-u, imenu, korisničkom imenu ili, za narudžbe,
+kao id-evi veći od zadnjeg prije upisa), a zavisni redovi se grade sa `*_id`.
+"""
+
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import User
+from shop.models import Category, Product, stock_status
+from shop.models import Inventory as ShopInventory
+from shop.models import Order as ShopOrder
+from shop.signals import catalog_changed
+from store.ledger import record_movements
+from store.models import CartItem, Inventory, InventoryMovement, Order, OrderItem
+
+DEFAULT_PREFIX = "BENCH"
+BATCH_SIZE = 2000
+ORDER_STATUSES = ["pending", "paid", "shipped", "delivered", "canceled"]
+CART_STATUSES = ["active", "active", "active", "ordered", "canceled"]
+
+
+def _batched(objects, size=BATCH_SIZE):
+    for start in range(0, len(objects), size):
+        yield objects[start:start + size]
+
+
+def _bulk_create(model, objects):
+    for batch in _batched(objects):
+        model.objects.bulk_create(batch)
+
+
+def _ids_by(queryset, field, values):
+    """
+    Mapa vrijednost -> id upravo upisanih redova, po prirodnom ključu.
+    `bulk_create` na MySQL-u ne vraća primarne ključeve (ostaju None).
+    """
+    ids = {}
+    for batch in _batched(list(values)):
+        ids.update(queryset.filter(**{f"{field}__in": batch}).values_list(field, "id"))
+    return ids
+
+
+def _last_id(model):
+    # Cijela tabela: MAX(id) je jedan skok po primarnom ključu
+    return model.objects.aggregate(last=Max("id"))["last"] or 0
+
+
+def _ids_after(queryset, last_id):
+    """
+    Id-evi redova upisanih nakon `last_id` (redovi bez prirodnog ključa).
+    """
+    return list(queryset.filter(id__gt=last_id).order_by("id").values_list("id", flat=True))
+
+
+def _batch_sizes(total, size=BATCH_SIZE):
+    for start in range(0, total, size):
+        yield min(size, total - start)
+
+
+def seed(products=1000, orders=1000, items_per_order=3, users=50, categories=20,
+         cart_items=1000, days=365, prefix=DEFAULT_PREFIX, seed_value=42, stdout=None):
+    """
+    Generiše kategorije, proizvode, inventar (shop i store), korisnike,
+    korpe, narudžbe sa stavkama i shop narudžbe. Vraća broj redova po modelu.
+
+    Proizvodi, korpe i narudžbe se prave i upisuju serija po serija (svaka
+    serija u svojoj transakciji), a u memoriji ostaju samo (id, cijena)
+    proizvoda i id-evi korisnika — i milion narudžbi staje u konstantnu memoriju.
+    """
+    rng = random.Random(seed_value)
+    now = timezone.now()
+    minutes = days * 24 * 60
+    counts = dict.fromkeys(
+        ["categories", "products", "inventory", "users", "cart_items", "orders", "order_items"], 0
+    )
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    with transaction.atomic():
+        root_names = [f"{prefix} Kategorija {i}" for i in range(max(1, categories // 4))]
+        _bulk_create(Category, [Category(name=name) for name in root_names])
+        root_ids = list(_ids_by(Category.objects.all(), "name", root_names).values())
+        parents = {
+            f"{prefix} Podkategorija {i}": rng.choice(root_ids)
+            for i in range(max(0, categories - len(root_ids)))
+        }
+        _bulk_create(Category, [Category(name=name, parent_id=parent_id) for name, parent_id in parents.items()])
+        child_ids = _ids_by(Category.objects.all(), "name", parents)
+        all_categories = root_ids + list(child_ids.values())
+        # bulk_create zaobilazi Category.save(), pa se putanje postavljaju ovdje
+        paths = [Category(pk=category_id, path=f"/{category_id}/") for category_id in root_ids]
+        paths += [
+            Category(pk=category_id, path=f"/{parents[name]}/{category_id}/")
+            for name, category_id in child_ids.items()
+        ]
+        Category.objects.bulk_update(paths, ["path"], batch_size=BATCH_SIZE)
+        counts["categories"] = len(all_categories)
+
+        usernames = [f"{prefix.lower()}_user_{i}" for i in range(users)]
+        _bulk_create(User, [User(username=username) for username in usernames])
+        user_ids = list(_ids_by(User.objects.all(), "username", usernames).values())
+        counts["users"] = len(user_ids)
+
+    # (id, cijena) svih proizvoda — za korpe i stavke narudžbi
+    product_refs = []
+    offset = 0
+    for size in _batch_sizes(products):
+        with transaction.atomic():
+            batch = [
+                Product(
+                    name=f"{prefix} Proizvod {i}",
+                    sku=f"{prefix}-{i:08d}",
+                    price=Decimal(rng.randint(100, 250000)) / 100,
+                    category_id=rng.choice(all_categories),
+                    description=f"Opis proizvoda {i} " + " ".join(rng.choices(
+                        ["brz", "lagan", "crni", "bijeli", "pametni", "bežični", "kompaktan", "pro"], k=6
+                    )),
+                )
+                for i in range(offset, offset + size)
+            ]
+            Product.objects.bulk_create(batch)
+            offset += size
+            product_ids = _ids_by(Product.objects.all(), "sku", [product.sku for product in batch])
+            refs = [(product_ids[product.sku], product.price) for product in batch]
+
+            stock = {}
+            store_inventory, shop_inventory = [], []
+            for product_id, _ in refs:
+                quantity_in = rng.randint(0, 500)
+                quantity_out = rng.randint(0, quantity_in) if quantity_in else 0
+                status = stock_status(quantity_in - quantity_out)
+                stock[product_id] = quantity_in - quantity_out
+                store_inventory.append(Inventory(
+                    product_id=product_id, quantity_in=quantity_in, quantity_out=quantity_out, status=status
+                ))
+                shop_inventory.append(ShopInventory(
+                    product_id=product_id, quantity_in=quantity_in, quantity_out=quantity_out, status=status
+                ))
+            Inventory.objects.bulk_create(store_inventory)
+            ShopInventory.objects.bulk_create(shop_inventory)
+            inventory_ids = _ids_by(Inventory.objects.all(), "product_id", stock)
+            record_movements(
+                InventoryMovement(
+                    product_id=product_id, inventory_id=inventory_ids[product_id],
+                    reason=InventoryMovement.OPENING, delta=delta, applied=True,
+                )
+                for product_id, delta in stock.items()
+                if delta
+            )
+            catalog_changed.send(sender=Inventory, product_ids=list(stock))
+        product_refs.extend(refs)
+        counts["products"] += len(refs)
+        counts["inventory"] += len(refs)
+    log(f"Proizvodi: {counts['products']}")
+
+    for size in _batch_sizes(cart_items if product_refs else 0):
+        CartItem.objects.bulk_create([
+            CartItem(
+                user_id=rng.choice(user_ids),
+                product_id=rng.choice(product_refs)[0],
+                status=rng.choice(CART_STATUSES),
+            )
+            for _ in range(size)
+        ])
+        counts["cart_items"] += size
+
+    items_per_order = min(items_per_order, len(product_refs))
+    seeded_orders = Order.objects.filter(user__username__startswith=f"{prefix.lower()}_user_")
+    seeded_shop_orders = ShopOrder.objects.filter(product__sku__startswith=f"{prefix}-")
+    for size in _batch_sizes(orders if user_ids else 0):
+        with transaction.atomic():
+            # auto_now_add prepisuje vrijeme pri bulk_create, pa se vrijeme kreiranja
+            # raspoređuje naknadno preko bulk_update (time_updated ostaje "sada");
+            # id-evi se čitaju ponovo jer bulk_create na MySQL-u ih ne vraća
+            last_id = _last_id(Order)
+            Order.objects.bulk_create([
+                Order(user_id=rng.choice(user_ids), status=rng.choice(ORDER_STATUSES))
+                for _ in range(size)
+            ])
+            order_ids = _ids_after(seeded_orders, last_id)
+            Order.objects.bulk_update([
+                Order(pk=order_id, time_created=now - timedelta(minutes=rng.randint(0, minutes)))
+                for order_id in order_ids
+            ], ["time_created"], batch_size=BATCH_SIZE)
+
+            items = [
+                OrderItem(
+                    order_id=order_id,
+                    product_id=product_id,
+                    quantity=rng.randint(1, 5),
+                    final_price=price,
+                )
+                for order_id in order_ids
+                for product_id, price in rng.sample(product_refs, items_per_order)
+            ]
+            OrderItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+
+            if product_refs:
+                last_id = _last_id(ShopOrder)
+                ShopOrder.objects.bulk_create([
+                    ShopOrder(
+                        product_id=rng.choice(product_refs)[0],
+                        quantity=rng.randint(1, 5),
+                        total_price=Decimal(rng.randint(100, 100000)) / 100,
+                        status=rng.choice(ORDER_STATUSES),
+                    )
+                    for _ in range(size)
+                ])
+                ShopOrder.objects.bulk_update([
+                    ShopOrder(pk=order_id, created_at=now - timedelta(minutes=rng.randint(0, minutes)))
+                    for order_id in _ids_after(seeded_shop_orders, last_id)
+                ], ["created_at"], batch_size=BATCH_SIZE)
+        counts["orders"] += len(order_ids)
+        counts["order_items"] += len(items)
+        if counts["orders"] % (BATCH_SIZE * 50) == 0 or counts["orders"] == orders:
+            log(f"Narudžbe: {counts['orders']}")
+
+    return counts
+
+
+def clear_seed(prefix=DEFAULT_PREFIX):
+    """
+    Briše sve redove koje je `seed()` napravio sa datim prefiksom, u
+    serijama (brisanje milion narudžbi odjednom bi sve učitalo u memoriju).
+    """
+    users = User.objects.filter(username__startswith=f"{prefix.lower()}_user_")
+    products = Product.objects.filter(sku__startswith=f"{prefix}-")
+    for queryset in (Order.objects.filter(user__in=users), products):
+        while True:
+            ids = list(queryset.order_by().values_list("id", flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            with transaction.atomic():
+                queryset.model.objects.filter(id__in=ids).delete()
+    with transaction.atomic():
+        users.delete()
+        Category.objects.filter(name__startswith=f"{prefix} ").delete()
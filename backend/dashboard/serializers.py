@@ -0,0 +1,66 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from .models import InventoryForecast, ProductListing
+
+
+# -----------------------------
+# ✅ ProductListing Serializer (ravan red, bez ugniježđenih upita)
+# -----------------------------
+class ProductListingSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="product_id", read_only=True)
+    image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProductListing
+        fields = [
+            "id",
+            "name",
+            "sku",
+            "category",
+            "category_name",
+            "price",
+            "effective_price",
+            "stock",
+            "status",
+            "image_url",
+            "thumbnail_url",
+        ]
+
+    def _url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def get_image_url(self, obj):
+        return self._url(obj.image)
+
+    def get_thumbnail_url(self, obj):
+        return self._url(obj.thumbnail)
+
+
+# -----------------------------
+# ✅ InventoryForecast Serializer
+# -----------------------------
+class InventoryForecastSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="product_id", read_only=True)
+
+    class Meta:
+        model = InventoryForecast
+        fields = [
+            "id",
+            "name",
+            "sku",
+            "category",
+            "stock",
+            "units_sold",
+            "velocity_ma",
+            "velocity_ewma",
+            "days_of_cover",
+            "reorder_point",
+            "needs_reorder",
+            "computed_for",
+        ]
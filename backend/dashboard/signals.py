@@ -0,0 +1,144 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from shop.models import Category, Product, ProductImage
+from shop.signals import catalog_changed
+from store.models import Discount, DiscountType, Inventory, Order, OrderItem
+from .listing import refresh_listings
+from .models import ProductListing
+from .rollups import rebuild_days
+
+# Dani i proizvodi koje treba preračunati nakon commita (jedan rebuild po
+# danu / jedno osvježavanje po proizvodu, ne po redu)
+_pending = threading.local()
+
+
+def _flush_pending():
+    days = getattr(_pending, "days", None)
+    _pending.days = set()
+    if days:
+        rebuild_days(days)
+
+
+def _schedule_rebuild(order):
+    if order is None or order.time_created is None:
+        return
+    if not hasattr(_pending, "days"):
+        _pending.days = set()
+    _pending.days.add(timezone.localdate(order.time_created))
+    transaction.on_commit(_flush_pending)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def order_changed(sender, instance, **kwargs):
+    _schedule_rebuild(instance)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def order_item_changed(sender, instance, **kwargs):
+    try:
+        order = instance.order
+    except Order.DoesNotExist:
+        return
+    _schedule_rebuild(order)
+
+
+# -----------------------------
+# ✅ ProductListing
+# -----------------------------
+def _flush_pending_products():
+    product_ids = getattr(_pending, "products", None)
+    _pending.products = set()
+    if product_ids:
+        refresh_listings(product_ids)
+
+
+def _schedule_listing(product_ids):
+    product_ids = {product_id for product_id in product_ids if product_id is not None}
+    if not product_ids:
+        return
+    if not hasattr(_pending, "products"):
+        _pending.products = set()
+    _pending.products.update(product_ids)
+    transaction.on_commit(_flush_pending_products)
+
+
+def _discount_product_ids(discounts):
+    product_ids = set(discounts.values_list("product_id", flat=True))
+    product_ids.update(
+        Inventory.objects.filter(discount__in=discounts).values_list("product_id", flat=True)
+    )
+    return product_ids
+
+
+def _previous_product_ids(instance):
+    previous = getattr(instance, "_previous_product_id", None)
+    return [instance.product_id] if previous is None else [instance.product_id, previous]
+
+
+@receiver(pre_save, sender=Discount)
+@receiver(pre_save, sender=Inventory)
+def remember_product(sender, instance, update_fields=None, **kwargs):
+    """
+    Proizvod prije izmjene: kada se popust ili inventar (sa popustom)
+    premjesti na drugi proizvod, i listing starog proizvoda se osvježava.
+    """
+    instance._previous_product_id = None
+    if instance.pk is None or (update_fields is not None and "product" not in update_fields):
+        return
+    instance._previous_product_id = (
+        sender.objects.filter(pk=instance.pk).values_list("product_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    _schedule_listing([instance.pk])
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_delete, sender=Inventory)
+def listing_source_changed(sender, instance, **kwargs):
+    _schedule_listing([instance.product_id])
+
+
+@receiver(post_save, sender=Inventory)
+def inventory_saved(sender, instance, **kwargs):
+    _schedule_listing(_previous_product_ids(instance))
+
+
+@receiver(post_save, sender=Discount)
+@receiver(pre_delete, sender=Discount)
+def discount_changed(sender, instance, **kwargs):
+    # pre_delete: nakon brisanja Inventory.discount je već NULL
+    product_ids = _discount_product_ids(Discount.objects.filter(pk=instance.pk))
+    _schedule_listing(product_ids | set(_previous_product_ids(instance)))
+
+
+@receiver(post_save, sender=DiscountType)
+@receiver(pre_delete, sender=DiscountType)
+def discount_type_changed(sender, instance, **kwargs):
+    _schedule_listing(_discount_product_ids(Discount.objects.filter(discount_type=instance)))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, **kwargs):
+    ProductListing.objects.filter(category=instance).update(category_name=instance.name)
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    ProductListing.objects.filter(category=instance).update(category_name="")
+
+
+@receiver(catalog_changed)
+def catalog_bulk_changed(sender, product_ids, **kwargs):
+    if sender in (Product, Inventory):
+        _schedule_listing(product_ids)
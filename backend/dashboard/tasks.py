@@ -0,0 +1,27 @@
+from ecommerce.db_router import replica_reads
+from jobs.registry import task
+from .exports import export_to_file
+from .forecast import refresh_forecast
+from .listing import refresh_incremental
+from .rollups import refresh_rollups
+
+
+@task("dashboard.refresh_rollups")
+def refresh_rollups_task(full=False):
+    return {"days": refresh_rollups(full=full)}
+
+
+@task("dashboard.refresh_product_listing")
+def refresh_product_listing_task(full=False):
+    return {"products": refresh_incremental(full=full)}
+
+
+@task("dashboard.refresh_inventory_forecast")
+def refresh_inventory_forecast_task(full=False):
+    return {"products": refresh_forecast(full=full)}
+
+
+@task("dashboard.export")
+def export_task(resource, export_format="ndjson", params=None):
+    with replica_reads():
+        return export_to_file(resource, export_format, params or {})
@@ -1,3 +1,709 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, time, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from ecommerce.db_router import (
+    PIN_COOKIE, PrimaryReplicaRouter, ReplicaRoutingMiddleware, pin_to_primary, replica_reads, use_primary,
+)
+from ecommerce.perf import PerfStats, perf_stats
+from ecommerce.startup import run_probe, warm_up
+from jobs.models import Job
+from shop.models import Category, Product
+from shop.signals import catalog_changed
+from store.models import Discount, DiscountType, Inventory, InventoryMovement, Order, OrderItem
+from .forecast import HISTORY_DAYS, compute, refresh_forecast
+from .models import DailyOrderRollup, DailySalesRollup, InventoryForecast, ProductListing, RollupCheckpoint
+from .rollups import CHECKPOINT_NAME, rebuild_days, refresh_rollups
+from .seed import clear_seed, seed
+
+
+class AnalyticsTopTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="kupac")
+        cls.phones = Category.objects.create(name="Telefoni")
+        cls.laptops = Category.objects.create(name="Laptopi")
+        cls.phone = Product.objects.create(name="Telefon", price=300, sku="TEL-1", category=cls.phones)
+        cls.case = Product.objects.create(name="Maska", price=10, sku="MAS-1", category=cls.phones)
+        cls.laptop = Product.objects.create(name="Laptop", price=1000, sku="LAP-1", category=cls.laptops)
+
+        recent, old = Order.objects.create(user=user), Order.objects.create(user=user)
+        Order.objects.filter(pk=old.pk).update(time_created=timezone.now() - timedelta(days=60))
+        OrderItem.objects.bulk_create([
+            OrderItem(order=recent, product=cls.phone, quantity=2, final_price=300),
+            OrderItem(order=recent, product=cls.case, quantity=50, final_price=10),
+            OrderItem(order=old, product=cls.laptop, quantity=1, final_price=1000),
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def _top(self, **params):
+        return self.client.get(reverse("analytics-top"), params)
+
+    def test_products_by_revenue_in_window(self):
+        with self.assertNumQueries(1):
+            response = self._top(by="product", metric="revenue", window="30d")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([row["id"] for row in results], [self.phone.pk, self.case.pk])
+        self.assertEqual(results[0]["revenue"], 600)
+        self.assertEqual(results[1]["quantity"], 50)
+
+        # Isti bucket: iz keša, bez upita
+        with self.assertNumQueries(0):
+            self.assertEqual(self._top(by="product", metric="revenue", window="30d").data, response.data)
+
+    def test_categories_by_quantity_all_time(self):
+        results = self._top(by="category", metric="quantity", window="all", limit=1).data["results"]
+        self.assertEqual(results, [{
+            "id": self.phones.pk, "name": "Telefoni", "revenue": 1100, "quantity": 52, "order_count": 1,
+        }])
+
+    def test_invalid_params(self):
+        response = self._top(by="user", metric="profit", window="30x", limit=0)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"by", "metric", "window", "limit"})
+
+    def test_window_too_long(self):
+        # Van opsega datetime-a (5000000d) i timedelta-e (9999999999w)
+        for window in ("5000000d", "9999999999w", "3651d"):
+            response = self._top(window=window)
+            self.assertEqual(response.status_code, 400, window)
+            self.assertEqual(set(response.data), {"window"})
+        self.assertEqual(self._top(window="3650d").status_code, 200)
+
+
+class RollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="kupac")
+        cls.category = Category.objects.create(name="Telefoni")
+        cls.phone = Product.objects.create(name="Telefon", price=300, sku="TEL-1", category=cls.category)
+        tz = timezone.get_current_timezone()
+        cls.day = timezone.localdate() - timedelta(days=3)
+        cls.next_day = cls.day + timedelta(days=1)
+        # Zadnji trenutak dana i ponoć sljedećeg: granice poluotvorenog opsega
+        moments = [
+            datetime.combine(cls.day, time.max, tz),
+            datetime.combine(cls.next_day, time.min, tz),
+            datetime.combine(cls.next_day, time(12), tz),
+        ]
+        cls.orders = []
+        for moment in moments:
+            order = Order.objects.create(user=user)
+            Order.objects.filter(pk=order.pk).update(time_created=moment, time_updated=moment)
+            OrderItem.objects.create(order=order, product=cls.phone, quantity=1, final_price=300)
+            cls.orders.append(order)
+
+    def _totals(self, day):
+        return {
+            row.status: (row.order_count, row.item_count, row.revenue)
+            for row in DailyOrderRollup.objects.filter(day=day)
+        }
+
+    def test_rebuild_days_filters_by_datetime_range(self):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            rebuild_days([self.day, self.next_day])
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        for sql in selects:
+            # DATE(kolona) u WHERE ne može koristiti indeks na time_created
+            where = sql.split(" WHERE ", 1)[1].split(" GROUP BY ")[0]
+            self.assertIn('"time_created" >=', where)
+            self.assertNotIn("cast_date", where)
+
+        self.assertEqual(self._totals(self.day), {"pending": (1, 1, 300)})
+        self.assertEqual(self._totals(self.next_day), {"pending": (2, 2, 600)})
+        self.assertEqual(DailySalesRollup.objects.get(day=self.next_day).category_id, self.category.pk)
+
+    def test_incremental_refresh_follows_high_water_mark(self):
+        self.assertEqual(refresh_rollups(full=True), 2)
+        checkpoint = RollupCheckpoint.objects.get(name=CHECKPOINT_NAME)
+        self.assertEqual(checkpoint.high_water_mark, Order.objects.latest("time_updated").time_updated)
+        # Ništa novo nakon high-water marka
+        self.assertEqual(refresh_rollups(), 0)
+
+        # Promjena statusa jedne narudžbe preračunava samo njen dan
+        later = checkpoint.high_water_mark + timedelta(seconds=1)
+        Order.objects.filter(pk=self.orders[0].pk).update(status="shipped", time_updated=later)
+        DailyOrderRollup.objects.filter(day=self.next_day).update(order_count=99)
+        self.assertEqual(refresh_rollups(), 1)
+        self.assertEqual(self._totals(self.day), {"shipped": (1, 1, 300)})
+        self.assertEqual(self._totals(self.next_day), {"pending": (99, 2, 600)})
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.high_water_mark, later)
+        self.assertEqual(refresh_rollups(), 0)
+
+    def test_series_enqueues_build_instead_of_computing(self):
+        response = self.client.get(reverse("orders-by-day"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "30")
+        job = Job.objects.get(pk=response.data["job"])
+        self.assertEqual((job.name, job.kwargs), ("dashboard.refresh_rollups", {"full": True}))
+        self.assertFalse(RollupCheckpoint.objects.exists())
+        self.assertFalse(DailyOrderRollup.objects.exists())
+        # Ponovljen zahtjev dok posao čeka ne dodaje novi
+        self.assertEqual(self.client.get(reverse("orders-by-month")).data["job"], job.pk)
+
+        refresh_rollups(full=True)
+        response = self.client.get(reverse("orders-by-day"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["day"], row["order_count"]) for row in response.data],
+            [(self.day, 1), (self.next_day, 2)],
+        )
+
+
+class ProductListingTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = Category.objects.create(name="Telefoni")
+            self.phone = Product.objects.create(name="Telefon", price=100, sku="TEL-1", category=self.category)
+            self.case = Product.objects.create(name="Maska", price=10, sku="MAS-1", category=self.category)
+            self.percent = DiscountType.objects.create(type="percent")
+
+    def _listing(self, product):
+        row = ProductListing.objects.get(product=product)
+        return row.name, row.effective_price, row.stock
+
+    def test_signals_refresh_listing_after_commit(self):
+        self.assertEqual(self._listing(self.phone), ("Telefon", 100, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.phone.name = "Telefon X"
+            self.phone.save()
+            Inventory.objects.create(product=self.phone, quantity_in=7)
+        self.assertEqual(self._listing(self.phone), ("Telefon X", 100, 7))
+
+    def test_catalog_changed_refreshes_bulk_updates(self):
+        Product.objects.filter(pk=self.phone.pk).update(price=80)
+        self.assertEqual(self._listing(self.phone)[1], 100)
+        with self.captureOnCommitCallbacks(execute=True):
+            catalog_changed.send(sender=Product, product_ids=[self.phone.pk])
+        self.assertEqual(self._listing(self.phone)[1], 80)
+
+    def test_moved_discount_refreshes_previous_product(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            discount = Discount.objects.create(amount=10, discount_type=self.percent, product=self.phone)
+        self.assertEqual(self._listing(self.phone)[1], 90)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            discount = Discount.objects.get(pk=discount.pk)
+            discount.product = self.case
+            discount.save()
+        self.assertEqual(self._listing(self.phone)[1], 100)
+        self.assertEqual(self._listing(self.case)[1], 9)
+
+    def test_moved_inventory_refreshes_previous_product(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            discount = Discount.objects.create(amount=50, discount_type=self.percent)
+            inventory = Inventory.objects.create(product=self.phone, quantity_in=3, discount=discount)
+        self.assertEqual(self._listing(self.phone)[1:], (50, 3))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.product = self.case
+            inventory.save()
+        self.assertEqual(self._listing(self.phone)[1:], (100, 0))
+        self.assertEqual(self._listing(self.case)[1:], (5, 3))
+
+
+class InventoryForecastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="kupac")
+        cls.fast = Product.objects.create(name="Brzi", price=10, sku="BRZ-1")
+        cls.slow = Product.objects.create(name="Spori", price=10, sku="SPO-1")
+        cls.idle = Product.objects.create(name="Bez prodaje", price=10, sku="BEZ-1")
+        cls.fast_inventory = Inventory.objects.create(product=cls.fast, quantity_in=20)
+        Inventory.objects.create(product=cls.slow, quantity_in=100)
+        Inventory.objects.create(product=cls.idle, quantity_in=5)
+
+        # Svaki od zadnjih 28 dana: 4 komada brzog i 1 sporog proizvoda
+        now = timezone.now()
+        for days_ago in range(1, 29):
+            order = Order.objects.create(user=user)
+            Order.objects.filter(pk=order.pk).update(time_created=now - timedelta(days=days_ago))
+            OrderItem.objects.bulk_create([
+                OrderItem(order=order, product=cls.fast, quantity=4, final_price=10),
+                OrderItem(order=order, product=cls.slow, quantity=1, final_price=10),
+            ])
+
+    def test_compute(self):
+        sales = np.zeros((2, HISTORY_DAYS))
+        sales[0, :] = 2
+        result = compute(sales, [10, 0], lead_time=7, z=1.65)
+        self.assertAlmostEqual(result["velocity_ma"][0], 2)
+        self.assertAlmostEqual(result["velocity_ewma"][0], 2)
+        self.assertAlmostEqual(result["days_of_cover"][0], 5)
+        self.assertEqual(result["reorder_point"][0], 14)
+        self.assertTrue(result["needs_reorder"][0])
+        # Bez prodaje: pokrivenost nepoznata, nema naručivanja
+        self.assertTrue(np.isnan(result["days_of_cover"][1]))
+        self.assertEqual(result["reorder_point"][1], 0)
+        self.assertFalse(result["needs_reorder"][1])
+
+    def test_first_request_enqueues_build_instead_of_computing(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("inventory-forecast"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "30")
+        job = Job.objects.get(pk=response.data["job"])
+        self.assertEqual((job.name, job.kwargs), ("dashboard.refresh_inventory_forecast", {"full": True}))
+        self.assertFalse(InventoryForecast.objects.exists())
+        # Ponovljen zahtjev dok posao čeka ne dodaje novi
+        self.assertEqual(self.client.get(reverse("inventory-forecast")).data["job"], job.pk)
+
+    def test_endpoint_filters_by_days_of_cover(self):
+        refresh_forecast(full=True)
+        response = self.client.get(reverse("inventory-forecast"), {"days_of_cover__lte": 30})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [self.fast.pk])
+        self.assertTrue(response.data["results"][0]["needs_reorder"])
+
+        everything = self.client.get(reverse("inventory-forecast")).data["results"]
+        # Sortirano po pokrivenosti, proizvod bez prodaje na kraju
+        self.assertEqual([row["id"] for row in everything], [self.fast.pk, self.slow.pk, self.idle.pk])
+        self.assertIsNone(everything[-1]["days_of_cover"])
+
+    def test_incremental_refresh_only_changed_products(self):
+        self.assertEqual(refresh_forecast(), 3)
+        self.assertEqual(refresh_forecast(), 0)
+
+        Inventory.objects.filter(pk=self.fast_inventory.pk).adjust_stock(received=80)
+        self.assertEqual(refresh_forecast(), 1)
+        self.assertEqual(InventoryForecast.objects.get(product=self.fast).stock, 100)
+
+
+class ReplicaRoutingTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter(replica="replica")
+
+    def test_reads_use_replica_only_inside_context(self):
+        self.assertEqual(self.router.db_for_read(Product), DEFAULT_DB_ALIAS)
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Product), "replica")
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Product), DEFAULT_DB_ALIAS)
+            # Nakon upisa ostatak konteksta čita sa primarne baze
+            self.assertEqual(self.router.db_for_write(Product), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(Product), DEFAULT_DB_ALIAS)
+
+    def test_open_transaction_reads_primary(self):
+        with replica_reads(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Product), DEFAULT_DB_ALIAS)
+
+    def test_replica_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "shop"))
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "shop"))
+
+    @override_settings(DATABASE_REPLICA_ALIAS=DEFAULT_DB_ALIAS)
+    def test_middleware_pins_client_after_write(self):
+        routed = []
+
+        def view(request):
+            routed.append(self.router.db_for_read(Product))
+            if request.method == "POST":
+                pin_to_primary()
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+
+        response = middleware(factory.get("/api/orders/"))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        response = middleware(factory.post("/api/orders/"))
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        pinned = factory.get("/api/orders/")
+        pinned.COOKIES[PIN_COOKIE] = "1"
+        middleware(pinned)
+        self.assertEqual(routed, ["replica", DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS])
+
+
+class PerfTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        perf_stats.reset()
+        self.addCleanup(perf_stats.reset)
+
+    def test_server_timing_header_and_query_count(self):
+        Category.objects.create(name="Telefoni")
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            response = self.client.get(reverse("category-list"))
+        match = re.fullmatch(r'app;dur=\d+\.\d, db;dur=\d+\.\d;desc="(\d+) queries"', response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertEqual(int(match.group(1)), len(queries))
+        self.assertGreater(len(queries), 0)
+
+        [row] = perf_stats.snapshot()
+        self.assertEqual((row["endpoint"], row["method"], row["count"]), ("category-list", "GET", 1))
+        self.assertEqual(row["avg_queries"], len(queries))
+        self.assertEqual(row["avg_bytes"], len(response.content))
+
+    def test_latency_window_is_bounded(self):
+        self.assertEqual(perf_stats.window, settings.PERF_STATS_WINDOW)
+        stats = PerfStats(window=3)
+        for duration in (100, 200, 1, 2, 3):
+            stats.record("product-list", "GET", duration, 2, 1.0, 10)
+        [row] = stats.snapshot()
+        # Broj i prosjeci su za sve zahtjeve, percentili samo za zadnja 3
+        self.assertEqual((row["count"], row["avg_queries"], row["p50_ms"], row["p99_ms"]), (5, 2, 2, 3))
+
+    def test_percentiles_grouped_by_endpoint_and_method(self):
+        stats = PerfStats(window=1000)
+        for duration in range(1, 101):
+            stats.record("product-list", "GET", duration, 1, 0.5, 100)
+        stats.record("product-list", "POST", 500, 4, 2.0, 50)
+        stats.record("category-list", "GET", 5, 1, 0.5, 10)
+        rows = stats.snapshot()
+        # Sortirano po p95, opadajuće
+        self.assertEqual(
+            [(row["endpoint"], row["method"]) for row in rows],
+            [("product-list", "POST"), ("product-list", "GET"), ("category-list", "GET")],
+        )
+        listing = rows[1]
+        self.assertEqual((listing["count"], listing["p50_ms"], listing["p95_ms"], listing["p99_ms"]), (100, 51, 95, 99))
+        self.assertEqual((rows[0]["count"], rows[0]["p50_ms"], rows[0]["avg_queries"]), (1, 500, 4))
+
+    def test_stats_endpoint_is_admin_only(self):
+        url = reverse("perf-stats")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(User.objects.create(username="kupac"))
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create(username="admin", is_staff=True))
+        self.client.get(reverse("category-list"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["window"], settings.PERF_STATS_WINDOW)
+        endpoints = [(row["endpoint"], row["method"]) for row in response.data["endpoints"]]
+        self.assertIn(("category-list", "GET"), endpoints)
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual([row["endpoint"] for row in self.client.get(url).data["endpoints"]], ["perf-stats"])
+
+
+class StartupTests(TestCase):
+    def test_cold_start_within_budget(self):
+        result = run_probe("/api/health/")
+        self.assertEqual(result["status"], 200)
+        self.assertLessEqual(result["total_ms"], settings.COLD_START_BUDGET_MS)
+
+        # Teški moduli se ne učitavaju prije prvog odgovora
+        cold = {module["module"] for module in result["modules"] if module["cold"]}
+        for module in ("numpy", "PIL", "dashboard.views", "dashboard.tasks"):
+            self.assertNotIn(module, cold)
+        self.assertTrue({"django.urls", "rest_framework.views", "shop.views"} <= cold)
+
+    def test_lazy_views_keep_csrf_exemption_and_async(self):
+        client = Client(enforce_csrf_checks=True)
+        # Dodavanje posla u red ne učitava tasks.py module (numpy, izvoze)
+        with mock.patch("jobs.registry._discovered", False), \
+                mock.patch("jobs.registry.autodiscover_modules", side_effect=AssertionError("autodiscover")):
+            response = client.post(reverse("export", args=["products"]) + "?format=csv")
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(Job.objects.filter(name="dashboard.export").exists())
+
+        response = client.get(reverse("dashboard-summary"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("inventory_status", response.json())
+
+    def test_warm_up_builds_serializers(self):
+        self.assertGreater(warm_up(), 0)
+        # Drugi poziv ne radi ništa
+        self.assertEqual(warm_up(), 0)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.phones = Category.objects.create(name="Telefoni")
+        cls.phone = Product.objects.create(name="Telefon „X“", price=300, sku="TEL-1", category=cls.phones)
+        Product.objects.create(name="Telefon Y", price=50, sku="TEL-2", category=cls.phones)
+        Product.objects.create(name="Telefonska maska", price=400, sku="MAS-1")
+        Inventory.objects.create(product=cls.phone, quantity_in=5, quantity_out=2)
+        Inventory.objects.create(product=Product.objects.get(sku="MAS-1"), quantity_in=1)
+
+    def _export(self, resource, **params):
+        response = self.client.get(reverse("export", args=[resource]), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_csv_with_filters_and_search(self):
+        response = self._export("products", format="csv", category=self.phones.pk, search="telefon",
+                                price__gte=100)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="products.csv"')
+        rows = list(csv.DictReader(b"".join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([(row["sku"], row["name"], row["price"], row["category_name"]) for row in rows],
+                         [("TEL-1", "Telefon „X“", "300.00", "Telefoni")])
+
+    def test_ndjson_with_filters_gzip(self):
+        response = self.client.get(
+            reverse("export", args=["inventory"]), {"product": self.phone.pk}, HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{
+            "id": Inventory.objects.get(product=self.phone).pk, "product": self.phone.pk,
+            "product_name": "Telefon „X“", "sku": "TEL-1", "quantity_in": 5, "quantity_out": 2,
+            "stock": 3, "status": "low_stock", "discount": None,
+        }])
+
+    def test_invalid_format_and_resource(self):
+        self.assertEqual(self.client.get(reverse("export", args=["products"]), {"format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("export", args=["users"])).status_code, 404)
+
+
+class SeedTests(TestCase):
+    def test_seed_without_returned_primary_keys(self):
+        # Kao MySQL: bulk_create ne postavlja pk na objektima
+        features = connections[DEFAULT_DB_ALIAS].features
+        with mock.patch.object(type(features), "can_return_rows_from_bulk_insert", False):
+            counts = seed(products=30, orders=20, items_per_order=2, users=5, categories=8, cart_items=10)
+        self.assertEqual(counts, {
+            "categories": 8, "products": 30, "inventory": 30, "users": 5,
+            "cart_items": 10, "orders": 20, "order_items": 40,
+        })
+        for category in Category.objects.select_related("parent"):
+            expected = f"{category.parent.path if category.parent else '/'}{category.pk}/"
+            self.assertEqual(category.path, expected)
+        self.assertFalse(Product.objects.filter(category__isnull=True).exists())
+        self.assertEqual(Inventory.objects.filter(product__sku__startswith="BENCH-").count(), 30)
+        self.assertFalse(InventoryMovement.objects.filter(inventory__isnull=True).exists())
+        self.assertEqual(OrderItem.objects.values("order").distinct().count(), 20)
+        # Vrijeme kreiranja je raspoređeno unazad, ne "sada"
+        self.assertGreater(Order.objects.values("time_created").distinct().count(), 1)
+
+        clear_seed()
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Category.objects.exists())
+
+
+class BenchIndexesTests(TestCase):
+    @override_settings(DEBUG=False)
+    def test_refuses_to_modify_production_database(self):
+        with mock.patch("dashboard.management.commands.bench_indexes.connection") as connection:
+            connection.vendor = "mysql"
+            connection.settings_dict = {"NAME": "ecommerce"}
+            with self.assertRaisesMessage(CommandError, "--force"):
+                call_command("bench_indexes", products=5, orders=5, stdout=StringIO())
+            self.assertFalse(Product.objects.exists())
+            connection.schema_editor.assert_not_called()
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=None)
+class DashboardSummaryTests(TransactionTestCase):
+    """
+    Agregati za ProductsPage na poznatom katalogu. TransactionTestCase, jer
+    se unutar otvorene transakcije agregati uvijek izvršavaju redom; čita se
+    sa primarne baze (replika je pokrivena u ReplicaDatabaseTests).
+    """
+
+    def setUp(self):
+        phones = Category.objects.create(name="Telefoni")
+        laptops = Category.objects.create(name="Laptopi")
+        self.phone = Product.objects.create(name="Telefon", price=300, sku="TEL-1", category=phones)
+        self.case = Product.objects.create(name="Maska", price=10, sku="MAS-1", category=phones)
+        self.laptop = Product.objects.create(name="Laptop", price=1200, sku="LAP-1", category=laptops)
+        self.cable = Product.objects.create(name="Kabl", price=50, sku="KAB-1")
+        Inventory.objects.create(product=self.phone, quantity_in=10, quantity_out=3)
+        Inventory.objects.create(product=self.case, quantity_in=5, quantity_out=5)
+        Inventory.objects.create(product=self.laptop, quantity_in=4)
+        # Negativna zaliha se u zbirovima računa kao 0
+        Inventory.objects.create(product=self.laptop, quantity_in=2, quantity_out=5)
+        Inventory.objects.create(product=self.cable, quantity_in=20)
+        self.categories = {"Telefoni": phones.pk, "Laptopi": laptops.pk}
+
+    def expected(self):
+        return {
+            "product_count": 4,
+            "inventory_status": {"available": 1, "low_stock": 2, "out_of_stock": 2},
+            "price_distribution": [
+                {"range": "0-100€", "count": 2},
+                {"range": "100-500€", "count": 1},
+                {"range": "1000€+", "count": 1},
+            ],
+            "stock_by_category": [
+                {"category_id": self.categories["Telefoni"], "category": "Telefoni", "stock": 7},
+                {"category_id": self.categories["Laptopi"], "category": "Laptopi", "stock": 4},
+            ],
+            "category_distribution": [
+                {"category_id": self.categories["Telefoni"], "category": "Telefoni", "count": 2, "avg_price": 155.0},
+                {"category_id": self.categories["Laptopi"], "category": "Laptopi", "count": 1, "avg_price": 1200.0},
+            ],
+            "price_vs_stock": [
+                {"id": self.phone.pk, "name": "Telefon", "price": 300.0, "stock": 7},
+                {"id": self.case.pk, "name": "Maska", "price": 10.0, "stock": 0},
+                {"id": self.laptop.pk, "name": "Laptop", "price": 1200.0, "stock": 4},
+                {"id": self.cable.pk, "name": "Kabl", "price": 50.0, "stock": 20},
+            ],
+        }
+
+    async def test_fanout_over_asgi_matches_serial(self):
+        client = AsyncClient()
+        with mock.patch("dashboard.views.asyncio", wraps=asyncio) as views_asyncio:
+            concurrent = await client.get(reverse("dashboard-summary"), {"fanout": "1"})
+        self.assertEqual(concurrent.status_code, 200)
+        views_asyncio.gather.assert_called_once()
+        self.assertEqual(concurrent.json(), self.expected())
+
+        with mock.patch("dashboard.views.asyncio", wraps=asyncio) as views_asyncio:
+            serial = await client.get(reverse("dashboard-summary"), {"fanout": "0"})
+        views_asyncio.gather.assert_not_called()
+        self.assertEqual(serial.json(), self.expected())
+
+    def test_wsgi_runs_aggregates_serially(self):
+        with mock.patch("dashboard.views.asyncio", wraps=asyncio) as views_asyncio:
+            response = Client().get(reverse("dashboard-summary"), {"fanout": "1"})
+        views_asyncio.gather.assert_not_called()
+        self.assertEqual(response.json(), self.expected())
+
+    def _summary(self, **params):
+        response = Client().get(reverse("dashboard-summary"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_products_without_category(self):
+        summary = self._summary()
+        # Kabl (bez kategorije) ulazi u broj, cijene i scatter, ne u grupe po kategoriji
+        self.assertEqual(sum(row["count"] for row in summary["price_distribution"]), 4)
+        self.assertEqual(sum(row["count"] for row in summary["category_distribution"]), 3)
+        self.assertEqual(sum(row["stock"] for row in summary["stock_by_category"]), 11)
+        self.assertIn(self.cable.pk, [row["id"] for row in summary["price_vs_stock"]])
+
+        # Kategorija bez zalihe se ne prikazuje u stock_by_category
+        Inventory.objects.filter(product=self.phone).update(quantity_out=F("quantity_in"))
+        self.assertEqual(
+            [row["category"] for row in self._summary()["stock_by_category"]], ["Laptopi"]
+        )
+
+    def test_price_range_boundaries(self):
+        # Donja granica raspona pripada rasponu, gornja sljedećem
+        Product.objects.create(name="Sto", price=100, sku="STO-1")
+        Product.objects.create(name="Petsto", price=500, sku="PET-1")
+        Product.objects.create(name="Hiljada", price=1000, sku="HIL-1")
+        self.assertEqual(self._summary()["price_distribution"], [
+            {"range": "0-100€", "count": 2},
+            {"range": "100-500€", "count": 2},
+            {"range": "500-1000€", "count": 1},
+            {"range": "1000€+", "count": 2},
+        ])
+
+    def test_scatter_limit(self):
+        ids = [row["id"] for row in self.expected()["price_vs_stock"]]
+        self.assertEqual([row["id"] for row in self._summary(scatter_limit=2)["price_vs_stock"]], ids[:2])
+        self.assertEqual(self._summary(scatter_limit=-5)["price_vs_stock"], [])
+        self.assertEqual(len(self._summary(scatter_limit="nije broj")["price_vs_stock"]), 4)
+        with mock.patch("dashboard.views.MAX_SCATTER_LIMIT", 3):
+            self.assertEqual([row["id"] for row in self._summary(scatter_limit=5000)["price_vs_stock"]], ids[:3])
+
+    def test_empty_catalog(self):
+        Product.objects.all().delete()
+        self.assertEqual(self._summary(), {
+            "product_count": 0,
+            "inventory_status": {},
+            "price_distribution": [],
+            "stock_by_category": [],
+            "category_distribution": [],
+            "price_vs_stock": [],
+        })
+
+
+def _sqlite_replica():
+    """
+    `replica` kao zasebna SQLite baza za ReplicaDatabaseTests. Ako nije
+    konfigurisana (DB_REPLICA_NAME), dodaje se fajl u tmp prije nego što test
+    runner napravi test baze; šema i podaci dolaze sa `sync_replica`.
+    """
+    if connections.settings["default"]["ENGINE"] != "django.db.backends.sqlite3":
+        return False
+    if "replica" not in connections.settings:
+        connections.settings["replica"] = connections.configure_settings({
+            "default": connections.settings["default"],
+            "replica": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": os.path.join(tempfile.gettempdir(), f"ecommerce-replica-{os.getpid()}.sqlite3"),
+            },
+        })["replica"]
+    replica = connections.settings["replica"]
+    return replica["ENGINE"] == "django.db.backends.sqlite3" and not replica["TEST"]["MIRROR"]
+
+
+@skipUnless(_sqlite_replica(), "Potrebna je SQLite baza i replika koja nije TEST MIRROR.")
+class ReplicaDatabaseTests(TransactionTestCase):
+    """
+    Prava druga baza: `replica` je zasebna SQLite baza koju puni `sync_replica`,
+    pa se kašnjenje replike vidi kao red koji je samo na primarnoj bazi.
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="kupac")
+        Order.objects.create(user=self.user)
+        Category.objects.create(name="Old")
+        Product.objects.create(name="Stari", price=10, sku="OLD-1")
+        self.sync_replica()
+
+    def sync_replica(self):
+        call_command("sync_replica", stdout=StringIO())
+
+    def test_get_reads_replica_until_client_writes(self):
+        Order.objects.create(user=self.user)  # replika još ne zna za ovu narudžbu
+        client = Client()
+        self.assertEqual(client.get(reverse("order-list")).data["count"], 1)
+
+        response = client.post(reverse("category-list"), {"name": "Nova"}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        # Pinovan klijent čita sa primarne baze
+        self.assertEqual(client.get(reverse("order-list")).data["count"], 2)
+        self.assertEqual(Client().get(reverse("order-list")).data["count"], 1)
+
+    def test_cached_response_is_filled_from_primary(self):
+        writer, reader = Client(), Client()
+        self.assertEqual(writer.get(reverse("category-list")).status_code, 200)
+        writer.post(reverse("category-list"), {"name": "New"}, content_type="application/json")
+
+        def names(client):
+            return sorted(row["name"] for row in client.get(reverse("category-list")).data["results"])
+
+        # Klijent bez pina promaši keš (nova verzija), ali ga ne puni sa replike
+        self.assertEqual(names(reader), ["New", "Old"])
+        self.sync_replica()
+        self.assertEqual(names(writer), ["New", "Old"])
+
+    def test_streaming_export_reads_replica(self):
+        Product.objects.create(name="Novi", price=10, sku="NEW-1")
+        response = Client().get(reverse("export", args=["products"]), {"format": "csv"})
+        body = b"".join(response.streaming_content).decode()
+        self.assertIn("OLD-1", body)
+        self.assertNotIn("NEW-1", body)
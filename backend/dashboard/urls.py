@@ -0,0 +1,16 @@
+from django.urls import path
+
+from ecommerce.lazy import lazy_view
+
+# Viewovi se importuju pri prvom zahtjevu (dashboard.views povlači numpy i izvoze)
+urlpatterns = [
+    path('products/listing/', lazy_view("dashboard.views.ProductListingView"), name="product-listing"),
+    path('inventory/forecast/', lazy_view("dashboard.views.InventoryForecastView"), name="inventory-forecast"),
+    path('dashboard/summary/', lazy_view("dashboard.views.dashboard_summary", is_async=True),
+         name="dashboard-summary"),
+    path('orders-by-month/', lazy_view("dashboard.views.orders_by_month"), name="orders-by-month"),
+    path('orders-by-week/', lazy_view("dashboard.views.orders_by_week"), name="orders-by-week"),
+    path('orders-by-day/', lazy_view("dashboard.views.orders_by_day"), name="orders-by-day"),
+    path('analytics/top/', lazy_view("dashboard.views.analytics_top"), name="analytics-top"),
+    path('export/<str:resource>/', lazy_view("dashboard.views.export_resource"), name="export"),
+]
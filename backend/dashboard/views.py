@@ -1,3 +1,344 @@
-from django.shortcuts import render
+import asyncio
 
-# Create your views here.
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from django.db.models import Avg, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, generics
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from jobs.registry import enqueue
+from shop.models import Product
+from shop.pagination import StandardPagination
+from store.models import Inventory
+from .exports import CONTENT_TYPES, EXPORT_RESOURCES, filtered_queryset, stream_export
+from .filters import InventoryForecastFilter, ProductListingFilter
+from .forecast import ensure_forecast
+from .leaderboard import GROUPINGS, MAX_LIMIT, METRICS, cached_top, parse_window
+from .models import InventoryForecast, ProductListing
+from .rollups import ensure_rollups, orders_series
+from .serializers import InventoryForecastSerializer, ProductListingSerializer
+
+
+# Rasponi cijena koje ProductsPage prikazuje u grafikonu distribucije
+PRICE_RANGES = [
+    ("0-100€", 0, 100),
+    ("100-500€", 100, 500),
+    ("500-1000€", 500, 1000),
+    ("1000€+", 1000, None),
+]
+
+SCATTER_LIMIT = 200
+MAX_SCATTER_LIMIT = 1000
+
+
+def _stock_expression():
+    return Greatest(F("stock"), Value(0))
+
+
+async def inventory_status():
+    """
+    Broj redova inventara po statusu (available / low_stock / out_of_stock).
+    """
+    rows = Inventory.objects.values("status").annotate(count=Count("id")).order_by("status")
+    return {row["status"]: row["count"] async for row in rows}
+
+
+async def price_distribution():
+    """
+    Broj proizvoda po rasponu cijene — jedan upit sa COUNT(CASE ...) po rasponu.
+    """
+    aggregates = {}
+    for index, (_, low, high) in enumerate(PRICE_RANGES):
+        condition = Q(price__gte=low)
+        if high is not None:
+            condition &= Q(price__lt=high)
+        aggregates[f"range_{index}"] = Count("id", filter=condition)
+
+    counts = await Product.objects.aaggregate(**aggregates)
+    return [
+        {"range": label, "count": counts[f"range_{index}"]}
+        for index, (label, _, _) in enumerate(PRICE_RANGES)
+        if counts[f"range_{index}"] > 0
+    ]
+
+
+async def stock_by_category():
+    """
+    Ukupna zaliha po kategoriji, sabrana u bazi preko store.Inventory.
+    """
+    rows = (
+        Inventory.objects.filter(product__category__isnull=False)
+        .values("product__category", "product__category__name")
+        .annotate(stock=Sum(_stock_expression()))
+        .filter(stock__gt=0)
+        .order_by("product__category")
+    )
+    return [
+        {
+            "category_id": row["product__category"],
+            "category": row["product__category__name"],
+            "stock": row["stock"],
+        }
+        async for row in rows
+    ]
+
+
+async def category_distribution():
+    """
+    Broj proizvoda i prosječna cijena po kategoriji.
+    """
+    rows = (
+        Product.objects.filter(category__isnull=False)
+        .values("category", "category__name")
+        .annotate(count=Count("id"), avg_price=Avg("price"))
+        .order_by("category")
+    )
+    return [
+        {
+            "category_id": row["category"],
+            "category": row["category__name"],
+            "count": row["count"],
+            "avg_price": round(float(row["avg_price"] or 0), 2),
+        }
+        async for row in rows
+    ]
+
+
+async def price_vs_stock(limit=SCATTER_LIMIT):
+    """
+    Cijena i zaliha po proizvodu (ograničeno na `limit` tačaka za scatter grafikon).
+    """
+    stock = (
+        Inventory.objects.filter(product=OuterRef("pk"))
+        .values("product")
+        .annotate(total=Sum(_stock_expression()))
+        .values("total")
+    )
+    rows = (
+        Product.objects.annotate(
+            stock=Coalesce(Subquery(stock, output_field=IntegerField()), 0)
+        )
+        .values("id", "name", "price", "stock")
+        .order_by("id")[:limit]
+    )
+    return [
+        {
+            "id": row["id"],
+            "name": row["name"],
+            "price": float(row["price"]),
+            "stock": row["stock"],
+        }
+        async for row in rows
+    ]
+
+
+# ---------- Dashboard Summary Endpoint ----------
+@require_GET
+async def dashboard_summary(request):
+    """
+    Vraća sve agregate za ProductsPage u jednom odgovoru, izračunate u bazi.
+
+    Agregati koriste async ORM. Kad zahtjev stiže preko ASGI-ja, čekaju se
+    zajedno (`asyncio.gather`), tako da petlja događaja ne stoji između
+    upita. Pod WSGI-jem i unutar otvorene transakcije izvršavaju se redom
+    na konekciji zahtjeva.
+
+    Query parametri:
+    - scatter_limit — maksimalan broj tačaka za price-vs-stock (podrazumijevano 200)
+    - fanout=0 — agregati redom, jedan za drugim (za poređenje u bench_dashboard)
+    """
+    try:
+        limit = int(request.GET.get("scatter_limit", SCATTER_LIMIT))
+    except ValueError:
+        limit = SCATTER_LIMIT
+    limit = max(0, min(limit, MAX_SCATTER_LIMIT))
+
+    concurrent = (
+        isinstance(request, ASGIRequest)
+        and request.GET.get("fanout") != "0"
+        and not connection.in_atomic_block
+    )
+    aggregates = {
+        "product_count": Product.objects.acount,
+        "inventory_status": inventory_status,
+        "price_distribution": price_distribution,
+        "stock_by_category": stock_by_category,
+        "category_distribution": category_distribution,
+        "price_vs_stock": lambda: price_vs_stock(limit),
+    }
+    if concurrent:
+        results = await asyncio.gather(*(aggregate() for aggregate in aggregates.values()))
+    else:
+        results = [await aggregate() for aggregate in aggregates.values()]
+    return JsonResponse(dict(zip(aggregates, results)))
+
+
+# ---------- Orders Time Series (iz rollup tabele) ----------
+def _building_response(job, detail):
+    """
+    503 dok pozadinski posao gradi tabelu iz koje endpoint čita.
+    """
+    return Response(
+        {"detail": detail, "job": job.pk, "status_url": reverse("job-detail", args=[job.pk])},
+        status=503,
+        headers={"Retry-After": "30"},
+    )
+
+
+def _orders_series_response(request, period):
+    job = ensure_rollups()
+    if job is not None:
+        return _building_response(job, "Statistika narudžbi se gradi, pokušajte ponovo.")
+    status = request.query_params.get("status")
+    return Response(orders_series(period, status=status))
+
+
+@api_view(["GET"])
+def orders_by_month(request):
+    """
+    Vraća broj narudžbi, stavki i prihod grupisane po mesecima.
+    """
+    return _orders_series_response(request, "month")
+
+
+@api_view(["GET"])
+def orders_by_week(request):
+    """
+    Vraća broj narudžbi, stavki i prihod grupisane po sedmicama.
+    """
+    return _orders_series_response(request, "week")
+
+
+@api_view(["GET"])
+def orders_by_day(request):
+    """
+    Vraća broj narudžbi, stavki i prihod grupisane po danima.
+    """
+    return _orders_series_response(request, "day")
+
+
+# ---------- Leaderboard (top N) ----------
+@api_view(["GET"])
+def analytics_top(request):
+    """
+    Top proizvodi ili kategorije po prihodu/količini u vremenskom prozoru:
+    `?by=product|category&metric=revenue|quantity&window=30d&limit=10[&status=...]`.
+    """
+    params = request.query_params
+    by = params.get("by", "product")
+    metric = params.get("metric", "revenue")
+    window = params.get("window", "30d")
+    errors = {}
+    if by not in GROUPINGS:
+        errors["by"] = [f"Dozvoljeno: {', '.join(GROUPINGS)}."]
+    if metric not in METRICS:
+        errors["metric"] = [f"Dozvoljeno: {', '.join(METRICS)}."]
+    try:
+        parse_window(window)
+    except ValueError:
+        errors["window"] = ["Očekuje se npr. 12h, 30d, 4w ili all."]
+    try:
+        limit = int(params.get("limit", 10))
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValueError
+    except ValueError:
+        errors["limit"] = [f"Cijeli broj od 1 do {MAX_LIMIT}."]
+    if errors:
+        raise ValidationError(errors)
+    return Response(cached_top(by, metric, window, limit, status=params.get("status")))
+
+
+# ---------- Streaming Export ----------
+@csrf_exempt
+def export_resource(request, resource):
+    """
+    Streaming izvoz resursa (`products`, `orders`, `inventory`).
+
+    Query parametri:
+    - format — `ndjson` (podrazumijevano) ili `csv`
+    - isti filteri i `search` kao na listi resursa (redovi idu po `id`)
+    Ako klijent prihvata gzip, odgovor se kompresuje u letu.
+
+    POST sa istim parametrima dodaje izvoz u pozadinski red i vraća 202 sa
+    ID-em posla; gotov fajl je u `result.url` na /api/jobs/<id>/.
+    """
+    if request.method not in ("GET", "POST"):
+        return JsonResponse({"error": "Dozvoljeni su samo GET i POST."}, status=405)
+    if resource not in EXPORT_RESOURCES:
+        raise Http404(f"Nepoznat resurs: {resource}")
+    export_format = request.GET.get("format", "ndjson")
+    if export_format not in CONTENT_TYPES:
+        return JsonResponse({"error": "Format mora biti 'ndjson' ili 'csv'."}, status=400)
+
+    if request.method == "POST":
+        params = {key: request.GET.getlist(key) for key in request.GET if key != "format"}
+        job = enqueue("dashboard.export", resource=resource, export_format=export_format, params=params)
+        return JsonResponse(
+            {"job": job.pk, "status": job.status, "status_url": reverse("job-detail", args=[job.pk])},
+            status=202,
+        )
+
+    compress = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+    queryset = filtered_queryset(resource, request)
+    # Stream se čita nakon middleware-a, pa se baza (replika) bira sada
+    queryset = queryset.using(queryset.db)
+    columns = EXPORT_RESOURCES[resource]["columns"]
+
+    response = StreamingHttpResponse(
+        stream_export(queryset, columns, export_format, compress=compress),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{resource}.{export_format}"'
+    if compress:
+        response["Content-Encoding"] = "gzip"
+    response["Vary"] = "Accept-Encoding"
+    return response
+
+
+# ---------- Product Listing (read model) ----------
+class ProductListingView(generics.ListAPIView):
+    """
+    Grid proizvoda iz ProductListing tabele: cijena nakon popusta, zaliha,
+    status, kategorija i slika u jednom redu — jedan indeksiran SELECT.
+    """
+
+    queryset = ProductListing.objects.all().order_by("id")
+    serializer_class = ProductListingSerializer
+    pagination_class = StandardPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_class = ProductListingFilter
+    search_fields = ["name", "sku"]
+    ordering_fields = ["id", "name", "price", "effective_price", "stock"]
+    ordering = ["id"]
+
+
+# ---------- Inventory Forecast (read model) ----------
+class InventoryForecastView(generics.ListAPIView):
+    """
+    Brzina prodaje, dani pokrivenosti i tačka ponovnog naručivanja po
+    proizvodu: `?days_of_cover__lte=14`, `?needs_reorder=true`. Podrazumijevano
+    sortirano po danima pokrivenosti (proizvodi bez prodaje na kraju).
+    Dok se prognoza prvi put gradi u pozadini, odgovor je 503 sa ID-em posla.
+    """
+
+    queryset = InventoryForecast.objects.order_by(F("days_of_cover").asc(nulls_last=True), "product_id")
+    serializer_class = InventoryForecastSerializer
+    pagination_class = StandardPagination
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_class = InventoryForecastFilter
+    search_fields = ["name", "sku"]
+    ordering_fields = ["days_of_cover", "velocity_ewma", "stock", "reorder_point", "units_sold"]
+
+    def list(self, request, *args, **kwargs):
+        job = ensure_forecast()
+        if job is not None:
+            return _building_response(job, "Prognoza se gradi, pokušajte ponovo.")
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,142 @@
+"""
+Keš odgovora za read-heavy endpointe sa verzijama po modelu.
+
+Svaki keširani model ima verziju (vrijeme zadnje izmjene u ns) u Django
+kešu; `post_save`/`post_delete` je mijenjaju nakon commita. Ključ odgovora
+sadrži verzije svih modela od kojih odgovor zavisi i normalizovane query
+parametre, pa izmjena automatski "poništava" stare unose. Na promašaju se
+odgovor računa sa primarne baze, nikad sa replike koja kasni. Odgovori nose
+`ETag` i `Last-Modified`; `304` se vraća samo po `If-None-Match` (ETag je
+iz verzija u ns). `If-Modified-Since` se ne koristi: ima rezoluciju od
+sekunde, pa bi izmjena u istoj sekundi dala zastarjeli `304`.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from ecommerce.db_router import use_primary
+
+VERSION_PREFIX = "model-version"
+RESPONSE_PREFIX = "response"
+
+
+def _cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _version_key(model):
+    return f"{VERSION_PREFIX}:{model._meta.label_lower}"
+
+
+def model_version(model):
+    """
+    Trenutna verzija modela; ako je nema u kešu, postavlja se na "sada".
+    """
+    cache = _cache()
+    version = cache.get(_version_key(model))
+    if version is None:
+        version = time.time_ns()
+        cache.add(_version_key(model), version, None)
+        version = cache.get(_version_key(model), version)
+    return version
+
+
+def _set_version(model):
+    _cache().set(_version_key(model), time.time_ns(), None)
+
+
+def bump_version(model):
+    """
+    Označava model kao izmijenjen: odmah i ponovo nakon commita, da se
+    odgovor pročitan prije commita ne zadrži pod novom verzijom.
+    Pozvati ručno poslije `update()` / `bulk_create()` jer oni ne šalju signale.
+    """
+    _set_version(model)
+    transaction.on_commit(lambda: _set_version(model))
+
+
+def _on_change(sender, **kwargs):
+    bump_version(sender)
+
+
+def track_model(model):
+    for signal in (post_save, post_delete):
+        signal.connect(
+            _on_change, sender=model, weak=False,
+            dispatch_uid=f"response-cache-{model._meta.label_lower}-{signal is post_save}",
+        )
+
+
+class CachedResponseMixin:
+    """
+    Mixin za viewset: keširaju se akcije iz `cache_actions`, a ključ zavisi
+    od verzija modela u `cache_models`.
+    """
+
+    cache_actions = ("list",)
+    cache_models = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for model in cls.cache_models:
+            track_model(model)
+
+    def _cache_state(self, request):
+        versions = [model_version(model) for model in self.cache_models]
+        params = sorted(request.query_params.lists())
+        raw = repr((type(self).__module__, type(self).__name__, self.action, request.get_host(),
+                    sorted(self.kwargs.items()), params, versions))
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        # Last-Modified se zaokružuje naviše, da nikad nije prije izmjene
+        modified = -(-max(versions, default=0) // 10**9)
+        return f"{RESPONSE_PREFIX}:{digest}", f'"{digest}"', modified
+
+    def _not_modified(self, request, etag):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Slaba poređenja (RFC 9110): proxy koji kompresuje dodaje `W/`
+        return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    def _with_cache_headers(self, response, etag, modified):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(modified)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        key, etag, modified = self._cache_state(request)
+        if self._not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = _cache().get(key)
+            if data is not None:
+                response = Response(data)
+            else:
+                # Keš se puni samo sa primarne baze: odgovor sa replike koja kasni
+                # bi se sačuvao pod novom verzijom i nadživio izmjenu
+                with use_primary():
+                    response = handler(request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    timeout = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 3600)
+                    _cache().set(key, response.data, timeout)
+        return self._with_cache_headers(response, etag, modified)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,142 @@
+"""
+Rutiranje upita između primarne baze (`default`) i replike za čitanje.
+
+Replika se koristi samo kad je konfigurisana (alias DATABASE_REPLICA_ALIAS
+u DATABASES) i samo unutar konteksta koji to dozvoli:
+
+- ReplicaRoutingMiddleware dozvoljava repliku za GET/HEAD zahtjeve (liste,
+  analitika, izvozi),
+- `replica_reads()` za kod van zahtjeva (npr. pozadinski izvoz).
+
+Sve ostalo (upisi, poslovi, komande, otvorene transakcije na primarnoj
+bazi) ide na `default`. Prvi upis u zahtjevu "pinuje" ostatak zahtjeva na
+primarnu bazu, a middleware postavlja kratkotrajan kolačić, pa i sljedeći
+zahtjevi istog klijenta u narednih REPLICA_PIN_SECONDS sekundi čitaju sa
+primarne baze (read-your-writes uprkos kašnjenju replikacije).
+
+Stanje je u contextvar-u, pa ga vide i niti koje pokreće `sync_to_async`.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_route = contextvars.ContextVar("db_route", default=None)
+
+
+class _RouteState:
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+def replica_alias():
+    """
+    Alias replike ako je konfigurisana, inače None.
+    """
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "replica")
+    return alias if alias in connections.settings else None
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+@contextmanager
+def _routing(replica):
+    outer = _route.get()
+    state = _RouteState(replica)
+    token = _route.set(state)
+    try:
+        yield state
+    finally:
+        _route.reset(token)
+        if state.wrote and outer is not None:
+            # Upis u ugniježđenom bloku pinuje i spoljašnji kontekst (zahtjev)
+            outer.wrote = True
+
+
+def replica_reads():
+    """
+    Čitanja unutar bloka idu na repliku (dok nema upisa).
+    """
+    return _routing(replica=True)
+
+
+def use_primary():
+    """
+    Sva čitanja unutar bloka idu na primarnu bazu.
+    """
+    return _routing(replica=False)
+
+
+def pin_to_primary():
+    """
+    Ostatak tekućeg konteksta čita sa primarne baze.
+    """
+    state = _route.get()
+    if state is not None:
+        state.wrote = True
+
+
+class PrimaryReplicaRouter:
+    """
+    Router za DATABASE_ROUTERS. `replica` se može zadati eksplicitno
+    (testovi); podrazumijevano se čita iz podešavanja.
+    """
+
+    def __init__(self, replica=None):
+        self._replica = replica
+
+    @property
+    def replica(self):
+        return self._replica if self._replica is not None else replica_alias()
+
+    def db_for_read(self, model, **hints):
+        state = _route.get()
+        replica = self.replica
+        if replica is None or state is None or not state.replica or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Transakcija na primarnoj bazi mora vidjeti sopstvene izmjene
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replika sadrži iste podatke kao primarna baza
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Šema replike dolazi replikacijom (ili `sync_replica` za SQLite)
+        return db != self.replica
+
+
+class ReplicaRoutingMiddleware:
+    """
+    GET/HEAD zahtjevi čitaju sa replike, osim ako klijent ima kolačić
+    PIN_COOKIE (nedavno je pisao). Zahtjev koji je pisao postavlja kolačić.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replica = request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+        with _routing(replica) as state:
+            response = self.get_response(request)
+        if replica_alias() is not None and (state.wrote or request.method not in SAFE_METHODS):
+            # Isti cross-site uslovi kao sesijski kolačić (frontend je na drugom domenu)
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=pin_seconds(), httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE, samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
@@ -0,0 +1,47 @@
+"""
+Lijeno učitavanje viewova iz URL konfiguracije.
+
+`lazy_view("dashboard.views.analytics_top")` je callable za `path()` koji
+modul viewa importuje tek pri prvom zahtjevu na tu rutu (ili pri prvom
+`reverse()`, koji prolazi kroz sve rute). Tako hladan start i prvi zahtjev
+na, npr., /api/products/ ne plaćaju import numpy-ja, izvoza i analitike.
+
+Atributi koje Django i middleware čitaju sa viewa (`csrf_exempt`, `cls`,
+`view_class`...) prosljeđuju se pravom viewu. Async view se mora označiti
+sa `is_async=True`, jer Django to provjerava prije poziva.
+"""
+
+from asgiref.sync import markcoroutinefunction
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+
+class LazyView:
+    def __init__(self, dotted_path, is_async=False, **initkwargs):
+        self.dotted_path = dotted_path
+        self.initkwargs = initkwargs
+        if is_async:
+            markcoroutinefunction(self)
+
+    @cached_property
+    def view(self):
+        view = import_string(self.dotted_path)
+        if isinstance(view, type):
+            # Klasa (View / APIView): kao `View.as_view(**initkwargs)` u urls.py
+            view = view.as_view(**self.initkwargs)
+        return view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.view, name)
+
+    def __repr__(self):
+        return f"<LazyView {self.dotted_path}>"
+
+
+def lazy_view(dotted_path, is_async=False, **initkwargs):
+    return LazyView(dotted_path, is_async=is_async, **initkwargs)
@@ -0,0 +1,227 @@
+"""
+Brza (lean) serializacija za read-only liste.
+
+DRF za svaki red liste prolazi kroz `Serializer.to_representation`:
+`get_attribute` po polju, PKOnlyObject za veze, `quantize` za svaki Decimal i
+`astimezone` za svaki datum. `CompiledSerializer` to radi jednom po zahtjevu:
+za svako polje serializera odabere getter (direktan atribut modela, `*_id`
+kolona za PK vezu, bound `get_*` metoda) i formatter, pa se red pravi jednim
+prolazom kroz listu gettera.
+
+Rezultat je isti kao `serializer.data` (isti ključevi, redoslijed i
+formatiranje) — polja za koja nema brzog puta idu kroz sopstveni
+`get_attribute`/`to_representation`. Uključuje se sa LeanListMixin na
+viewsetu, a isključuje sa LEAN_LIST_SERIALIZERS = False.
+"""
+
+import datetime
+import decimal
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from ecommerce.renderers import FastJSONRenderer
+
+
+def _model_field(field):
+    """
+    Konkretno polje modela iza serializer polja sa jednostavnim `source`-om, ili None.
+    """
+    if len(field.source_attrs) != 1:
+        return None
+    model = getattr(getattr(field.parent, "Meta", None), "model", None)
+    if model is None:
+        return None
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many:
+        return None
+    return model_field
+
+
+def _decimal_formatter(field):
+    """
+    Decimal iz baze već ima tačno `decimal_places` decimala, pa je
+    `quantize` no-op i dovoljan je `f"{value:f}"`. Ostalo ide kroz DRF.
+    """
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce or field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exponent = -field.decimal_places
+    max_digits = field.max_digits
+    slow = field.to_representation
+
+    def fmt(value):
+        if type(value) is decimal.Decimal:
+            parts = value.as_tuple()
+            if parts.exponent == exponent and (max_digits is None or len(parts.digits) <= max_digits):
+                return f"{value:f}"
+        return slow(value)
+
+    return fmt
+
+
+def _is_utc(tz):
+    return tz is datetime.timezone.utc or getattr(tz, "key", None) == "UTC"
+
+
+def _datetime_formatter(field):
+    """
+    Kad je ciljna zona UTC, a vrijednost iz baze već u UTC-u, `astimezone`
+    ne mijenja ništa — ostaje samo ISO zapis sa `Z`.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if not _is_utc(field_timezone):
+        return field.to_representation
+
+    slow = field.to_representation
+
+    def fmt(value):
+        if type(value) is datetime.datetime and value.tzinfo is datetime.timezone.utc:
+            return value.isoformat()[:-6] + "Z"
+        return slow(value)
+
+    return fmt
+
+
+_IDENTITY_FORMATTERS = {
+    serializers.IntegerField: int,
+    serializers.CharField: str,
+}
+
+
+def _formatter(field):
+    if type(field) in _IDENTITY_FORMATTERS:
+        return _IDENTITY_FORMATTERS[type(field)]
+    if type(field) is serializers.DecimalField:
+        return _decimal_formatter(field)
+    if type(field) is serializers.DateTimeField:
+        return _datetime_formatter(field)
+    return field.to_representation
+
+
+def _generic_getter(field):
+    """
+    Isto što radi `Serializer.to_representation` za jedno polje.
+    """
+    get_attribute = field.get_attribute
+    to_representation = field.to_representation
+
+    def getter(instance):
+        value = get_attribute(instance)
+        check_for_none = value.pk if isinstance(value, PKOnlyObject) else value
+        return None if check_for_none is None else to_representation(value)
+
+    return getter
+
+
+def _compile_field(field):
+    if isinstance(field, serializers.ListSerializer):
+        child = CompiledSerializer(field.child)
+        get_attribute = field.get_attribute
+
+        def getter(instance):
+            value = get_attribute(instance)
+            if value is None:
+                return None
+            iterable = value.all() if isinstance(value, BaseManager) else value
+            return [child(item) for item in iterable]
+
+        return getter
+
+    if isinstance(field, serializers.BaseSerializer):
+        child = CompiledSerializer(field)
+        get_attribute = field.get_attribute
+
+        def getter(instance):
+            value = get_attribute(instance)
+            return None if value is None else child(value)
+
+        return getter
+
+    if isinstance(field, serializers.SerializerMethodField):
+        return getattr(field.parent, field.method_name)
+
+    model_field = _model_field(field)
+    if model_field is None:
+        return _generic_getter(field)
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        if field.pk_field is not None or not model_field.is_relation:
+            return _generic_getter(field)
+        # Isto kao PKOnlyObject: vrijednost `*_id` kolone, bez upita za povezani red
+        return attrgetter(model_field.attname)
+    if model_field.is_relation or type(field).get_attribute is not serializers.Field.get_attribute:
+        # npr. ModelField čita sam objekat (`get_attribute` vraća instancu)
+        return _generic_getter(field)
+
+    read = attrgetter(model_field.attname)
+    fmt = _formatter(field)
+
+    def getter(instance):
+        value = read(instance)
+        return None if value is None else fmt(value)
+
+    return getter
+
+
+class CompiledSerializer:
+    """
+    Serializer "kompajliran" u listu (ime, getter); poziv vraća dict za jedan red.
+    """
+
+    def __init__(self, serializer):
+        self.getters = [
+            (field.field_name, _compile_field(field))
+            for field in serializer.fields.values()
+            if not field.write_only
+        ]
+
+    def __call__(self, instance):
+        row = {}
+        for name, getter in self.getters:
+            try:
+                row[name] = getter(instance)
+            except SkipField:
+                continue
+        return row
+
+
+def lean_enabled():
+    return getattr(settings, "LEAN_LIST_SERIALIZERS", True)
+
+
+class LeanListMixin:
+    """
+    Mixin za viewset: `list()` gradi redove preko CompiledSerializer-a i
+    renderuje ih sa FastJSONRenderer-om. Odgovor je bajt-identičan onom
+    koji daje `get_serializer(page, many=True).data`.
+    """
+
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def list(self, request, *args, **kwargs):
+        if not lean_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        to_row = CompiledSerializer(self.get_serializer())
+        rows = [to_row(instance) for instance in (queryset if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
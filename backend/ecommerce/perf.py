@@ -0,0 +1,144 @@
+"""
+Mjerenje latencije i SQL upita po endpointu.
+
+PerfMiddleware za svaki zahtjev bilježi trajanje, broj i vrijeme SQL upita
+(preko `connection.execute_wrapper`) i veličinu odgovora, dodaje
+`Server-Timing` header i upisuje mjerenje u ograničeni ring buffer po
+(url_name, metoda). Statistika se čita na /api/_perf/ (samo admin).
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _EndpointStats:
+    def __init__(self, window):
+        self.count = 0
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.bytes = 0
+        self.latencies = deque(maxlen=window)
+
+    def as_dict(self):
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "p50_ms": round(_percentile(latencies, 0.50), 2),
+            "p95_ms": round(_percentile(latencies, 0.95), 2),
+            "p99_ms": round(_percentile(latencies, 0.99), 2),
+            "avg_queries": round(self.queries / self.count, 2) if self.count else 0,
+            "avg_sql_ms": round(self.sql_ms / self.count, 2) if self.count else 0,
+            "avg_bytes": self.bytes // self.count if self.count else 0,
+        }
+
+
+class PerfStats:
+    """
+    Thread-safe registar statistike po (url_name, metoda).
+    Latencije se čuvaju samo za zadnjih `window` zahtjeva po endpointu.
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, method, duration_ms, queries, sql_ms, size):
+        key = (endpoint, method)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = _EndpointStats(self.window)
+            stats.count += 1
+            stats.queries += queries
+            stats.sql_ms += sql_ms
+            stats.bytes += size
+            stats.latencies.append(duration_ms)
+
+    def snapshot(self):
+        with self._lock:
+            rows = [
+                {"endpoint": endpoint, "method": method, **stats.as_dict()}
+                for (endpoint, method), stats in self._endpoints.items()
+            ]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+perf_stats = PerfStats(window=getattr(settings, "PERF_STATS_WINDOW", 1000))
+
+
+class _QueryTracker:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def _endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match.route
+
+
+class PerfMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tracker = _QueryTracker()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(tracker))
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        sql_ms = tracker.duration * 1000
+
+        response["Server-Timing"] = (
+            f'app;dur={duration_ms:.1f}, db;dur={sql_ms:.1f};desc="{tracker.count} queries"'
+        )
+        size = 0 if response.streaming else len(response.content)
+        perf_stats.record(
+            _endpoint_name(request), request.method, duration_ms, tracker.count, sql_ms, size
+        )
+        return response
+
+
+# ---------- Perf Stats Endpoint ----------
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def perf_stats_view(request):
+    """
+    Vraća statistiku po endpointu (sortirano po p95). DELETE briše statistiku.
+    """
+    if request.method == "DELETE":
+        perf_stats.reset()
+        return Response(status=204)
+    return Response({"window": perf_stats.window, "endpoints": perf_stats.snapshot()})
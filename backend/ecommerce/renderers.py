@@ -0,0 +1,53 @@
+"""
+JSON renderer sa orjson-om.
+
+FastJSONRenderer daje iste bajtove kao DRF JSONRenderer (kompaktni separatori,
+UTF-8 bez escapovanja, escapovani U+2028/U+2029), samo brže. Datumi, Decimal,
+lazy stringovi i ostali tipovi koje orjson ne zna idu kroz DRF-ov
+JSONEncoder.default, pa se formatiraju isto kao do sada. Bez orjson-a, uz
+`?indent=` ili nestandardna REST_FRAMEWORK podešavanja koristi se JSONRenderer.
+
+Razlika postoji samo za float u eksponencijalnom zapisu (`1e16` umjesto
+`1e+16`) i NaN/Infinity (`null` umjesto greške) — zato se renderer koristi
+samo na endpointima bez float polja.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson je opcion
+    orjson = None
+
+
+_OPTIONS = 0
+if orjson is not None:
+    _OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_NON_STR_KEYS
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.encoder_class is not JSONEncoder
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=JSONEncoder().default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            # npr. int veći od 64 bita ili nepoznat tip — JSONRenderer daje isti rezultat/grešku
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'core',
     'store',
     'dashboard',
+    'jobs',
 
     # REST API i filteri
     'rest_framework',
@@ -59,6 +60,8 @@ AUTH_USER_MODEL = 'core.User'
 # -----------------------------------------------------
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # mora biti visoko
+    "ecommerce.perf.PerfMiddleware",  # latencija i SQL upiti po endpointu
+    "ecommerce.db_router.ReplicaRoutingMiddleware",  # čitanja na repliku, read-your-writes
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # za statičke fajlove
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -69,6 +72,9 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Broj zadnjih zahtjeva po endpointu za p50/p95/p99 (vidi /api/_perf/)
+PERF_STATS_WINDOW = int(os.environ.get('PERF_STATS_WINDOW', '1000'))
+
 # -----------------------------------------------------
 # ✅ URLS / TEMPLATES / WSGI
 # -----------------------------------------------------
@@ -94,16 +100,87 @@ WSGI_APPLICATION = 'ecommerce.wsgi.application'
 # -----------------------------------------------------
 # ✅ DATABASE CONFIG
 # -----------------------------------------------------
-DATABASES = {
+# DB_ENGINE=mysql (podrazumijevano) ili sqlite (lokalno: DB_NAME je putanja fajla).
+# Replika za čitanje se uključuje sa DB_REPLICA_HOST (MySQL) odnosno
+# DB_REPLICA_NAME (SQLite fajl, puni se sa `manage.py sync_replica`; u testovima
+# je to zasebna test baza, ReplicaDatabaseTests je puni istom komandom).
+DB_ENGINE = os.environ.get('DB_ENGINE', 'mysql')
+
+# Konekcija se drži otvorenom između zahtjeva (s) i provjerava prije ponovne upotrebe
+DB_CONNECTION = {
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+    'CONN_HEALTH_CHECKS': True,
+}
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+            # IMMEDIATE: upis zaključava bazu na početku transakcije, bez "database is locked" pri nadogradnji
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
+            **DB_CONNECTION,
+        }
+    }
+    if os.environ.get('DB_REPLICA_NAME'):
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ['DB_REPLICA_NAME'],
+            'OPTIONS': {'timeout': 20},
+            **DB_CONNECTION,
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': os.environ.get('DB_NAME', 'ecommerce'),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'USER': os.environ.get('DB_USER', 'root'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', '123Qwertz123?'),
+            'PORT': os.environ.get('DB_PORT', '3306'),
+            **DB_CONNECTION,
+        }
+    }
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': os.environ['DB_REPLICA_HOST'],
+            'USER': os.environ.get('DB_REPLICA_USER', DATABASES['default']['USER']),
+            'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+            'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+
+# Čitanja GET/HEAD zahtjeva idu na repliku (ecommerce/db_router.py); nakon
+# upisa klijent čita sa primarne baze još REPLICA_PIN_SECONDS sekundi
+DATABASE_ROUTERS = ['ecommerce.db_router.PrimaryReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '5'))
+
+# -----------------------------------------------------
+# ✅ CACHE
+# -----------------------------------------------------
+# Podrazumijevano fajl keš, zajednički za sve procese: gunicorn workere i
+# `manage.py runworker`, čiji poslovi mijenjaju podatke i podižu verzije keša
+# (ecommerce/cache.py) koje web procesi moraju vidjeti. CACHE_BACKEND=locmem
+# samo za jedan proces bez workera (runworker ga odbija).
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+}
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': os.environ.get('DB_NAME', 'ecommerce'),
-        'HOST': os.environ.get('DB_HOST', 'localhost'),
-        'USER': os.environ.get('DB_USER', 'root'),
-        'PASSWORD': os.environ.get('DB_PASSWORD', '123Qwertz123?'),
-        'PORT': os.environ.get('DB_PORT', '3306'),
+        'BACKEND': CACHE_BACKENDS[os.environ.get('CACHE_BACKEND', 'file')],
+        'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(BASE_DIR, '.cache')),
     }
 }
+# Koliko dugo (s) se čuva keširan odgovor; izmjena podataka ga poništava ranije
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '3600'))
+# /api/analytics/top/ se kešira po vremenskom bucketu ove dužine (sekunde)
+LEADERBOARD_BUCKET_SECONDS = int(os.environ.get('LEADERBOARD_BUCKET_SECONDS', '300'))
+# Prognoza zaliha (dashboard/forecast.py): vrijeme isporuke u danima i z za sigurnosnu zalihu
+FORECAST_LEAD_TIME_DAYS = int(os.environ.get('FORECAST_LEAD_TIME_DAYS', '7'))
+FORECAST_SERVICE_LEVEL_Z = float(os.environ.get('FORECAST_SERVICE_LEVEL_Z', '1.65'))
 
 # -----------------------------------------------------
 # ✅ PASSWORD VALIDATORS
@@ -130,6 +207,15 @@ STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# -----------------------------------------------------
+# ✅ MEDIA (upload slika proizvoda i thumbnailovi)
+# -----------------------------------------------------
+MEDIA_URL = os.environ.get('MEDIA_URL', '/media/')
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Thumbnailovi slika proizvoda: širina u px -> format (WEBP, ili JPEG ako Pillow nema WebP)
+THUMBNAIL_SIZES = [128, 512]
+
 # -----------------------------------------------------
 # ✅ CORS & CSRF CONFIGURATION
 # -----------------------------------------------------
@@ -169,6 +255,33 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 8,
 }
 
+# Pretraga proizvoda: 'auto' (MySQL FULLTEXT / SQLite FTS5 po bazi), 'mysql', 'sqlite' ili 'icontains'
+PRODUCT_SEARCH_BACKEND = os.environ.get('PRODUCT_SEARCH_BACKEND', 'auto')
+
+# Liste proizvoda, narudžbi i zaliha bez punog serializera po redu (ecommerce/lean.py)
+LEAN_LIST_SERIALIZERS = os.environ.get('LEAN_LIST_SERIALIZERS', 'True') == 'True'
+
+# Masovni upis (/api/products/bulk/, /api/inventory/bulk/) šalje i do 50k redova
+DATA_UPLOAD_MAX_MEMORY_SIZE = 50 * 1024 * 1024
+
+# Hladan start (ecommerce/startup.py): zagrijavanje keševa 'background' (nakon
+# prvog odgovora), 'sync' (pri importu aplikacije) ili 'off'; budžet za
+# `manage.py profile_startup` i test hladnog starta (ms do prvog odgovora)
+STARTUP_WARMUP = os.environ.get('STARTUP_WARMUP', 'background')
+COLD_START_BUDGET_MS = int(os.environ.get('COLD_START_BUDGET_MS', '1500'))
+
+# Imena @task poslova (jobs/registry.py): `enqueue()` u web procesu provjerava
+# ime ovdje, bez importa svih tasks.py modula (numpy, izvozi); worker ih učitava
+JOB_TASKS = [
+    'dashboard.export',
+    'dashboard.refresh_inventory_forecast',
+    'dashboard.refresh_product_listing',
+    'dashboard.refresh_rollups',
+    'shop.generate_thumbnails',
+    'shop.recompute_inventory_status',
+    'store.compact_inventory',
+]
+
 
 
 # -----------------------------------------------------
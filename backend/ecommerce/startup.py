@@ -0,0 +1,241 @@
+"""
+Hladan start aplikacije: mjerenje i zagrijavanje.
+
+`probe()` se izvršava u svježem procesu (`python -X importtime -m
+ecommerce.startup /api/health/`) i mjeri faze do prvog odgovora: import
+Django-a, `django.setup()` sa `import_models`/`ready()` po aplikaciji,
+učitavanje middleware-a i prvi zahtjev (uključuje import URL konfiguracije),
+pa zatim `warm_up()`. `run_probe()` pokreće taj proces i iz `-X importtime`
+izlaza pravi listu modula sa vremenom importa. Koriste ga
+`manage.py profile_startup` i test budžeta hladnog starta.
+
+`warm_up()` unaprijed puni keševe koje bi inače platio prvi zahtjev na
+svaku rutu: URL resolver (sve rute, i lijeni viewovi), i polja serializera
+svih viewova (ModelSerializer polja, `_meta` keševi modela). Pokreće se iz
+wsgi.py/asgi.py po STARTUP_WARMUP: `background` (nit nakon prvog odgovora,
+da hladan zahtjev ne čeka), `sync` (odmah, prije prvog zahtjeva — npr.
+gunicorn `--preload`) ili `off`.
+
+Modul se učitava prije Django-a, pa se Django importuje tek unutar funkcija.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+_warm_lock = threading.Lock()
+_warmed = False
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _timed_app_configs(timings):
+    """
+    Mjeri `import_models()` i `ready()` svake aplikacije (omotač na instanci).
+    """
+    from django.apps.config import AppConfig
+
+    create = AppConfig.create.__func__
+
+    def timed_create(cls, entry):
+        app_config = create(cls, entry)
+        row = timings.setdefault(app_config.label, {"app": app_config.label})
+        for method in ("import_models", "ready"):
+            original = getattr(app_config, method)
+
+            def timed(original=original, method=method):
+                start = time.perf_counter()
+                original()
+                row[f"{method}_ms"] = _ms(start)
+
+            setattr(app_config, method, timed)
+        return app_config
+
+    AppConfig.create = classmethod(timed_create)
+
+
+def _wsgi_get(handler, path):
+    from wsgiref.util import setup_testing_defaults
+
+    path, _, query = path.partition("?")
+    environ = {"PATH_INFO": path, "QUERY_STRING": query, "REQUEST_METHOD": "GET"}
+    setup_testing_defaults(environ)
+    status = []
+    body = handler(environ, lambda code, headers, exc_info=None: status.append(code))
+    try:
+        size = sum(len(chunk) for chunk in body)
+    finally:
+        getattr(body, "close", lambda: None)()
+    return int(status[0].split()[0]), size
+
+
+def probe(path="/api/health/"):
+    """
+    Faze hladnog starta u ovom (svježem) procesu. Vraća dict za JSON.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ecommerce.settings")
+    phases = {}
+
+    start = time.perf_counter()
+    import django
+    from django.core.handlers.wsgi import WSGIHandler
+    phases["import_django_ms"] = _ms(start)
+
+    step = time.perf_counter()
+    apps = {}
+    _timed_app_configs(apps)
+    django.setup(set_prefix=False)
+    phases["setup_ms"] = _ms(step)
+
+    step = time.perf_counter()
+    handler = WSGIHandler()
+    phases["middleware_ms"] = _ms(step)
+
+    step = time.perf_counter()
+    status, size = _wsgi_get(handler, path)
+    phases["first_request_ms"] = _ms(step)
+    total = _ms(start)
+    cold_modules = sorted(sys.modules)
+
+    step = time.perf_counter()
+    warm_up()
+    phases["warm_up_ms"] = _ms(step)
+
+    step = time.perf_counter()
+    _wsgi_get(handler, path)
+    phases["warm_request_ms"] = _ms(step)
+
+    return {
+        "path": path,
+        "status": status,
+        "bytes": size,
+        "total_ms": total,
+        "phases": phases,
+        "apps": list(apps.values()),
+        "cold_modules": cold_modules,
+    }
+
+
+def parse_importtime(stderr):
+    """
+    Linije `-X importtime` -> [{"module", "self_ms", "cumulative_ms", "depth"}].
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(name) - len(name.lstrip())) // 2,
+        })
+    return modules
+
+
+def run_probe(path="/api/health/", settings_module=None):
+    """
+    Pokreće `probe()` u novom procesu sa `-X importtime`; vraća rezultat
+    probe-a dopunjen sa `process_ms` (ukupno, sa startom interpretera) i
+    `modules` (vrijeme importa po modulu, `cold` za module hladnog starta).
+    """
+    from django.conf import settings
+
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = settings_module or os.environ.get(
+        "DJANGO_SETTINGS_MODULE", "ecommerce.settings"
+    )
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "ecommerce.startup", path],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    process_ms = _ms(start)
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-20:]))
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = process_ms
+    # `cold`: modul je učitan prije prvog odgovora (ostalo je warm_up())
+    cold = set(result.pop("cold_modules"))
+    result["modules"] = [
+        dict(module, cold=module["module"] in cold) for module in parse_importtime(completed.stderr)
+    ]
+    return result
+
+
+def _api_views():
+    """
+    DRF view klase svih ruta (`as_view()` im postavlja `cls`), bez ponavljanja.
+    """
+    from django.urls import URLResolver, get_resolver
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            else:
+                view_class = getattr(pattern.callback, "cls", None)
+                if view_class is not None:
+                    yield view_class
+
+    seen = set()
+    for view_class in walk(get_resolver().url_patterns):
+        if view_class not in seen:
+            seen.add(view_class)
+            yield view_class
+
+
+def warm_up():
+    """
+    Puni URL resolver (reverse/populate importuje i lijene viewove) i polja
+    serializera svih DRF viewova. Idempotentno; vraća broj serializera.
+    """
+    global _warmed
+    with _warm_lock:
+        if _warmed:
+            return 0
+        from django.urls import get_resolver
+
+        # reverse_dict -> _populate(): kompajlira sve rute i importuje lijene viewove
+        get_resolver().reverse_dict
+
+        count = 0
+        for view_class in _api_views():
+            serializer_class = getattr(view_class, "serializer_class", None)
+            if serializer_class is None:
+                continue
+            # ModelSerializer gradi polja iz _meta modela (i puni njegove keševe)
+            serializer_class(context={}).fields
+            count += 1
+        _warmed = True
+        return count
+
+
+def schedule_warm_up():
+    """
+    Poziva se iz wsgi.py/asgi.py nakon kreiranja aplikacije (STARTUP_WARMUP).
+    """
+    from django.conf import settings
+    from django.core.signals import request_finished
+
+    mode = getattr(settings, "STARTUP_WARMUP", "background")
+    if mode == "sync":
+        warm_up()
+    elif mode == "background":
+        def start(**kwargs):
+            request_finished.disconnect(start, dispatch_uid="startup-warm-up")
+            threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+        request_finished.connect(start, weak=False, dispatch_uid="startup-warm-up")
+
+
+if __name__ == "__main__":
+    print(json.dumps(probe(*sys.argv[1:2]), default=str))
@@ -6,19 +6,35 @@ Routes:
 - /api/products/?search=ime — pretraga
 - /api/products/?ordering=-price — sortiranje
 - /api/products/?page=2 — paginacija
+- /api/products/listing/ — ravna lista proizvoda iz ProductListing read modela
+- /api/inventory/forecast/?days_of_cover__lte=14 — brzina prodaje, pokrivenost i tačka naručivanja
+- /api/inventory-movements/ — ledger kretanja zalihe (POST bez zaključavanja reda), ?product=&days= za istoriju na /history/
+- /api/checkout/ — aktivna korpa -> narudžba (POST, atomski, bez overselling-a)
+- /api/dashboard/summary/ — agregati za dashboard (računati u bazi)
+- /api/orders-by-month/, /api/orders-by-week/, /api/orders-by-day/ — serije iz rollup tabele
+- /api/analytics/top/?by=product|category&metric=revenue|quantity&window=30d&limit=10 — rang liste
+- /api/export/<products|orders|inventory>/?format=csv — streaming izvoz sa istim filterima
+- /api/jobs/ — status poslova iz pozadinskog reda (manage.py runworker)
+- /api/_perf/ — latencija i SQL statistika po endpointu (samo admin)
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from django.http import JsonResponse
 
+from ecommerce.perf import perf_stats_view
+
 
 from core.views import UserViewSet, RoleViewSet
+from jobs.views import JobViewSet
 from shop.views import CategoryViewSet, ProductViewSet, ProductImageViewSet
 from store.views import (
     PaymentViewSet, ShippingAddressViewSet, OrderViewSet, OrderItemViewSet,
     CartItemViewSet, DiscountTypeViewSet, DiscountViewSet, InventoryViewSet,
+    InventoryMovementViewSet,
 )
 
 
@@ -36,6 +52,8 @@ router.register(r'cart-items', CartItemViewSet)
 router.register(r'discount-types', DiscountTypeViewSet)
 router.register(r'discounts', DiscountViewSet)
 router.register(r'inventory', InventoryViewSet)
+router.register(r'inventory-movements', InventoryMovementViewSet)
+router.register(r'jobs', JobViewSet)
 
 
 
@@ -46,7 +64,13 @@ def health_check(request):
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    # dashboard prije routera: /api/products/listing/ bi inače bio products/<pk>/
+    path("api/", include("dashboard.urls")),
     path("api/", include(router.urls)),
     path("api/", include("store.urls")),
     path("api/health/", health_check),
+    path("api/_perf/", perf_stats_view, name="perf-stats"),
 ]
+
+# Upload slika i thumbnailovi (samo u DEBUG; u produkciji ih servira web server)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
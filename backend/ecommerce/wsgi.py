@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce.settings')
 
 application = get_wsgi_application()
+
+# URL resolver i serializeri se pune unaprijed (STARTUP_WARMUP, vidi ecommerce/startup.py)
+from ecommerce.startup import schedule_warm_up  # noqa: E402
+
+schedule_warm_up()
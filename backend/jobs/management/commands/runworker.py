@@ -0,0 +1,38 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.registry import registered_tasks
+from jobs.worker import STALE_AFTER, Worker
+
+
+class Command(BaseCommand):
+    help = "Izvršava poslove iz reda (jobs.Job) u poolu procesa dok ne dobije SIGINT/SIGTERM."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=2,
+                            help="Broj procesa u poolu; 0 = izvršavanje u ovom procesu.")
+        parser.add_argument("--poll-interval", type=float, default=1.0,
+                            help="Sekunde između provjera kada je red prazan.")
+        parser.add_argument("--stale-after", type=int, default=STALE_AFTER,
+                            help="Posao 'running' stariji od ovoga (s) vraća se u red pri startu.")
+        parser.add_argument("--once", action="store_true",
+                            help="Obradi spremne poslove i završi.")
+
+    def handle(self, *args, **options):
+        # Poslovi podižu verzije keša odgovora; u lokalnoj memoriji workera
+        # web procesi ih ne bi vidjeli i služili bi zastarjele odgovore
+        if isinstance(caches["default"], LocMemCache):
+            raise CommandError(
+                "Worker zahtijeva keš zajednički sa web procesima (CACHE_BACKEND=file), "
+                "ne lokalnu memoriju (locmem)."
+            )
+        worker = Worker(
+            processes=options["processes"],
+            poll_interval=options["poll_interval"],
+            stale_after=options["stale_after"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(f"Worker {worker.name}, poslovi: {', '.join(registered_tasks()) or '-'}")
+        done = worker.run(once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Obrađeno poslova: {done}"))
@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+# -----------------------------
+# ✅ Posao u redu čekanja
+# -----------------------------
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "U redu"),
+        (RUNNING, "U toku"),
+        (SUCCEEDED, "Završen"),
+        (FAILED, "Neuspješan"),
+    ]
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    # Isti ključ = isti posao; enqueue(unique=True) ne dodaje duplikat dok prvi čeka
+    key = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    priority = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True, default="")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Worker: status=queued AND run_after <= now ORDER BY -priority, run_after
+            models.Index(fields=["status", "priority", "run_after"], name="jobs_job_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,31 @@
+"""
+Ulazne tačke za procese iz poola. Modul se učitava u novom (spawn)
+procesu prije `django.setup()`, pa se Django importuje tek unutar funkcija.
+"""
+
+import traceback
+
+
+def init_process():
+    import django
+
+    django.setup()
+
+
+def execute(job_id):
+    """
+    Izvršava posao i vraća (uspjeh, rezultat ili traceback). Izuzetak se
+    vraća kao tekst jer se traceback ne prenosi između procesa.
+    """
+    from django.db import close_old_connections
+
+    from .models import Job
+    from .registry import get_task
+
+    try:
+        job = Job.objects.get(pk=job_id)
+        return True, get_task(job.name)(**job.kwargs)
+    except Exception:
+        return False, traceback.format_exc()
+    finally:
+        close_old_connections()
@@ -0,0 +1,100 @@
+"""
+Registar poslova i dodavanje u red.
+
+Posao je obična funkcija sa keyword argumentima koji se mogu upisati u
+JSON, registrovana dekoratorom `@task` u `<app>/tasks.py`:
+
+    @task("dashboard.refresh_rollups")
+    def refresh_rollups(full=False):
+        ...
+
+    enqueue("dashboard.refresh_rollups", full=True, priority=5)
+
+`tasks.py` moduli se učitavaju pri prvom traženju posla (`get_task`,
+`registered_tasks`, tj. u workeru), ne pri startu aplikacije — povlače
+numpy, izvoze i viewsetove. `enqueue()` ih ne učitava: ime provjerava u
+`settings.JOB_TASKS` (ili među već registrovanim poslovima), pa web proces
+ne plaća import poslova koje samo dodaje u red.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+_tasks = {}
+_discovered = False
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+def task(name):
+    def decorator(function):
+        _tasks[name] = function
+        function.task_name = name
+        return function
+    return decorator
+
+
+def discover_tasks():
+    """
+    Registruje @task funkcije iz `<app>/tasks.py` svih aplikacija (jednom).
+    """
+    global _discovered
+    if not _discovered:
+        autodiscover_modules("tasks")
+        _discovered = True
+
+
+def get_task(name):
+    discover_tasks()
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTask(f"Posao '{name}' nije registrovan.")
+
+
+def registered_tasks():
+    discover_tasks()
+    return sorted(_tasks)
+
+
+def is_known_task(name):
+    """
+    Provjera imena bez učitavanja tasks.py modula.
+    """
+    return name in _tasks or name in getattr(settings, "JOB_TASKS", ())
+
+
+def job_key(name, kwargs):
+    payload = json.dumps([name, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def enqueue(name, priority=0, max_attempts=3, run_after=None, unique=False, **kwargs):
+    """
+    Dodaje posao u red (u tekućoj transakciji, ako postoji — worker ga
+    vidi tek nakon commita). Sa `unique=True` vraća postojeći posao sa
+    istim imenom i argumentima koji još čeka, umjesto da doda novi.
+    """
+    if not is_known_task(name):
+        raise UnknownTask(f"Posao '{name}' nije registrovan.")
+    key = job_key(name, kwargs) if unique else ""
+    if unique:
+        existing = Job.objects.filter(key=key, status=Job.QUEUED).first()
+        if existing is not None:
+            return existing
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        key=key,
+        priority=priority,
+        max_attempts=max_attempts,
+        run_after=run_after or timezone.now(),
+    )
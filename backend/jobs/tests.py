@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import UnknownTask, enqueue, registered_tasks, task
+from .worker import Worker, claim, finish, requeue_stale
+
+calls = []
+
+
+@task("jobs.tests.record")
+def record(value):
+    calls.append(value)
+    return {"value": value}
+
+
+@task("jobs.tests.fail")
+def fail():
+    raise RuntimeError("neuspjeh")
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_orders_by_priority_and_skips_future_jobs(self):
+        low = enqueue("jobs.tests.record", value=1)
+        high = enqueue("jobs.tests.record", value=2, priority=10)
+        enqueue("jobs.tests.record", value=3, run_after=timezone.now() + timedelta(hours=1))
+        claimed = claim(10, "w1")
+        self.assertEqual([job.pk for job in claimed], [high.pk, low.pk])
+        self.assertTrue(all(job.status == Job.RUNNING and job.attempts == 1 for job in claimed))
+        self.assertEqual(claim(10, "w2"), [])
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job = enqueue("jobs.tests.fail", max_attempts=2)
+        [job] = claim(1, "w1")
+        finish(job, False, "traceback")
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        [job] = claim(1, "w1")
+        finish(job, False, "traceback")
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_unique_enqueue_reuses_waiting_job(self):
+        first = enqueue("jobs.tests.record", unique=True, value=1)
+        self.assertEqual(enqueue("jobs.tests.record", unique=True, value=1).pk, first.pk)
+        self.assertNotEqual(enqueue("jobs.tests.record", unique=True, value=2).pk, first.pk)
+
+    def test_job_tasks_setting_matches_registry(self):
+        registered = {name for name in registered_tasks() if not name.startswith("jobs.tests.")}
+        self.assertEqual(set(settings.JOB_TASKS), registered)
+        with self.assertRaises(UnknownTask):
+            enqueue("jobs.tests.missing")
+
+    def test_inline_worker_runs_jobs(self):
+        ok = enqueue("jobs.tests.record", value="a")
+        bad = enqueue("jobs.tests.fail", max_attempts=1)
+        self.assertEqual(Worker(processes=0).run(once=True), 2)
+        ok.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual(calls, ["a"])
+        self.assertEqual((ok.status, ok.result), (Job.SUCCEEDED, {"value": "a"}))
+        self.assertEqual(bad.status, Job.FAILED)
+        self.assertIn("RuntimeError: neuspjeh", bad.error)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_runworker_refuses_process_local_cache(self):
+        enqueue("jobs.tests.record", value=1)
+        with self.assertRaisesMessage(CommandError, "CACHE_BACKEND=file"):
+            call_command("runworker", "--once", "--processes", "0")
+        self.assertEqual(calls, [])
+
+    def test_stale_running_job_is_requeued(self):
+        job = enqueue("jobs.tests.record", value=1)
+        claim(1, "w1")
+        Job.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(requeue_stale(timeout=60), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
@@ -0,0 +1,20 @@
+from rest_framework import filters, viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+
+from shop.pagination import StandardPagination
+from .models import Job
+from .serializers import JobSerializer
+
+
+# ---------- Job Status ----------
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status poslova iz reda: /api/jobs/?status=failed, /api/jobs/<id>/.
+    """
+
+    queryset = Job.objects.all().order_by("-id")
+    serializer_class = JobSerializer
+    pagination_class = StandardPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ["status", "name"]
+    ordering_fields = ["id", "priority", "created_at", "finished_at"]
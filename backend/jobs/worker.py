@@ -0,0 +1,193 @@
+"""
+Worker koji uzima poslove iz tabele `jobs_job` i izvršava ih u poolu procesa.
+
+Preuzimanje: `SELECT ... FOR UPDATE SKIP LOCKED` (MySQL 8 / PostgreSQL),
+pa više workera paralelno uzima različite poslove bez čekanja jedan na
+drugog. Red se zatim uslovno prebacuje u `running` (`WHERE status='queued'`)
+i označava imenom workera, tako da ni baza bez SKIP LOCKED (SQLite) ne
+može dati isti posao dvojici.
+
+Neuspjeh: posao se vraća u red sa eksponencijalnim odlaganjem dok ne
+potroši `max_attempts`, zatim ostaje `failed` sa tracebackom.
+
+Keš: poslovi mijenjaju podatke, pa njihovi signali podižu verzije keša
+odgovora (ecommerce/cache.py). Worker i web procesi zato moraju dijeliti
+keš (CACHE_BACKEND=file, podrazumijevano); `runworker` odbija locmem.
+"""
+
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import process
+from .models import Job
+
+RETRY_BASE_DELAY = 5  # sekundi; 5, 10, 20, ...
+STALE_AFTER = 30 * 60  # posao "running" duže od ovoga smatra se napuštenim
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0))
+
+
+def claim(limit, worker):
+    """
+    Preuzima do `limit` poslova spremnih za izvršavanje (prioritet opadajuće,
+    pa najstariji) i vraća ih.
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        ready = Job.objects.filter(status=Job.QUEUED, run_after__lte=now).order_by("-priority", "run_after", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        ids = list(ready.values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids, status=Job.QUEUED).update(
+            status=Job.RUNNING, worker=worker, started_at=now, finished_at=None,
+            attempts=F("attempts") + 1,
+        )
+    return list(
+        Job.objects.filter(id__in=ids, status=Job.RUNNING, worker=worker)
+        .order_by("-priority", "run_after", "id")
+    )
+
+
+def finish(job, ok, payload):
+    """
+    Upisuje ishod posla: uspjeh, ponovni pokušaj kasnije ili konačan neuspjeh.
+    """
+    now = timezone.now()
+    if ok:
+        job.status, job.result, job.error = Job.SUCCEEDED, payload, ""
+    elif job.attempts < job.max_attempts:
+        job.status, job.error = Job.QUEUED, payload
+        job.run_after = now + retry_delay(job.attempts)
+    else:
+        job.status, job.error = Job.FAILED, payload
+    job.finished_at = now
+    job.save(update_fields=["status", "result", "error", "run_after", "finished_at"])
+
+
+def requeue_stale(timeout=STALE_AFTER):
+    """
+    Poslovi ostali u `running` nakon pada workera vraćaju se u red
+    (ili postaju `failed` ako su potrošili pokušaje). Vraća broj redova.
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=cutoff)
+    error = "Worker je prekinut prije završetka posla."
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(status=Job.FAILED, error=error)
+    requeued = stale.update(status=Job.QUEUED, error=error, run_after=timezone.now())
+    return failed + requeued
+
+
+class Worker:
+    """
+    Petlja: preuzmi onoliko poslova koliko ima slobodnih procesa, sačekaj
+    da neki završi (ili `poll_interval`), upiši ishod, ponovi.
+    `processes=0` izvršava poslove u ovom procesu, jedan po jedan.
+    """
+
+    def __init__(self, processes=2, poll_interval=1.0, stale_after=STALE_AFTER, log=None):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.name = worker_name()
+        self.log = log or (lambda message: None)
+        self.stopping = False
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def run(self, once=False):
+        """
+        Radi dok ne dobije SIGINT/SIGTERM; sa `once=True` završava kada
+        nema spremnih poslova. Vraća broj obrađenih poslova.
+        """
+        previous = {signum: signal.signal(signum, self.stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            requeue_stale(self.stale_after)
+            if self.processes <= 0:
+                return self._run_inline(once)
+            return self._run_pool(once)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def _run_inline(self, once):
+        done = 0
+        while not self.stopping:
+            jobs = claim(1, self.name)
+            if not jobs:
+                if once:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            job = jobs[0]
+            ok, payload = process.execute(job.pk)
+            finish(job, ok, payload)
+            self._report(job)
+            done += 1
+        return done
+
+    def _new_pool(self):
+        # spawn: djeca ne nasljeđuju otvorene konekcije roditelja
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=process.init_process,
+        )
+
+    def _run_pool(self, once):
+        done = 0
+        running = {}
+        pool = self._new_pool()
+        try:
+            while running or not self.stopping:
+                if not self.stopping:
+                    for job in claim(self.processes - len(running), self.name):
+                        running[pool.submit(process.execute, job.pk)] = job
+                if not running:
+                    if once:
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                finished, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job = running.pop(future)
+                    try:
+                        ok, payload = future.result()
+                    except BrokenProcessPool:
+                        ok, payload = False, "Proces poola se srušio tokom posla."
+                    finish(job, ok, payload)
+                    self._report(job)
+                    done += 1
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in finished):
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    for job in running.values():
+                        finish(job, False, "Proces poola se srušio tokom posla.")
+                    running.clear()
+                    pool = self._new_pool()
+        finally:
+            pool.shutdown(wait=True)
+        return done
+
+    def _report(self, job):
+        self.log(f"{job.name} #{job.pk}: {job.status} (pokušaj {job.attempts}/{job.max_attempts})")
@@ -0,0 +1,101 @@
+"""
+Masovni upsert proizvoda u jednoj transakciji.
+"""
+
+from django.db import connection, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from ecommerce.cache import bump_version
+
+from .models import Category, Product
+from .signals import catalog_changed
+
+BATCH_SIZE = 1000
+MAX_ROWS = 50000
+
+
+def chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def existing_values(queryset, field, values):
+    """
+    Skup postojećih vrijednosti `field` među `values`, čitano u serijama.
+    """
+    found = set()
+    for chunk in chunks(values):
+        found.update(queryset.filter(**{f"{field}__in": chunk}).values_list(field, flat=True))
+    return found
+
+
+def upsert_products(valid_rows):
+    """
+    Upisuje validirane redove (indeks, podaci) preko
+    `bulk_create(update_conflicts=True)` po `sku`. Red zamjenjuje cijeli
+    proizvod (kao PUT): izostavljena kategorija/opis postaju prazni.
+
+    Vraća (broj kreiranih, broj ažuriranih, greške po redu).
+    """
+    errors = []
+    by_sku = {}
+    for index, row in valid_rows:
+        if row["sku"] in by_sku:
+            errors.append({"index": index, "errors": {"sku": ["SKU se ponavlja u zahtjevu."]}})
+            continue
+        by_sku[row["sku"]] = (index, row)
+
+    category_ids = {row["category"] for _, row in by_sku.values() if row.get("category")}
+    known_categories = existing_values(Category.objects.all(), "id", category_ids)
+    products = []
+    for sku, (index, row) in list(by_sku.items()):
+        category = row.get("category")
+        if category and category not in known_categories:
+            errors.append({"index": index, "errors": {"category": [f"Kategorija {category} ne postoji."]}})
+            del by_sku[sku]
+            continue
+        products.append(Product(
+            sku=sku,
+            name=row["name"],
+            price=row["price"],
+            category_id=category,
+            description=row.get("description"),
+        ))
+
+    existing = existing_values(Product.objects.all(), "sku", by_sku)
+    conflict_kwargs = {}
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_kwargs["unique_fields"] = ["sku"]
+
+    with transaction.atomic():
+        Product.objects.bulk_create(
+            products,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            update_fields=["name", "price", "category", "description", "updated"],
+            **conflict_kwargs,
+        )
+        # bulk_create ne šalje post_save, pa se verzija keša mijenja ručno
+        bump_version(Product)
+
+    if catalog_changed.has_listeners(Product):
+        product_ids = []
+        for chunk in chunks(by_sku):
+            product_ids.extend(Product.objects.filter(sku__in=chunk).values_list("id", flat=True))
+        catalog_changed.send(sender=Product, product_ids=product_ids)
+
+    updated = len(existing)
+    return len(products) - updated, updated, errors
+
+
+def bulk_response(created, updated, errors):
+    """
+    Odgovor masovnog upisa: 400 samo ako nijedan red nije upisan.
+    """
+    errors = sorted(errors, key=lambda error: error["index"])
+    body = {"created": created, "updated": updated, "errors": errors}
+    if errors and not (created or updated):
+        return Response(body, status=status.HTTP_400_BAD_REQUEST)
+    return Response(body)
@@ -0,0 +1,45 @@
+import django_filters
+
+from .models import Category, Inventory, Product
+
+
+# -----------------------------
+# ✅ Stock filteri (GeneratedField nema automatski filter)
+# -----------------------------
+class StockFilterSet(django_filters.FilterSet):
+    stock__gte = django_filters.NumberFilter(field_name="stock", lookup_expr="gte")
+    stock__lte = django_filters.NumberFilter(field_name="stock", lookup_expr="lte")
+
+
+class InventoryFilter(StockFilterSet):
+    class Meta:
+        model = Inventory
+        fields = {
+            "product": ["exact"],
+            "status": ["exact"],
+        }
+
+
+# -----------------------------
+# ✅ Product filteri
+# -----------------------------
+class ProductFilter(django_filters.FilterSet):
+    category__descendants = django_filters.NumberFilter(method="filter_descendants")
+
+    class Meta:
+        model = Product
+        fields = {
+            "category": ["exact"],
+            "price": ["gte", "lte"],
+        }
+
+    def filter_descendants(self, queryset, name, value):
+        """
+        Proizvodi iz kategorije i svih njenih potkategorija. Putanja se čita
+        prije upita, pa je prefiks literal (`category.path LIKE '/1/5/%'`) i
+        koristi indeks; sa podupitom kao prefiksom baza ne može.
+        """
+        path = Category.objects.filter(pk=value).values_list("path", flat=True).first()
+        if not path:
+            return queryset.none()
+        return queryset.filter(category__path__startswith=path)
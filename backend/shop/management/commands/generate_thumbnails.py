@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from shop.models import ProductImage
+from shop.thumbnails import generate_thumbnails, is_current, schedule_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Dopunjava thumbnailove slika koje ih nemaju (ili su zastarjeli), npr. slika "
+        "uploadovanih prije thumbnailova. Podrazumijevano dodaje poslove u pozadinski red."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--now", action="store_true",
+                            help="Generiše odmah u ovom procesu umjesto preko reda.")
+
+    def handle(self, *args, **options):
+        count = 0
+        images = ProductImage.objects.exclude(image="").only("id", "image", "thumbnails")
+        for image in images.iterator(chunk_size=500):
+            if is_current(image):
+                continue
+            if options["now"]:
+                generate_thumbnails(image.pk)
+            else:
+                schedule_thumbnails(image)
+            count += 1
+        action = "generisano" if options["now"] else "dodato u red"
+        self.stdout.write(self.style.SUCCESS(f"Slika bez thumbnailova: {count} ({action})."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from jobs.registry import enqueue
+from shop.tasks import INVENTORY_MODELS, recompute_inventory_status
+
+
+class Command(BaseCommand):
+    help = (
+        "Preračunava status inventara (available / low_stock / out_of_stock) jednim "
+        "UPDATE-om po modelu, sa pragom kategorije svakog proizvoda."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=[*INVENTORY_MODELS, "all"], default="all")
+        parser.add_argument("--category", type=int, help="Samo proizvodi ove kategorije.")
+        parser.add_argument("--enqueue", action="store_true",
+                            help="Dodaje posao u pozadinski red umjesto da ga izvrši odmah.")
+
+    def handle(self, *args, **options):
+        targets = list(INVENTORY_MODELS) if options["model"] == "all" else [options["model"]]
+        if options["enqueue"]:
+            job = enqueue("shop.recompute_inventory_status", category_id=options["category"], targets=targets)
+            self.stdout.write(self.style.SUCCESS(f"Posao #{job.pk} dodat u red."))
+            return
+        updated = recompute_inventory_status(category_id=options["category"], targets=targets)
+        for target, count in updated.items():
+            self.stdout.write(f"{target}: {count} redova")
+        self.stdout.write(self.style.SUCCESS("Status inventara preračunat."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:15
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0002_discount_inventory_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='stock',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('quantity_in'), '-', models.F('quantity_out')), output_field=models.IntegerField()),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+FTS_TABLE = "shop_product_fts"
+
+MYSQL_FORWARD = [
+    "CREATE FULLTEXT INDEX shop_product_fulltext ON shop_product (name, description)",
+]
+MYSQL_BACKWARD = [
+    "DROP INDEX shop_product_fulltext ON shop_product",
+]
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "name, description, content='shop_product', content_rowid='id')",
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) SELECT id, name, description FROM shop_product",
+    f"CREATE TRIGGER shop_product_fts_ai AFTER INSERT ON shop_product BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER shop_product_fts_ad AFTER DELETE ON shop_product BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER shop_product_fts_au AFTER UPDATE ON shop_product BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS shop_product_fts_ai",
+    "DROP TRIGGER IF EXISTS shop_product_fts_ad",
+    "DROP TRIGGER IF EXISTS shop_product_fts_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text indeks za pretragu proizvoda (MySQL FULLTEXT / SQLite FTS5).
+    Na ostalim bazama se ništa ne radi i pretraga ostaje `icontains`.
+    """
+
+    dependencies = [
+        ('shop', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"mysql": MYSQL_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"mysql": MYSQL_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
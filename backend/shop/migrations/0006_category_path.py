@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    """
+    Popunjava putanje postojećih kategorija, nivo po nivo od korijena.
+    """
+    Category = apps.get_model("shop", "Category")
+    parents = dict(Category.objects.values_list("id", "parent_id"))
+    paths = {}
+
+    def path_for(category_id, seen=()):
+        if category_id in paths:
+            return paths[category_id]
+        parent_id = parents.get(category_id)
+        if parent_id is None or parent_id in seen or parent_id not in parents:
+            path = f"/{category_id}/"
+        else:
+            path = f"{path_for(parent_id, seen + (category_id,))}{category_id}/"
+        paths[category_id] = path
+        return path
+
+    for category_id in parents:
+        path_for(category_id)
+    categories = [Category(id=category_id, path=path) for category_id, path in paths.items()]
+    Category.objects.bulk_update(categories, ["path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_product_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
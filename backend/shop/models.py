@@ -1,16 +1,74 @@
 from django.db import models
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Concat, Substr
+from django.db.models.lookups import LessThan, LessThanOrEqual
 
 
 # -----------------------------
 # ✅ Category model
 # -----------------------------
+class CategoryQuerySet(models.QuerySet):
+    def move_subtree(self, old_path, new_path):
+        """
+        Jedan UPDATE koji potomcima zamjenjuje prefiks putanje.
+        """
+        return self.filter(path__startswith=old_path).update(
+            path=Concat(Value(new_path), Substr("path", len(old_path) + 1))
+        )
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True)
+    # Materijalizovana putanja od korijena, npr. "/1/5/12/" — podstablo je
+    # jedan indeksiran upit `path LIKE '/1/5/%'`
+    path = models.CharField(max_length=255, db_index=True, default="", editable=False)
+    # Prag "low_stock" za proizvode ove kategorije; prazno = LOW_STOCK_THRESHOLD
+    low_stock_threshold = models.PositiveIntegerField(null=True, blank=True)
+
+    objects = CategoryQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Za prepoznavanje promjene praga (shop.signals)
+        instance._loaded_threshold = instance.__dict__.get("low_stock_threshold")
+        return instance
+
+    def threshold_changed(self):
+        return self.low_stock_threshold != getattr(self, "_loaded_threshold", None)
+
+    def build_path(self):
+        prefix = "/"
+        if self.parent_id:
+            prefix = Category.objects.filter(pk=self.parent_id).values_list("path", flat=True).get()
+        return f"{prefix}{self.pk}/"
+
+    def is_descendant_of(self, other):
+        return bool(other.path) and self.path.startswith(other.path)
+
+    def save(self, *args, **kwargs):
+        if self.pk and self.parent_id:
+            if self.parent_id == self.pk or self.parent.is_descendant_of(self):
+                raise ValueError("Kategorija ne može biti roditelj samoj sebi ili svom potomku.")
+        old_path = self.path
+        super().save(*args, **kwargs)
+        new_path = self.build_path()
+        if new_path != old_path:
+            if old_path:
+                # Pomjera i sam čvor i cijelo njegovo podstablo
+                Category.objects.move_subtree(old_path, new_path)
+            else:
+                Category.objects.filter(pk=self.pk).update(path=new_path)
+            self.path = new_path
+
+    def descendants(self, include_self=False):
+        queryset = Category.objects.filter(path__startswith=self.path)
+        return queryset if include_self else queryset.exclude(pk=self.pk)
+
 
 # -----------------------------
 # ✅ Product model
@@ -24,6 +82,12 @@ class Product(models.Model):
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # ProductViewSet: ?category=..&price__gte=..&price__lte=..
+            models.Index(fields=["category", "price"], name="shop_product_cat_price_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -34,15 +98,121 @@ class Product(models.Model):
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to="products/")
+    # Imena thumbnail fajlova po širini (vidi shop/thumbnails.py)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"Image for {self.product.name}"
 
 
+# -----------------------------
+# ✅ Inventory status
+# -----------------------------
+LOW_STOCK_THRESHOLD = 10
+
+
+def stock_status(quantity, threshold=None):
+    """
+    Status zalihe za datu količinu (ista pravila za shop i store inventar).
+    `threshold` je prag kategorije proizvoda; None = LOW_STOCK_THRESHOLD.
+    """
+    if threshold is None:
+        threshold = LOW_STOCK_THRESHOLD
+    if quantity <= 0:
+        return "out_of_stock"
+    if quantity < threshold:
+        return "low_stock"
+    return "available"
+
+
+def stock_status_expression(stock, threshold=LOW_STOCK_THRESHOLD):
+    """
+    Isto pravilo kao `stock_status`, ali kao SQL izraz (CASE WHEN) nad
+    izrazom zalihe — za `update()` bez učitavanja redova. Prag može biti
+    broj ili izraz (npr. `low_stock_threshold_expression()`).
+    """
+    if not hasattr(threshold, "resolve_expression"):
+        threshold = Value(threshold)
+    return Case(
+        When(LessThanOrEqual(stock, 0), then=Value("out_of_stock")),
+        When(LessThan(stock, threshold), then=Value("low_stock")),
+        default=Value("available"),
+        output_field=models.CharField(),
+    )
+
+
+def low_stock_threshold_expression():
+    """
+    Prag kategorije proizvoda za red inventara, kao podupit nad
+    `product_id` — radi i unutar `UPDATE` bez JOIN-a.
+    """
+    threshold = Product.objects.filter(pk=OuterRef("product_id")).values("category__low_stock_threshold")[:1]
+    return Coalesce(
+        Subquery(threshold, output_field=models.IntegerField()), Value(LOW_STOCK_THRESHOLD)
+    )
+
+
+def low_stock_thresholds(product_ids):
+    """
+    Mapa product_id -> prag kategorije (None ako kategorija nema svoj prag).
+    """
+    return dict(
+        Product.objects.filter(id__in=product_ids).values_list("id", "category__low_stock_threshold")
+    )
+
+
+class InventoryQuerySet(models.QuerySet):
+    def adjust_stock(self, received=0, shipped=0):
+        """
+        Atomski mijenja ulaz/izlaz preko F() izraza (bez read-modify-save)
+        i u istom UPDATE-u preračunava status. Vraća broj izmijenjenih redova.
+
+        Kao i svaki `update()`, ne šalje post_save — pozivalac šalje
+        `shop.signals.catalog_changed` ako zavisni podaci treba da se osvježe.
+        """
+        new_stock = F("quantity_in") - F("quantity_out") + Value(received - shipped)
+        return self.update(
+            quantity_in=F("quantity_in") + received,
+            quantity_out=F("quantity_out") + shipped,
+            status=stock_status_expression(new_stock, low_stock_threshold_expression()),
+        )
+
+    def recompute_status(self):
+        """
+        Preračunava status svih redova queryseta jednim UPDATE-om, sa
+        pragom kategorije svakog proizvoda. Vraća broj redova.
+        """
+        return self.update(
+            status=stock_status_expression(F("stock"), low_stock_threshold_expression())
+        )
+
+
+class StockMixin:
+    def save(self, *args, **kwargs):
+        # Status se uvijek izvodi iz zalihe i praga kategorije, i za shop i za store inventar
+        threshold = low_stock_thresholds([self.product_id]).get(self.product_id)
+        self.status = stock_status(self.quantity_in - self.quantity_out, threshold)
+        super().save(*args, **kwargs)
+
+    def adjust(self, received=0, shipped=0):
+        """
+        Atomska promjena zalihe za ovaj red; nakon upisa osvježava vrijednosti.
+        Izlaz veći od zalihe (uz ulaz iz istog poziva) se ne upisuje — uslov
+        je u istom UPDATE-u. Vraća True ako je red izmijenjen.
+        """
+        rows = type(self).objects.filter(pk=self.pk)
+        if shipped > received:
+            rows = rows.filter(stock__gte=shipped - received)
+        if not rows.adjust_stock(received=received, shipped=shipped):
+            return False
+        self.refresh_from_db(fields=["quantity_in", "quantity_out", "stock", "status"])
+        return True
+
+
 # -----------------------------
 # ✅ Inventory model (fixed conflict)
 # -----------------------------
-class Inventory(models.Model):
+class Inventory(StockMixin, models.Model):
     product = models.ForeignKey(
         Product,
         on_delete=models.CASCADE,
@@ -50,17 +220,21 @@ class Inventory(models.Model):
     )
     quantity_in = models.IntegerField(default=0)
     quantity_out = models.IntegerField(default=0)
+    stock = models.GeneratedField(
+        expression=F("quantity_in") - F("quantity_out"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        db_index=True,
+    )
     status = models.CharField(max_length=20, default="available")
 
-    def save(self, *args, **kwargs):
-        quantity = self.quantity_in - self.quantity_out
-        if quantity <= 0:
-            self.status = "out_of_stock"
-        elif quantity < 10:
-            self.status = "low_stock"
-        else:
-            self.status = "available"
-        super().save(*args, **kwargs)
+    objects = InventoryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # InventoryViewSet: ?product=..&status=..
+            models.Index(fields=["product", "status"], name="shop_inv_product_status_idx"),
+        ]
 
     def __str__(self):
         return f"{self.product.name} ({self.status})"
@@ -88,5 +262,11 @@ class Order(models.Model):
     status = models.CharField(max_length=50, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # OrderViewSet: ?status=.. sortirano po -created_at
+            models.Index(fields=["status", "-created_at"], name="shop_order_status_created_idx"),
+        ]
+
     def __str__(self):
         return f"Order #{self.id} - {self.product.name}"
@@ -1,6 +1,175 @@
+import base64
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class StandardPagination(PageNumberPagination):
+    """
+    Paginacija po broju stranice, uz opcioni keyset (cursor) način rada.
+
+    Keyset se uključuje sa `?pagination=cursor`, slanjem `?cursor=...` ili
+    postavljanjem `pagination_mode = "cursor"` na viewset. Tada se umjesto
+    OFFSET-a koristi uslov nad poljem sortiranja + `id`, ne radi se COUNT(*),
+    a odgovor zadržava isti oblik (`count`, `next`, `previous`, `results`).
+    """
+
     page_size = 8
     page_size_query_param = "page_size"
     max_page_size = 10000
+
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Neispravan cursor."
+
+    cursor_mode = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self._use_cursor(request, view)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self._paginate_keyset(queryset, request)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            "count": self.count,
+            "next": self.next_link,
+            "previous": self.previous_link,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    # ---------- Keyset (cursor) ----------
+    def _use_cursor(self, request, view):
+        if request.query_params.get(self.mode_query_param) == "cursor":
+            return True
+        if self.cursor_query_param in request.query_params:
+            return True
+        return getattr(view, "pagination_mode", None) == "cursor"
+
+    def _keyset_field(self, queryset):
+        """
+        Vraća (polje, opadajuće) za prvo polje sortiranja ako je to lokalna,
+        ne-null kolona; inače se sortira samo po primarnom ključu.
+        """
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if ordering and isinstance(ordering[0], str):
+            name = ordering[0]
+            descending = name.startswith("-")
+            name = name.lstrip("-")
+            if name == "pk":
+                name = "id"
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.concrete and not field.null:
+                return field, descending
+            return queryset.model._meta.pk, descending
+        return queryset.model._meta.pk, False
+
+    def _encode_cursor(self, value, pk, reverse):
+        payload = json.dumps({"v": value, "id": pk, "r": reverse}, default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def _decode_cursor(self, token):
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return payload["v"], payload["id"], bool(payload.get("r"))
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _cursor_values(self, field, value, pk, pk_field):
+        """
+        Vrijednosti iz cursora u tipu polja; izmijenjen cursor je 404, ne 500.
+        """
+        try:
+            pk = pk_field.to_python(pk)
+            if not field.primary_key:
+                value = field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pk is None or (not field.primary_key and value is None):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def _paginate_keyset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field, descending = self._keyset_field(queryset)
+        name = field.name if not field.primary_key else "id"
+
+        self.count = self._estimated_count(queryset)
+
+        token = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if token:
+            value, pk, reverse = self._decode_cursor(token)
+            value, pk = self._cursor_values(field, value, pk, queryset.model._meta.pk)
+            # Napred: redovi "iza" cursora; nazad: redovi "ispred" njega
+            op = "gt" if descending == reverse else "lt"
+            if name == "id":
+                queryset = queryset.filter(**{f"id__{op}": pk})
+            else:
+                queryset = queryset.filter(
+                    Q(**{f"{name}__{op}": value}) | Q(**{name: value, f"id__{op}": pk})
+                )
+
+        # Pri kretanju nazad sortira se obrnuto pa se rezultat okreće
+        prefix = "-" if descending != reverse else ""
+        order = [f"{prefix}id"] if name == "id" else [f"{prefix}{name}", f"{prefix}id"]
+        rows = list(queryset.order_by(*order)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_link = None
+        self.previous_link = None
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else bool(token)
+        if rows and has_next:
+            last = rows[-1]
+            self.next_link = self._cursor_link(getattr(last, field.attname), last.pk, False)
+        if rows and has_previous:
+            first = rows[0]
+            self.previous_link = self._cursor_link(getattr(first, field.attname), first.pk, True)
+        return rows
+
+    def _cursor_link(self, value, pk, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, "cursor")
+        return replace_query_param(
+            url, self.cursor_query_param, self._encode_cursor(value, pk, reverse)
+        )
+
+    def _estimated_count(self, queryset):
+        """
+        Keyset ne radi COUNT(*). Za nefiltriranu tabelu na MySQL-u vraća
+        procjenu iz information_schema, inače None.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != "mysql" or queryset.query.has_filters():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None else None
@@ -0,0 +1,130 @@
+"""
+Full-text pretraga proizvoda preko postojećeg `?search=` parametra.
+
+Backend se bira po bazi:
+- MySQL — FULLTEXT indeks nad (name, description), `MATCH ... AGAINST` u
+  BOOLEAN MODE sa prefiksom (`lap*`) i rangiranjem po relevantnosti
+- SQLite — FTS5 tabela `shop_product_fts` (održavana trigerima), `bm25()`
+- ostalo — DRF `icontains` pretraga (kao ranije)
+
+Bez eksplicitnog `?ordering=` rezultati se sortiraju po relevantnosti.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+FTS_TABLE = "shop_product_fts"
+RANK_ANNOTATION = "search_rank"
+# innodb_ft_min_token_size — kraći termini ne postoje u FULLTEXT indeksu
+MYSQL_MIN_TOKEN_SIZE = 3
+
+_fts_available = {}
+
+
+def _clean_terms(terms):
+    """
+    Uklanja operatore full-text sintakse, ostavlja samo riječi.
+    """
+    cleaned = []
+    for term in terms:
+        cleaned.extend(word for word in re.split(r"[^\w]+", term) if word)
+    return cleaned
+
+
+class IcontainsBackend:
+    """
+    Rezervni backend: ponaša se kao standardni DRF SearchFilter.
+    """
+
+    def search(self, search_filter, request, queryset, view):
+        return filters.SearchFilter.filter_queryset(search_filter, request, queryset, view)
+
+
+class MySQLFulltextBackend:
+    def search(self, search_filter, request, queryset, view):
+        terms = _clean_terms(search_filter.get_search_terms(request))
+        long_terms = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+        short_terms = [term for term in terms if len(term) < MYSQL_MIN_TOKEN_SIZE]
+
+        for term in short_terms:
+            queryset = queryset.filter(name__icontains=term)
+        if not long_terms:
+            return queryset
+
+        quote = connections[queryset.db].ops.quote_name
+        table = quote(queryset.model._meta.db_table)
+        match = f"MATCH({table}.{quote('name')}, {table}.{quote('description')}) AGAINST (%s IN BOOLEAN MODE)"
+        query = " ".join(f"+{term}*" for term in long_terms)
+        return queryset.filter(
+            RawSQL(match, [query], output_field=BooleanField())
+        ).annotate(**{RANK_ANNOTATION: RawSQL(match, [query], output_field=FloatField())})
+
+
+class SQLiteFTSBackend:
+    def search(self, search_filter, request, queryset, view):
+        terms = _clean_terms(search_filter.get_search_terms(request))
+        if not terms:
+            return queryset
+        query = " ".join('"{}"*'.format(term.replace('"', "")) for term in terms)
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        matches = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        rank = (
+            f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id)"
+        )
+        return queryset.filter(id__in=RawSQL(matches, [query])).annotate(
+            **{RANK_ANNOTATION: RawSQL(rank, [query], output_field=FloatField())}
+        )
+
+
+def _has_fts_table(using):
+    if using not in _fts_available:
+        with connections[using].cursor() as cursor:
+            _fts_available[using] = FTS_TABLE in connections[using].introspection.table_names(cursor)
+    return _fts_available[using]
+
+
+BACKENDS = {
+    "mysql": MySQLFulltextBackend,
+    "sqlite": SQLiteFTSBackend,
+    "icontains": IcontainsBackend,
+}
+
+
+def get_search_backend(using):
+    """
+    Backend iz `PRODUCT_SEARCH_BACKEND` ili, za "auto", po bazi.
+    """
+    name = getattr(settings, "PRODUCT_SEARCH_BACKEND", "auto")
+    if name == "auto":
+        name = connections[using].vendor
+        if name == "sqlite" and not _has_fts_table(using):
+            name = "icontains"
+    return BACKENDS.get(name, IcontainsBackend)()
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        if not self.get_search_terms(request):
+            return queryset
+        return get_search_backend(queryset.db).search(self, request, queryset, view)
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """
+    Ako je tražena pretraga, a nije zadano `?ordering=`, sortira po
+    relevantnosti umjesto po podrazumijevanom redoslijedu viewseta.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if (
+            not request.query_params.get(self.ordering_param)
+            and RANK_ANNOTATION in queryset.query.annotations
+        ):
+            return queryset.order_by(f"-{RANK_ANNOTATION}", "id")
+        return super().filter_queryset(request, queryset, view)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Category, Product, ProductImage, Inventory, Discount, Order
+from .thumbnails import is_current, thumbnail_sizes, thumbnail_url
 
 
 # -----------------------------
@@ -10,15 +11,38 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = "__all__"
 
+    def validate_parent(self, parent):
+        if parent is not None and self.instance is not None:
+            if parent.pk == self.instance.pk or parent.is_descendant_of(self.instance):
+                raise serializers.ValidationError(
+                    "Kategorija ne može biti roditelj samoj sebi ili svom potomku."
+                )
+        return parent
+
 
 # -----------------------------
 # ✅ Product Image Serializer
 # -----------------------------
 class ProductImageSerializer(serializers.ModelSerializer):
+    thumbnail_url = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
         fields = "__all__"
 
+    def get_thumbnail_url(self, obj):
+        return thumbnail_url(obj, request=self.context.get("request"))
+
+    def get_thumbnails(self, obj):
+        """
+        URL po širini, npr. `{"128": "...", "512": "..."}`; prazno dok se ne generišu.
+        """
+        if not is_current(obj):
+            return {}
+        request = self.context.get("request")
+        return {str(size): thumbnail_url(obj, size, request) for size in thumbnail_sizes()}
+
 
 # -----------------------------
 # ✅ Product Serializer
@@ -26,11 +50,21 @@ class ProductImageSerializer(serializers.ModelSerializer):
 class ProductSerializer(serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
+    thumbnail_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
         fields = "__all__"
 
+    def get_thumbnail_url(self, obj):
+        """
+        Najmanji thumbnail prve slike proizvoda (za grid).
+        """
+        images = sorted(obj.images.all(), key=lambda image: image.pk)
+        if not images:
+            return None
+        return thumbnail_url(images[0], request=self.context.get("request"))
+
 
 # -----------------------------
 # ✅ Inventory Serializer
@@ -46,10 +80,19 @@ class InventorySerializer(serializers.ModelSerializer):
             "product_name",
             "quantity_in",
             "quantity_out",
+            "stock",
             "status",
         ]
 
 
+# -----------------------------
+# ✅ Stock Adjustment Serializer
+# -----------------------------
+class StockAdjustmentSerializer(serializers.Serializer):
+    received = serializers.IntegerField(min_value=0, default=0)
+    shipped = serializers.IntegerField(min_value=0, default=0)
+
+
 # -----------------------------
 # ✅ Discount Serializer
 # -----------------------------
@@ -76,3 +119,51 @@ class OrderSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
         ]
+
+
+# -----------------------------
+# ✅ Bulk (list) Serializer
+# -----------------------------
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer koji validira svaki red posebno i ne odbacuje cijeli
+    zahtjev zbog jednog lošeg reda.
+    """
+
+    def partition(self):
+        """
+        Vraća (validni, greške): validni su parovi (indeks, podaci), a greške
+        lista `{"index": i, "errors": {...}}`.
+        """
+        if not isinstance(self.initial_data, list):
+            raise serializers.ValidationError({"non_field_errors": ["Očekuje se lista redova."]})
+        if self.max_length is not None and len(self.initial_data) > self.max_length:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Najviše {self.max_length} redova po zahtjevu."]}
+            )
+        valid, errors = [], []
+        for index, item in enumerate(self.initial_data):
+            try:
+                valid.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as exc:
+                errors.append({"index": index, "errors": exc.detail})
+        return valid, errors
+
+
+# -----------------------------
+# ✅ Product Bulk Serializer
+# -----------------------------
+class ProductBulkSerializer(serializers.Serializer):
+    """
+    Red za masovni upsert proizvoda po `sku`. Kategorija se provjerava za
+    sve redove odjednom, ne upitom po redu.
+    """
+
+    sku = serializers.CharField(max_length=100)
+    name = serializers.CharField(max_length=200)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    category = serializers.IntegerField(required=False, allow_null=True)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from jobs.registry import enqueue
+from .models import Category, ProductImage
+from .thumbnails import is_current, schedule_thumbnails
+
+
+@receiver(pre_delete, sender=Category)
+def reroot_children(sender, instance, **kwargs):
+    """
+    Djeca obrisane kategorije postaju korijeni (parent SET_NULL), pa se
+    putanje njihovih podstabala skraćuju prije brisanja.
+    """
+    for child in Category.objects.filter(parent=instance).only("id", "path"):
+        Category.objects.move_subtree(child.path, f"/{child.pk}/")
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, **kwargs):
+    """
+    Promijenjen prag zalihe -> status inventara kategorije se preračunava
+    u pozadini (jedan UPDATE po modelu inventara).
+    """
+    if instance.threshold_changed() and not created:
+        enqueue("shop.recompute_inventory_status", category_id=instance.pk, unique=True)
+    instance._loaded_threshold = instance.low_stock_threshold
+
+
+@receiver(post_save, sender=ProductImage)
+def image_saved(sender, instance, **kwargs):
+    """
+    Novi ili zamijenjen original -> thumbnailovi u pozadini nakon commita.
+    """
+    if not is_current(instance):
+        schedule_thumbnails(instance)
+
+
+# Šalje se kada se proizvodi/inventar mijenjaju bez post_save signala
+# (bulk_create, bulk_update, update()); argument: product_ids
+catalog_changed = Signal()
@@ -0,0 +1,40 @@
+from django.apps import apps
+
+from jobs.registry import task
+from .models import Product
+from .signals import catalog_changed
+from .thumbnails import TASK_NAME, generate_thumbnails
+
+# Modeli inventara čiji se status izvodi iz zalihe (InventoryQuerySet)
+INVENTORY_MODELS = {
+    "shop": "shop.Inventory",
+    "store": "store.Inventory",
+}
+
+
+@task(TASK_NAME)
+def generate_thumbnails_task(image_id):
+    image = generate_thumbnails(image_id)
+    return image.thumbnails if image is not None else None
+
+
+@task("shop.recompute_inventory_status")
+def recompute_inventory_status(category_id=None, targets=None):
+    """
+    Preračunava status inventara jednim UPDATE-om po modelu — za cijelo
+    skladište ili samo proizvode jedne kategorije (`category_id`).
+    Vraća broj ažuriranih redova po modelu.
+    """
+    updated = {}
+    for target in targets or INVENTORY_MODELS:
+        model = apps.get_model(INVENTORY_MODELS[target])
+        queryset = model.objects.all()
+        if category_id is not None:
+            queryset = queryset.filter(product__category_id=category_id)
+        updated[target] = queryset.recompute_status()
+
+    if category_id is not None:
+        product_ids = list(Product.objects.filter(category_id=category_id).values_list("id", flat=True))
+        catalog_changed.send(sender=apps.get_model(INVENTORY_MODELS["store"]), product_ids=product_ids)
+    return updated
+
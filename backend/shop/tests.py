@@ -1,3 +1,492 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import shutil
+import tempfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+
+from ecommerce.cache import bump_version
+from jobs.models import Job
+from store.models import Inventory as StoreInventory
+from .models import Category, Inventory, Product, ProductImage, low_stock_threshold_expression
+from .search import IcontainsBackend, SQLiteFTSBackend, get_search_backend
+from .tasks import recompute_inventory_status
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 30), "red").save(buffer, format="PNG")
+    return SimpleUploadedFile("slika.png", buffer.getvalue(), content_type="image/png")
+
+
+class LeanProductListTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name="Računari")
+        products = Product.objects.bulk_create([
+            Product(name="Laptop „Pro“   15", price="1299.90", sku="LAP-1", category=category,
+                    description="Opis sa ćirilicom: ноутбук"),
+            Product(name="Miš", price="0.50", sku="MIS-1", category=category, description=None),
+            Product(name="Bez kategorije", price="12.00", sku="BEZ-1"),
+        ])
+        ProductImage.objects.create(product=products[0], image=_png())
+        ProductImage.objects.create(product=products[0], image=_png())
+
+    def _get(self, lean, **params):
+        cache.clear()
+        with self.settings(LEAN_LIST_SERIALIZERS=lean):
+            return self.client.get(reverse("product-list"), params)
+
+    def test_lean_list_is_byte_identical(self):
+        for params in ({}, {"page_size": 2, "page": 2}, {"ordering": "-price"}, {"pagination": "cursor"}):
+            with self.subTest(**params):
+                lean = self._get(True, **params)
+                full = self._get(False, **params)
+                self.assertEqual(lean.status_code, 200)
+                self.assertEqual(lean.content, full.content)
+                self.assertEqual(lean.content, JSONRenderer().render(full.data))
+
+
+class ProductListQueryCountTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_list_without_thumbnails_is_read_only(self):
+        category = Category.objects.create(name="Slike")
+        created = 0
+        for total in (1, 20):
+            with self.subTest(products=total):
+                for i in range(created, total):
+                    product = Product.objects.create(name=f"Proizvod {i}", price=10, sku=f"IMG-{i}",
+                                                     category=category)
+                    # Slika bez thumbnailova (kao prije uvođenja thumbnailova)
+                    ProductImage.objects.bulk_create([ProductImage(product=product, image=f"products/{i}.png")])
+                created = total
+                Job.objects.all().delete()
+                cache.clear()
+                # COUNT za paginaciju + proizvodi sa kategorijom + prefetch slika
+                with self.assertNumQueries(3):
+                    response = self.client.get(reverse("product-list"), {"page_size": total})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data["results"]), total)
+                self.assertIsNone(response.data["results"][0]["thumbnail_url"])
+                self.assertFalse(Job.objects.exists())
+
+    def test_backfill_command_enqueues_missing_thumbnails(self):
+        product = Product.objects.create(name="Stari", price=1, sku="OLD-IMG")
+        ProductImage.objects.bulk_create([ProductImage(product=product, image="products/stara.png")])
+        ProductImage.objects.create(product=product, image=_png())
+        Job.objects.all().delete()
+
+        call_command("generate_thumbnails", stdout=io.StringIO())
+        call_command("generate_thumbnails", stdout=io.StringIO())
+        self.assertEqual(Job.objects.filter(name="shop.generate_thumbnails").count(), 2)
+
+
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Računari")
+        cls.product = Product.objects.create(name="Laptop", price=1000, sku="LAP-1", category=cls.category)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("product-list")
+
+    def _get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def test_etag_and_not_modified(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # Iz keša: isti ETag, bez upita
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get()["ETag"], etag)
+        for if_none_match in (etag, f"W/{etag}", f'"drugi", {etag}', "*"):
+            with self.subTest(if_none_match=if_none_match):
+                response = self._get(if_none_match=if_none_match)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self._get(if_none_match='"drugi"').status_code, 200)
+
+    def test_if_modified_since_is_ignored(self):
+        last_modified = self._get()["Last-Modified"]
+        self.assertEqual(self._get(if_modified_since=last_modified).status_code, 200)
+
+    def test_changes_invalidate_etag(self):
+        def change_name():
+            self.product.name = "Laptop 2"
+            self.product.save()
+            return [("Laptop 2", "1000.00")]
+
+        def bulk_update():
+            # update() ne šalje signale: verzija se podiže ručno
+            Product.objects.filter(pk=self.product.pk).update(price=1)
+            bump_version(Product)
+            return [("Laptop 2", "1.00")]
+
+        def delete_product():
+            Product.objects.get(pk=self.product.pk).delete()
+            return []
+
+        for change in (change_name, bulk_update, delete_product):
+            with self.subTest(change=change.__name__):
+                etag = self._get()["ETag"]
+                expected = change()
+                response = self._get(if_none_match=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+                self.assertEqual([(row["name"], row["price"]) for row in response.data["results"]], expected)
+
+
+class CategoryTreeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # elektronika -> racunari -> laptopi; odjeca
+        self.electronics = Category.objects.create(name="Elektronika")
+        self.computers = Category.objects.create(name="Računari", parent=self.electronics)
+        self.laptops = Category.objects.create(name="Laptopi", parent=self.computers)
+        self.clothes = Category.objects.create(name="Odjeća")
+
+    def _paths(self):
+        return dict(Category.objects.values_list("name", "path"))
+
+    def test_paths_follow_parents(self):
+        e, c, l = self.electronics.pk, self.computers.pk, self.laptops.pk
+        self.assertEqual(self._paths()["Laptopi"], f"/{e}/{c}/{l}/")
+        self.assertEqual(
+            set(self.electronics.descendants().values_list("name", flat=True)), {"Računari", "Laptopi"}
+        )
+
+    def test_move_subtree(self):
+        self.computers.parent = self.clothes
+        self.computers.save()
+        o, c, l = self.clothes.pk, self.computers.pk, self.laptops.pk
+        self.assertEqual(self._paths()["Računari"], f"/{o}/{c}/")
+        self.assertEqual(self._paths()["Laptopi"], f"/{o}/{c}/{l}/")
+        self.assertEqual(Category.objects.move_subtree(f"/{o}/", "/"), 3)
+        self.assertEqual(self._paths()["Laptopi"], f"/{c}/{l}/")
+
+    def test_parent_cannot_be_descendant(self):
+        self.electronics.parent = self.laptops
+        with self.assertRaises(ValueError):
+            self.electronics.save()
+
+    def test_delete_reroots_children(self):
+        self.electronics.delete()
+        c, l = self.computers.pk, self.laptops.pk
+        self.computers.refresh_from_db()
+        self.assertIsNone(self.computers.parent_id)
+        self.assertEqual(self._paths(), {
+            "Računari": f"/{c}/", "Laptopi": f"/{c}/{l}/", "Odjeća": f"/{self.clothes.pk}/",
+        })
+
+    def test_tree_action(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("category-tree"))
+        self.assertEqual(response.status_code, 200)
+
+        def names(nodes):
+            return [(node["name"], names(node["children"])) for node in nodes]
+
+        self.assertEqual(names(response.data), [
+            ("Elektronika", [("Računari", [("Laptopi", [])])]),
+            ("Odjeća", []),
+        ])
+
+    def test_descendants_filter_uses_literal_prefix(self):
+        Product.objects.bulk_create([
+            Product(name="Laptop", price=1000, sku="LAP-1", category=self.laptops),
+            Product(name="Računar", price=800, sku="PC-1", category=self.computers),
+            Product(name="Majica", price=20, sku="MAJ-1", category=self.clothes),
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("product-list"), {"category__descendants": self.computers.pk})
+        self.assertEqual(sorted(row["sku"] for row in response.data["results"]), ["LAP-1", "PC-1"])
+        prefix = f"LIKE '/{self.electronics.pk}/{self.computers.pk}/%'"
+        product_queries = [query["sql"] for query in queries if 'FROM "shop_product"' in query["sql"]]
+        self.assertTrue(product_queries)
+        for sql in product_queries:
+            self.assertIn(prefix, sql)
+            # Prefiks nije podupit (ne bi koristio indeks na path)
+            self.assertEqual(sql.count("SELECT"), 1)
+
+        missing = self.client.get(reverse("product-list"), {"category__descendants": 999999})
+        self.assertEqual(missing.data["results"], [])
+
+
+class StockThresholdTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Stroga kategorija: "low_stock" ispod 50; ostale LOW_STOCK_THRESHOLD (10)
+        cls.strict = Category.objects.create(name="Stroga", low_stock_threshold=50)
+        cls.default = Category.objects.create(name="Obična")
+        cls.strict_product = Product.objects.create(name="A", price=1, sku="A-1", category=cls.strict)
+        cls.default_product = Product.objects.create(name="B", price=1, sku="B-1", category=cls.default)
+
+    def _statuses(self, model=StoreInventory):
+        return dict(model.objects.values_list("product__sku", "status"))
+
+    def test_save_uses_category_threshold(self):
+        for model in (StoreInventory, Inventory):
+            with self.subTest(model=model._meta.label):
+                strict = model.objects.create(product=self.strict_product, quantity_in=20)
+                model.objects.create(product=self.default_product, quantity_in=20)
+                self.assertEqual(self._statuses(model), {"A-1": "low_stock", "B-1": "available"})
+                strict.quantity_out = 20
+                strict.save()
+                self.assertEqual(self._statuses(model)["A-1"], "out_of_stock")
+
+    def test_adjust_stock_uses_threshold_expression(self):
+        rows = StoreInventory.objects.bulk_create([
+            StoreInventory(product=self.strict_product),
+            StoreInventory(product=self.default_product),
+        ])
+        self.assertEqual(StoreInventory.objects.adjust_stock(received=30), 2)
+        self.assertEqual(self._statuses(), {"A-1": "low_stock", "B-1": "available"})
+        StoreInventory.objects.filter(pk=rows[1].pk).adjust_stock(shipped=30)
+        self.assertEqual(self._statuses(), {"A-1": "low_stock", "B-1": "out_of_stock"})
+
+        thresholds = StoreInventory.objects.annotate(threshold=low_stock_threshold_expression())
+        self.assertEqual(dict(thresholds.values_list("product__sku", "threshold")), {"A-1": 50, "B-1": 10})
+
+    def test_recompute_status_filters_by_category(self):
+        StoreInventory.objects.bulk_create([
+            StoreInventory(product=self.strict_product, quantity_in=30, status="zastarjelo"),
+            StoreInventory(product=self.default_product, quantity_in=30, status="zastarjelo"),
+        ])
+        self.assertEqual(recompute_inventory_status(category_id=self.strict.pk, targets=["store"]), {"store": 1})
+        self.assertEqual(self._statuses(), {"A-1": "low_stock", "B-1": "zastarjelo"})
+        self.assertEqual(StoreInventory.objects.all().recompute_status(), 2)
+        self.assertEqual(self._statuses(), {"A-1": "low_stock", "B-1": "available"})
+
+    def test_threshold_change_enqueues_recompute(self):
+        Job.objects.all().delete()
+        Category.objects.create(name="Nova", low_stock_threshold=5)
+        self.strict.name = "Stroga 2"
+        self.strict.save()
+        self.assertFalse(Job.objects.exists())
+
+        category = Category.objects.get(pk=self.strict.pk)
+        category.low_stock_threshold = 5
+        category.save()
+        category.save()
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.kwargs), ("shop.recompute_inventory_status", {"category_id": self.strict.pk}))
+
+    def test_recompute_status_endpoint(self):
+        StoreInventory.objects.bulk_create([
+            StoreInventory(product=self.strict_product, quantity_in=30, status="zastarjelo"),
+            StoreInventory(product=self.default_product, quantity_in=30, status="zastarjelo"),
+        ])
+        url = reverse("inventory-recompute-status")
+        response = self.client.post(f"{url}?product={self.strict_product.pk}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"updated": 1})
+        self.assertEqual(self._statuses(), {"A-1": "low_stock", "B-1": "zastarjelo"})
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _search(self, term, **params):
+        response = self.client.get(reverse("product-list"), {"search": term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["sku"] for row in response.data["results"]]
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 tabela postoji samo na SQLite")
+    def test_fts_index_follows_insert_update_delete(self):
+        self.assertIsInstance(get_search_backend(connection.alias), SQLiteFTSBackend)
+        product = Product.objects.create(name="Gaming laptop", price=1000, sku="LAP-1", description="Brz i tih")
+        Product.objects.create(name="Miš", price=10, sku="MIS-1", description="Bežični, za laptop")
+        # Prefiks, bez obzira na velika slova; operatori FTS sintakse se ignorišu
+        self.assertEqual(sorted(self._search("LAPT")), ["LAP-1", "MIS-1"])
+        self.assertEqual(self._search('brz*" ('), ["LAP-1"])
+
+        product.name = "Monitor"
+        product.description = ""
+        product.save()
+        self.assertEqual(self._search("laptop"), ["MIS-1"])
+        self.assertEqual(self._search("monitor"), ["LAP-1"])
+
+        Product.objects.filter(pk=product.pk).update(name="Televizor")
+        self.assertEqual(self._search("televizor"), ["LAP-1"])
+        product.delete()
+        self.assertEqual(self._search("televizor"), [])
+        self.assertEqual(self._search("monitor"), [])
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 tabela postoji samo na SQLite")
+    def test_results_ranked_unless_ordering_given(self):
+        Product.objects.create(name="Torba", price=5, sku="TOR-1", description="Torba za laptop")
+        Product.objects.create(name="Laptop", price=900, sku="LAP-1", description="Laptop 15 inča, laptop klase")
+        self.assertEqual(self._search("laptop"), ["LAP-1", "TOR-1"])
+        self.assertEqual(self._search("laptop", ordering="price"), ["TOR-1", "LAP-1"])
+
+    @override_settings(PRODUCT_SEARCH_BACKEND="icontains")
+    def test_icontains_fallback(self):
+        self.assertIsInstance(get_search_backend(connection.alias), IcontainsBackend)
+        product = Product.objects.create(name="Gaming laptop", price=1000, sku="LAP-1", description="Brz")
+        # Podstring usred riječi (FTS traži samo prefikse)
+        self.assertEqual(self._search("aptop"), ["LAP-1"])
+        product.name = "Monitor"
+        product.save()
+        self.assertEqual(self._search("aptop"), [])
+        self.assertEqual(self._search("onito"), ["LAP-1"])
+        product.delete()
+        self.assertEqual(self._search("onito"), [])
+
+
+def _cursor(payload):
+    raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Mnogo istih cijena: redoslijed unutar cijene odlučuje `id`
+        prices = [5, 5, 5, 10, 10, 1, 20, 5, 10]
+        cls.products = Product.objects.bulk_create([
+            Product(name=f"P{i}", price=price, sku=f"SKU-{i}") for i, price in enumerate(prices)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def _pages(self, url, params=None, link="next"):
+        pages = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row["sku"] for row in response.data["results"]])
+            url, params = response.data[link], None
+        return pages, response
+
+    def _expected(self, descending=False):
+        rows = sorted(Product.objects.values_list("price", "id", "sku"))
+        if descending:
+            rows.reverse()
+        return [sku for _, _, sku in rows]
+
+    def test_tied_ordering_returns_every_row_once(self):
+        for ordering in ("price", "-price"):
+            with self.subTest(ordering=ordering):
+                params = {"pagination": "cursor", "page_size": 2, "ordering": ordering}
+                pages, last = self._pages(reverse("product-list"), params)
+                self.assertEqual(len(pages), 5)
+                self.assertEqual(sum(pages, []), self._expected(descending=ordering.startswith("-")))
+                self.assertIsNone(last.data["count"])
+
+                # Nazad od zadnje stranice: iste stranice obrnutim redom
+                back, _ = self._pages(last.data["previous"], link="previous")
+                self.assertEqual(back, pages[-2::-1])
+
+    def test_cursor_encoding(self):
+        params = {"pagination": "cursor", "page_size": 3, "ordering": "price"}
+        response = self.client.get(reverse("product-list"), params)
+        self.assertIsNone(response.data["previous"])
+        token = response.data["next"].split("cursor=")[1].split("&")[0]
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        third = Product.objects.order_by("price", "id")[2]
+        self.assertEqual(payload, {"v": "5.00", "id": third.pk, "r": False})
+
+    def test_invalid_or_tampered_cursor(self):
+        url = reverse("product-list")
+        for token in (
+            "%%%",
+            _cursor(b"nije json"),
+            _cursor([1, 2]),
+            _cursor({"v": "5.00"}),
+            _cursor({"v": "nije broj", "id": 1}),
+            _cursor({"v": "5.00", "id": "x"}),
+            _cursor({"v": None, "id": None}),
+        ):
+            with self.subTest(token=token):
+                response = self.client.get(url, {"cursor": token, "ordering": "price"})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.data["detail"], "Neispravan cursor.")
+
+
+class ProductBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Telefoni")
+        Product.objects.create(name="Stari", price=5, sku="OLD-1", category=cls.category, description="opis")
+
+    def _bulk(self, rows):
+        return self.client.post(reverse("product-bulk"), rows, content_type="application/json")
+
+    def test_creates_and_updates_by_sku(self):
+        response = self._bulk([
+            {"sku": "OLD-1", "name": "Obnovljeni", "price": "7.50"},
+            {"sku": "NEW-1", "name": "Novi", "price": "10", "category": self.category.pk},
+            {"sku": "NEW-2", "name": "Drugi", "price": "20"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"created": 2, "updated": 1, "errors": []})
+        # Red zamjenjuje cijeli proizvod: izostavljena kategorija i opis postaju prazni
+        old = Product.objects.get(sku="OLD-1")
+        self.assertEqual(
+            (old.name, str(old.price), old.category_id, old.description), ("Obnovljeni", "7.50", None, None)
+        )
+        self.assertEqual(Product.objects.get(sku="NEW-1").category, self.category)
+
+    def test_row_errors(self):
+        response = self._bulk([
+            {"sku": "NEW-1", "name": "Novi", "price": "10"},
+            {"sku": "NEW-1", "name": "Ponovo", "price": "11"},
+            {"sku": "NEW-2", "name": "Bez kategorije", "price": "12", "category": 999999},
+            {"sku": "NEW-3", "name": "Bez cijene"},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["updated"]), (1, 0))
+        self.assertEqual(
+            [(error["index"], set(error["errors"])) for error in response.data["errors"]],
+            [(1, {"sku"}), (2, {"category"}), (3, {"price"})],
+        )
+        self.assertEqual(Product.objects.get(sku="NEW-1").name, "Novi")
+        self.assertFalse(Product.objects.filter(sku="NEW-2").exists())
+
+    def test_all_rows_invalid(self):
+        response = self._bulk([{"sku": "NEW-1", "name": "Novi", "price": "10", "category": 999999}, {"sku": "X"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["created"], 0)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [0, 1])
+        self.assertEqual(self._bulk({"sku": "NEW-1"}).status_code, 400)
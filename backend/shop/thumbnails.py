@@ -0,0 +1,120 @@
+"""
+Thumbnailovi za ProductImage.
+
+Za svaku sliku se prave umanjene verzije (`settings.THUMBNAIL_SIZES`, po
+širini) u WebP formatu (JPEG ako Pillow nema WebP) i čuvaju se pored
+originala: `products/<ime>.<hash>.<širina>.webp`. Hash je iz sadržaja
+originala, pa se fajl nikad ne mijenja i može se keširati zauvijek.
+
+Generisanje radi pozadinski worker (posao `shop.generate_thumbnails`,
+vidi `manage.py runworker`) — posao se dodaje pri uploadu (post_save).
+Serializer samo čita `thumbnails` i nikad ne dodaje posao (GET ne piše u
+bazu); slike iz vremena prije thumbnailova puni `manage.py
+generate_thumbnails`. Rezultat se upisuje u `ProductImage.thumbnails`:
+`{"source": <ime originala>, "128": <ime fajla>, "512": <ime fajla>}`.
+"""
+
+import hashlib
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from jobs.registry import enqueue
+from .models import ProductImage
+
+HASH_LENGTH = 16
+TASK_NAME = "shop.generate_thumbnails"
+
+
+def thumbnail_sizes():
+    return list(getattr(settings, "THUMBNAIL_SIZES", [128, 512]))
+
+
+def thumbnail_format():
+    # Pillow se importuje tek u workeru (ne usporava start web procesa)
+    from PIL import features
+
+    return ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+
+
+def is_current(image):
+    """
+    Da li `image.thumbnails` odgovara trenutnom originalu i svim veličinama.
+    """
+    thumbnails = image.thumbnails or {}
+    if not image.image or thumbnails.get("source") != image.image.name:
+        return False
+    return all(str(size) in thumbnails for size in thumbnail_sizes())
+
+
+def thumbnail_name(source_name, digest, size, extension):
+    directory, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, f"{stem}.{digest}.{size}.{extension}")
+
+
+def render_thumbnails(image):
+    """
+    Pravi sve veličine za dati ProductImage i vraća novu vrijednost
+    `thumbnails`. Postojeći fajlovi (isti hash) se ne prepisuju.
+    """
+    from PIL import Image, ImageOps
+
+    storage = image.image.storage
+    with image.image.open("rb") as source:
+        content = source.read()
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    pil_format, extension = thumbnail_format()
+
+    thumbnails = {"source": image.image.name}
+    with Image.open(io.BytesIO(content)) as original:
+        original = ImageOps.exif_transpose(original)
+        if pil_format == "JPEG" or original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGB" if pil_format == "JPEG" else "RGBA")
+        for size in thumbnail_sizes():
+            name = thumbnail_name(image.image.name, digest, size, extension)
+            if not storage.exists(name):
+                resized = original.copy()
+                resized.thumbnail((size, size * 4), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, quality=82)
+                name = storage.save(name, ContentFile(buffer.getvalue()))
+            thumbnails[str(size)] = name
+    return thumbnails
+
+
+def generate_thumbnails(image_id):
+    """
+    Generiše i upisuje thumbnailove za sliku. `save(update_fields=...)`
+    šalje post_save, pa se keš proizvoda i listing osvježavaju kao i pri
+    svakoj drugoj izmjeni slike.
+    """
+    image = ProductImage.objects.filter(pk=image_id).first()
+    if image is None or not image.image or is_current(image):
+        return image
+    image.thumbnails = render_thumbnails(image)
+    image.save(update_fields=["thumbnails"])
+    return image
+
+
+def schedule_thumbnails(image):
+    """
+    Dodaje posao generisanja u red (jedan posao po slici dok čeka).
+    """
+    if not image.pk or not image.image:
+        return
+    enqueue(TASK_NAME, image_id=image.pk, priority=5, unique=True)
+
+
+def thumbnail_url(image, size=None, request=None):
+    """
+    URL thumbnaila date širine (podrazumijevano najmanje), ili None dok
+    thumbnail ne postoji. Ne zakazuje generisanje (poziva se na GET-u).
+    """
+    if not image.image or not is_current(image):
+        return None
+    size = size or min(thumbnail_sizes())
+    url = image.image.storage.url(image.thumbnails[str(size)])
+    return request.build_absolute_uri(url) if request is not None else url
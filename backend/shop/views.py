@@ -1,6 +1,9 @@
 from rest_framework import status, viewsets, filters
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ecommerce.cache import CachedResponseMixin
+from ecommerce.lean import LeanListMixin
 from django.db.models import ProtectedError
 from .models import Category, Product, ProductImage, Inventory, Discount, Order
 from .serializers import (
@@ -9,15 +12,23 @@ from .serializers import (
     ProductImageSerializer,
     InventorySerializer,
     DiscountSerializer,
-    OrderSerializer
+    OrderSerializer,
+    ProductBulkSerializer,
+    StockAdjustmentSerializer,
 )
+from .filters import InventoryFilter, ProductFilter
+from .bulk import MAX_ROWS, bulk_response, upsert_products
 from .pagination import StandardPagination  # ✅ sada se importuje iz pagination.py
+from .search import ProductSearchFilter, RelevanceOrderingFilter
+from .signals import catalog_changed
 
 
 # -----------------------------
 # ✅ Category ViewSet
 # -----------------------------
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_actions = ("list", "retrieve", "tree")
+    cache_models = (Category,)
     queryset = Category.objects.all().order_by("id")
     serializer_class = CategorySerializer
     pagination_class = StandardPagination
@@ -25,23 +36,49 @@ class CategoryViewSet(viewsets.ModelViewSet):
     search_fields = ["name"]
     ordering_fields = ["id", "name"]
 
+    @action(detail=False)
+    def tree(self, request):
+        """
+        ✅ Cijelo stablo kategorija (ugniježđeno) iz jednog upita sortiranog po putanji.
+        """
+        return self.cached_response(self._build_tree, request)
+
+    def _build_tree(self, request):
+        nodes = {}
+        roots = []
+        for row in Category.objects.order_by("path").values("id", "name", "parent", "path"):
+            node = {**row, "children": []}
+            nodes[row["id"]] = node
+            parent = nodes.get(row["parent"])
+            (parent["children"] if parent else roots).append(node)
+        return Response(roots)
+
 
 # -----------------------------
 # ✅ Product ViewSet (sigurno brisanje)
 # -----------------------------
-class ProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.all().order_by("id")
+class ProductViewSet(CachedResponseMixin, LeanListMixin, viewsets.ModelViewSet):
+    cache_models = (Product, Category, ProductImage)
+    queryset = Product.objects.select_related("category").prefetch_related("images").order_by("id")
     serializer_class = ProductSerializer
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProductSearchFilter, RelevanceOrderingFilter]
     search_fields = ["name", "description"]
-    filterset_fields = {
-        "category": ["exact"],
-        "price": ["gte", "lte"],
-    }
+    filterset_class = ProductFilter
     ordering_fields = ["price", "name", "id", "category"]
     ordering = ["id"]
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        ✅ Masovni upsert proizvoda po SKU — tijelo je lista redova, odgovor
+        sadrži broj kreiranih/ažuriranih i greške po indeksu reda.
+        """
+        serializer = ProductBulkSerializer(data=request.data, many=True, max_length=MAX_ROWS)
+        valid, errors = serializer.partition()
+        created, updated, upsert_errors = upsert_products(valid)
+        return bulk_response(created, updated, errors + upsert_errors)
+
     def destroy(self, request, *args, **kwargs):
         """
         ✅ Sigurno brisanje proizvoda — ne dozvoljava ako proizvod postoji u narudžbinama.
@@ -71,26 +108,57 @@ class ProductImageViewSet(viewsets.ModelViewSet):
     pagination_class = StandardPagination
 
 
+# -----------------------------
+# ✅ Stock Adjustment (atomski ulaz/izlaz)
+# -----------------------------
+class StockAdjustmentMixin:
+    @action(detail=True, methods=["post"])
+    def adjust(self, request, pk=None):
+        """
+        ✅ Atomska promjena zalihe: `{"received": 5, "shipped": 2}` se upisuje
+        preko F() izraza, bez gubljenja paralelnih izmjena. 409 ako bi zaliha
+        pala ispod nule.
+        """
+        serializer = StockAdjustmentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        instance = self.get_object()
+        if not instance.adjust(**serializer.validated_data):
+            instance.refresh_from_db(fields=["stock"])
+            return Response(
+                {"error": "Nema dovoljno zalihe.", "available": instance.stock},
+                status=status.HTTP_409_CONFLICT,
+            )
+        catalog_changed.send(sender=type(instance), product_ids=[instance.product_id])
+        return Response(self.get_serializer(instance).data)
+
+    @action(detail=False, methods=["post"], url_path="recompute-status")
+    def recompute_status(self, request):
+        """
+        ✅ Preračunava status za sve (filtrirane) redove jednim UPDATE-om,
+        npr. `POST /api/inventory/recompute-status/?product=3`.
+        """
+        updated = self.filter_queryset(self.get_queryset()).order_by().recompute_status()
+        return Response({"updated": updated})
+
+
 # -----------------------------
 # ✅ Inventory ViewSet
 # -----------------------------
-class InventoryViewSet(viewsets.ModelViewSet):
+class InventoryViewSet(StockAdjustmentMixin, viewsets.ModelViewSet):
     queryset = Inventory.objects.all().order_by("id")
     serializer_class = InventorySerializer
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = {
-        "product": ["exact"],
-        "status": ["exact"],
-    }
-    ordering_fields = ["id", "quantity_in", "quantity_out"]
+    filterset_class = InventoryFilter
+    ordering_fields = ["id", "quantity_in", "quantity_out", "stock"]
     ordering = ["id"]
 
 
 # -----------------------------
 # ✅ Discount ViewSet
 # -----------------------------
-class DiscountViewSet(viewsets.ModelViewSet):
+class DiscountViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = (Discount,)
     queryset = Discount.objects.all().order_by("id")
     serializer_class = DiscountSerializer
     pagination_class = StandardPagination
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Payment, ShippingAddress, Order, OrderItem, CartItem, DiscountType, Discount, Inventory
+from .models import (
+    Payment, ShippingAddress, Order, OrderItem, CartItem, DiscountType, Discount, Inventory,
+    InventoryMovement, InventorySnapshot,
+)
 
 admin.site.register(Payment)
 admin.site.register(ShippingAddress)
@@ -9,3 +12,5 @@ admin.site.register(CartItem)
 admin.site.register(DiscountType)
 admin.site.register(Discount)
 admin.site.register(Inventory)
+admin.site.register(InventoryMovement)
+admin.site.register(InventorySnapshot)
@@ -0,0 +1,107 @@
+"""
+Masovni upsert inventara po SKU proizvoda u jednoj transakciji.
+"""
+
+from django.db import transaction
+
+from shop.bulk import BATCH_SIZE, chunks
+from shop.models import Product, low_stock_thresholds, stock_status
+from shop.signals import catalog_changed
+from .ledger import record_movements
+from .models import Inventory, InventoryMovement
+
+
+def upsert_inventory(valid_rows):
+    """
+    Upisuje validirane redove (indeks, podaci) za store.Inventory.
+
+    store.Inventory nema jedinstven ključ po proizvodu, pa se postojeći
+    redovi (prvi red po proizvodu) ažuriraju preko `bulk_update`, a novi
+    kreiraju preko `bulk_create`; postojeći redovi su zaključani
+    (`select_for_update`) do kraja transakcije. Status (sa pragom
+    kategorije) se računa za sve redove u jednom prolazu, bez `save()` po
+    redu, a promjena zalihe se bilježi u ledgeru.
+
+    Vraća (broj kreiranih, broj ažuriranih, greške po redu).
+    """
+    errors = []
+    by_sku = {}
+    for index, row in valid_rows:
+        if row["sku"] in by_sku:
+            errors.append({"index": index, "errors": {"sku": ["SKU se ponavlja u zahtjevu."]}})
+            continue
+        by_sku[row["sku"]] = (index, row)
+
+    product_ids = {}
+    for chunk in chunks(by_sku):
+        product_ids.update(Product.objects.filter(sku__in=chunk).values_list("sku", "id"))
+
+    thresholds = {}
+    for chunk in chunks(product_ids.values()):
+        thresholds.update(low_stock_thresholds(chunk))
+
+    with transaction.atomic():
+        # Zaključani redovi: razlika za ledger se računa od zalihe koju
+        # niko ne mijenja do kraja transakcije
+        inventory_by_product = {}
+        for chunk in chunks(product_ids.values()):
+            locked = Inventory.objects.select_for_update().filter(product_id__in=chunk).order_by("-id")
+            for inventory in locked:
+                inventory_by_product[inventory.product_id] = inventory
+
+        to_create, to_update = [], []
+        for sku, (index, row) in by_sku.items():
+            product_id = product_ids.get(sku)
+            if product_id is None:
+                errors.append({"index": index, "errors": {"sku": [f"Proizvod sa SKU {sku} ne postoji."]}})
+                continue
+            inventory = inventory_by_product.get(product_id)
+            if inventory is None:
+                inventory = Inventory(product_id=product_id)
+                to_create.append(inventory)
+            else:
+                to_update.append(inventory)
+            inventory.quantity_in = row["quantity_in"]
+            if "quantity_out" in row:
+                inventory.quantity_out = row["quantity_out"]
+            inventory.status = stock_status(
+                inventory.quantity_in - inventory.quantity_out, thresholds.get(product_id)
+            )
+
+        # Razlika u zalihi ide u ledger kao već primijenjena korekcija
+        deltas = [
+            (
+                inventory,
+                inventory.quantity_in - inventory.quantity_out - (getattr(inventory, "_loaded_stock", None) or 0),
+            )
+            for inventory in to_create + to_update
+        ]
+        Inventory.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        Inventory.objects.bulk_update(
+            to_update, ["quantity_in", "quantity_out", "status"], batch_size=BATCH_SIZE
+        )
+        # Bez RETURNING-a (MySQL) novi redovi nemaju id; proizvod ih nije
+        # imao prije upisa, pa se id čita po proizvodu
+        missing = [inventory for inventory in to_create if inventory.pk is None]
+        new_ids = {}
+        for chunk in chunks(inventory.product_id for inventory in missing):
+            new_ids.update(Inventory.objects.filter(product_id__in=chunk).values_list("product_id", "id"))
+        for inventory in missing:
+            inventory.pk = new_ids[inventory.product_id]
+        record_movements(
+            InventoryMovement(
+                product_id=inventory.product_id,
+                inventory_id=inventory.pk,
+                delta=delta,
+                reason=InventoryMovement.ADJUSTMENT,
+                applied=True,
+            )
+            for inventory, delta in deltas
+            if delta
+        )
+    catalog_changed.send(
+        sender=Inventory,
+        product_ids=[inventory.product_id for inventory in to_create + to_update],
+    )
+
+    return len(to_create), len(to_update), errors
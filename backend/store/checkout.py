@@ -0,0 +1,138 @@
+"""
+Checkout: aktivna korpa korisnika -> Order + OrderItem u jednoj transakciji.
+
+Redovi se zaključavaju (`select_for_update`) uvijek istim redom — prvo
+stavke korpe korisnika po `id`, zatim inventar po (`product_id`, `id`) —
+pa dva kupca koji traže iste proizvode čekaju jedan drugog umjesto da
+uđu u deadlock. Zaliha se skida preko F() izraza sa uslovom
+`stock >= količina`, tako da ni baza bez zaključavanja redova (SQLite)
+ne može otići u minus. Svaka skinuta količina se bilježi u ledgeru kao
+primijenjeno kretanje sa referencom na narudžbu.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+
+from shop.models import Product
+from shop.signals import catalog_changed
+from .ledger import record_movements
+from .models import CartItem, Inventory, InventoryMovement, Order, OrderItem
+from .pricing import discounts_for_products, effective_price
+
+ACTIVE = "active"
+ORDERED = "ordered"
+
+
+class CheckoutError(Exception):
+    """
+    Checkout nije moguć; `errors` je rječnik u obliku DRF grešaka, a
+    `conflict` označava nedovoljnu zalihu (HTTP 409) za razliku od
+    neispravnog zahtjeva (HTTP 400).
+    """
+
+    def __init__(self, errors, conflict=False):
+        super().__init__(errors)
+        self.errors = errors
+        self.conflict = conflict
+
+
+def _allocate(rows, quantity):
+    """
+    Raspoređuje traženu količinu po redovima inventara jednog proizvoda
+    (red po red, dok se ne namiri). Vraća listu (red, količina).
+    """
+    allocation = []
+    for row in rows:
+        if quantity <= 0:
+            break
+        take = min(max(row.stock, 0), quantity)
+        if take:
+            allocation.append((row, take))
+            quantity -= take
+    return allocation
+
+
+def _shortage_error(product_ids, requested, available):
+    return CheckoutError({
+        "stock": [
+            {"product": product_id, "requested": requested[product_id], "available": available.get(product_id, 0)}
+            for product_id in product_ids
+        ]
+    }, conflict=True)
+
+
+def checkout(user, payment=None, shipping_address=None):
+    """
+    Pretvara aktivne stavke korpe korisnika u narudžbu. Količina proizvoda
+    je broj njegovih stavki u korpi, a `final_price` je cijena nakon
+    popusta (`store.pricing`). Vraća kreiranu narudžbu.
+    """
+    with transaction.atomic():
+        cart = list(
+            CartItem.objects.select_for_update()
+            .filter(user=user, status=ACTIVE)
+            .order_by("id")
+            .only("id", "product_id")
+        )
+        if not cart:
+            raise CheckoutError({"cart": ["Korpa je prazna."]})
+
+        requested = Counter(item.product_id for item in cart)
+        product_ids = sorted(requested)
+        rows = list(
+            Inventory.objects.select_for_update()
+            .filter(product_id__in=product_ids)
+            .order_by("product_id", "id")
+            .only("id", "product_id", "quantity_in", "quantity_out", "stock")
+        )
+        by_product = {}
+        for row in rows:
+            by_product.setdefault(row.product_id, []).append(row)
+
+        available = {
+            product_id: sum(max(row.stock, 0) for row in by_product.get(product_id, ()))
+            for product_id in product_ids
+        }
+        short = [product_id for product_id in product_ids if available[product_id] < requested[product_id]]
+        if short:
+            raise _shortage_error(short, requested, available)
+
+        shipped = []
+        for product_id in product_ids:
+            for row, quantity in _allocate(by_product[product_id], requested[product_id]):
+                # Uslov na zalihu štiti i kada baza ne zaključava redove
+                updated = (
+                    Inventory.objects.filter(pk=row.pk, stock__gte=quantity)
+                    .adjust_stock(shipped=quantity)
+                )
+                if not updated:
+                    raise _shortage_error([product_id], requested, available)
+                shipped.append((row, quantity))
+
+        prices = dict(Product.objects.filter(id__in=product_ids).values_list("id", "price"))
+        discounts = discounts_for_products(product_ids)
+        order = Order.objects.create(
+            user=user, payment=payment, shipping_address=shipping_address
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(
+                order=order,
+                product_id=product_id,
+                quantity=requested[product_id],
+                final_price=effective_price(prices[product_id], discounts.get(product_id, ())),
+            )
+            for product_id in product_ids
+        ])
+        # Zaliha je već skinuta gore, pa su kretanja primijenjena
+        record_movements(
+            InventoryMovement(
+                product_id=row.product_id, inventory_id=row.pk, delta=-quantity,
+                reason=InventoryMovement.SALE, order=order, applied=True,
+            )
+            for row, quantity in shipped
+        )
+        CartItem.objects.filter(id__in=[item.id for item in cart]).update(status=ORDERED)
+        catalog_changed.send(sender=Inventory, product_ids=product_ids)
+
+    return order
@@ -0,0 +1,27 @@
+import django_filters
+
+from shop.filters import StockFilterSet
+
+from .models import Inventory, InventoryMovement
+
+
+class InventoryFilter(StockFilterSet):
+    class Meta:
+        model = Inventory
+        fields = {
+            "product": ["exact"],
+            "status": ["exact"],
+        }
+
+
+class InventoryMovementFilter(django_filters.FilterSet):
+    class Meta:
+        model = InventoryMovement
+        fields = {
+            "product": ["exact"],
+            "inventory": ["exact"],
+            "reason": ["exact"],
+            "order": ["exact"],
+            "applied": ["exact"],
+            "created_at": ["gte", "lt"],
+        }
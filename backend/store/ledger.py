@@ -0,0 +1,243 @@
+"""
+Ledger kretanja zalihe (InventoryMovement) i periodični snapshoti.
+
+- `record_movements()` samo dodaje redove (bulk_create u serijama) i ne
+  dira Inventory red, pa paralelni prijemi istog proizvoda ne čekaju na
+  zaključavanje reda.
+- `apply_pending()` sažima kretanja koja još nisu u brojačima: zbir po
+  redu inventara upisuje jednim F() UPDATE-om i označava ih primijenjenim.
+- `take_snapshots()` jednom po periodu (dan) upisuje zalihu proizvoda sa
+  kretanjima u tom periodu: prethodni snapshot + zbir kretanja.
+- `stock_at()` / `stock_history()` čitaju najbliži snapshot i kretanja
+  nakon njega — najviše jedan period kretanja po proizvodu.
+
+Zaliha u ledgeru uključuje i kretanja koja još čekaju sažimanje; brojači
+Inventory reda ih vide tek nakon `apply_pending()`.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.registry import enqueue
+from shop.bulk import BATCH_SIZE, chunks
+from shop.signals import catalog_changed
+from .models import Inventory, InventoryMovement, InventorySnapshot
+
+# Kretanja mlađa od ovoga možda još nisu commitovana, pa ne ulaze u snapshot
+SETTLE_SECONDS = 60
+# Sažimanje se odlaže da jedan posao pokupi više upisa
+COMPACTION_DELAY_SECONDS = 5
+
+
+def record_movements(movements):
+    """
+    Dodaje kretanja u ledger (u serijama). Vraća broj upisanih redova.
+    """
+    movements = list(movements)
+    InventoryMovement.objects.bulk_create(movements, batch_size=BATCH_SIZE)
+    return len(movements)
+
+
+def schedule_compaction():
+    """
+    Jedan čekajući posao sažimanja za sve nove upise (unique).
+    """
+    return enqueue(
+        "store.compact_inventory",
+        unique=True,
+        run_after=timezone.now() + timedelta(seconds=COMPACTION_DELAY_SECONDS),
+    )
+
+
+def _default_inventory(product_ids):
+    """
+    Prvi Inventory red po proizvodu; proizvodima bez reda se red kreira.
+    """
+    targets = {}
+    for product_id, inventory_id in (
+        Inventory.objects.filter(product_id__in=product_ids).order_by("-id").values_list("product_id", "id")
+    ):
+        targets[product_id] = inventory_id
+    missing = [product_id for product_id in product_ids if product_id not in targets]
+    if missing:
+        Inventory.objects.bulk_create([Inventory(product_id=product_id) for product_id in missing])
+        targets.update(
+            Inventory.objects.filter(product_id__in=missing).order_by("-id").values_list("product_id", "id")
+        )
+    return targets
+
+
+def apply_pending(limit=BATCH_SIZE * 10):
+    """
+    Upisuje do `limit` neprimijenjenih kretanja u brojače Inventory redova.
+    Vraća broj primijenjenih kretanja.
+    """
+    with transaction.atomic():
+        pending = InventoryMovement.objects.filter(applied=False).order_by("id")
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        rows = list(pending.values_list("id", "product_id", "inventory_id", "delta")[:limit])
+        if not rows:
+            return 0
+
+        targets = _default_inventory({product_id for _, product_id, inventory_id, _ in rows if inventory_id is None})
+        totals = defaultdict(lambda: [0, 0])
+        for _, product_id, inventory_id, delta in rows:
+            key = (product_id, inventory_id or targets[product_id])
+            totals[key][0 if delta > 0 else 1] += abs(delta)
+
+        # Isti redoslijed zaključavanja kao checkout: (product_id, id)
+        for (_, inventory_id), (received, shipped) in sorted(totals.items()):
+            Inventory.objects.filter(pk=inventory_id).adjust_stock(received=received, shipped=shipped)
+
+        for chunk in chunks([row[0] for row in rows]):
+            InventoryMovement.objects.filter(id__in=chunk).update(applied=True)
+        catalog_changed.send(sender=Inventory, product_ids=sorted({product_id for product_id, _ in totals}))
+    return len(rows)
+
+
+def snapshot_boundary(now=None):
+    """
+    Kraj posljednjeg završenog perioda (ponoć po lokalnoj zoni) čija su
+    kretanja sigurno commitovana.
+    """
+    settled = (now or timezone.now()) - timedelta(seconds=SETTLE_SECONDS)
+    day = timezone.localtime(settled).date()
+    return datetime.combine(day, time.min, timezone.get_current_timezone())
+
+
+def _latest_snapshots(product_ids, before):
+    """
+    product_id -> (taken_at, stock) zadnjeg snapshota prije `before`.
+    """
+    latest = dict(
+        InventorySnapshot.objects.filter(product_id__in=product_ids, taken_at__lt=before)
+        .values("product_id")
+        .annotate(last=Max("taken_at"))
+        .values_list("product_id", "last")
+        .order_by()
+    )
+    snapshots = {}
+    for product_id, taken_at, stock in InventorySnapshot.objects.filter(
+        product_id__in=list(latest), taken_at__in=set(latest.values())
+    ).values_list("product_id", "taken_at", "stock"):
+        if latest[product_id] == taken_at:
+            snapshots[product_id] = (taken_at, stock)
+    return snapshots
+
+
+def _snapshot_period(start, end):
+    changed = (
+        InventoryMovement.objects.filter(created_at__lt=end)
+        .values("product_id")
+        .annotate(total=Sum("delta"))
+        .values_list("product_id", "total")
+        .order_by()
+    )
+    if start is not None:
+        changed = changed.filter(created_at__gte=start)
+    changed = dict(changed)
+
+    created = 0
+    for chunk in chunks(sorted(changed)):
+        previous = _latest_snapshots(chunk, end)
+        InventorySnapshot.objects.bulk_create(
+            [
+                InventorySnapshot(
+                    product_id=product_id,
+                    taken_at=end,
+                    stock=previous.get(product_id, (None, 0))[1] + changed[product_id],
+                )
+                for product_id in chunk
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        created += len(chunk)
+    return created
+
+
+def take_snapshots(now=None):
+    """
+    Upisuje snapshote za svaki završen period (dan) od zadnjeg snapshota.
+    Vraća broj upisanih redova.
+    """
+    boundary = snapshot_boundary(now)
+    last = InventorySnapshot.objects.aggregate(last=Max("taken_at"))["last"]
+    if last is None:
+        # Prvi snapshot obuhvata cijelu istoriju
+        return _snapshot_period(None, boundary)
+
+    created = 0
+    start = last
+    while start < boundary:
+        end = min(datetime.combine(timezone.localtime(start).date() + timedelta(days=1), time.min,
+                                   timezone.get_current_timezone()), boundary)
+        created += _snapshot_period(start, end)
+        start = end
+    return created
+
+
+def compact():
+    """
+    Sažimanje: sva neprimijenjena kretanja u brojače, pa snapshoti za
+    završene periode. Vraća (broj primijenjenih kretanja, broj snapshota).
+    """
+    applied = 0
+    while True:
+        count = apply_pending()
+        applied += count
+        if not count:
+            break
+    return applied, take_snapshots()
+
+
+def stock_at(product_id, at):
+    """
+    Zaliha proizvoda (po ledgeru) u trenutku `at`.
+    """
+    snapshot = (
+        InventorySnapshot.objects.filter(product_id=product_id, taken_at__lte=at)
+        .order_by("-taken_at")
+        .values_list("taken_at", "stock")
+        .first()
+    )
+    movements = InventoryMovement.objects.filter(product_id=product_id, created_at__lt=at)
+    base = 0
+    if snapshot is not None:
+        movements = movements.filter(created_at__gte=snapshot[0])
+        base = snapshot[1]
+    return base + (movements.aggregate(total=Sum("delta"))["total"] or 0)
+
+
+def stock_history(product_id, days=30, now=None):
+    """
+    Zaliha na kraju svakog od zadnjih `days` dana: `[{"date", "stock"}, ...]`.
+    Jedan snapshot + kretanja od početka prozora grupisana po danu.
+    """
+    now = now or timezone.now()
+    today = timezone.localtime(now).date()
+    first_day = today - timedelta(days=days - 1)
+    start = datetime.combine(first_day, time.min, timezone.get_current_timezone())
+
+    stock = stock_at(product_id, start)
+    daily = dict(
+        InventoryMovement.objects.filter(product_id=product_id, created_at__gte=start, created_at__lt=now)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(total=Sum("delta"))
+        .values_list("day", "total")
+        .order_by()
+    )
+    history = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        stock += daily.get(day, 0)
+        history.append({"date": day, "stock": stock})
+    return history
+
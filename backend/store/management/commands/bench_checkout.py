@@ -0,0 +1,109 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from django.db.models import Sum
+
+from core.models import User
+from shop.models import Product
+from store.checkout import CheckoutError, checkout
+from store.models import CartItem, Inventory, Order, OrderItem
+
+PREFIX = "CHECKOUT-BENCH"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test checkout-a: N kupaca paralelno kupuje isti proizvod sa "
+        "ograničenom zalihom; provjerava da nema overselling-a i ispisuje propusnost."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyers", type=int, default=50, help="Broj paralelnih kupaca.")
+        parser.add_argument("--stock", type=int, default=20, help="Početna zaliha proizvoda.")
+        parser.add_argument("--items", type=int, default=1, help="Komada po kupcu.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Broj niti (podrazumijevano koliko i kupaca).")
+        parser.add_argument("--retries", type=int, default=20,
+                            help="Ponavljanja nakon lock/deadlock greške baze.")
+        parser.add_argument("--keep", action="store_true", help="Ne briše generisane podatke na kraju.")
+
+    def handle(self, *args, **options):
+        buyers, stock, items = options["buyers"], options["stock"], options["items"]
+        if buyers < 1 or items < 1 or stock < 0:
+            raise CommandError("--buyers i --items moraju biti >= 1, --stock >= 0.")
+
+        self._clear()
+        product = Product.objects.create(name=PREFIX, sku=PREFIX, price=100)
+        Inventory.objects.create(product=product, quantity_in=stock)
+        User.objects.bulk_create([
+            User(username=f"{PREFIX.lower()}-{i}") for i in range(buyers)
+        ])
+        # bulk_create na MySQL-u ne vraća pk, pa se kupci čitaju ponovo
+        users = list(User.objects.filter(username__startswith=f"{PREFIX.lower()}-").order_by("id"))
+        CartItem.objects.bulk_create([
+            CartItem(user_id=user.pk, product_id=product.pk) for user in users for _ in range(items)
+        ])
+
+        self.retries = options["retries"]
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["workers"] or buyers) as pool:
+                results = list(pool.map(self._buy, users))
+            elapsed = time.perf_counter() - started
+            self._report(product, stock, items, results, elapsed)
+        finally:
+            if not options["keep"]:
+                self._clear()
+
+    def _buy(self, user):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    checkout(user)
+                    outcome = "ok"
+                    break
+                except CheckoutError:
+                    outcome = "conflict"
+                    break
+                except DatabaseError:
+                    # Deadlock / lock timeout: transakcija je poništena, kupac pokušava ponovo
+                    time.sleep(0.005 * (attempt + 1))
+        finally:
+            # Svaka nit ima svoju konekciju
+            connection.close()
+        return outcome, (time.perf_counter() - started) * 1000
+
+    def _report(self, product, stock, items, results, elapsed):
+        outcomes = [outcome for outcome, _ in results]
+        latencies = sorted(latency for _, latency in results)
+        succeeded = outcomes.count("ok")
+        sold = OrderItem.objects.filter(product=product).aggregate(total=Sum("quantity"))["total"] or 0
+        remaining = Inventory.objects.filter(product=product).aggregate(total=Sum("stock"))["total"]
+
+        self.stdout.write(
+            f"Kupaca: {len(results)}  uspješno: {succeeded}  "
+            f"bez zalihe: {outcomes.count('conflict')}  greške baze: {outcomes.count('error')}"
+        )
+        self.stdout.write(f"Prodato: {sold} / zaliha {stock}  preostalo: {remaining}")
+        self.stdout.write(
+            f"Trajanje: {elapsed:.3f}s  propusnost: {len(results) / elapsed:.1f} checkout/s  "
+            f"latencija p50: {statistics.median(latencies):.1f}ms  "
+            f"max: {latencies[-1]:.1f}ms"
+        )
+
+        expected = min(stock // items, len(results))
+        if sold > stock or remaining != stock - sold or sold != succeeded * items:
+            raise CommandError("Overselling ili neusklađena zaliha!")
+        if succeeded != expected and not outcomes.count("error"):
+            raise CommandError(f"Očekivano {expected} uspješnih kupovina, dobijeno {succeeded}.")
+        self.stdout.write(self.style.SUCCESS("Nema overselling-a."))
+
+    def _clear(self):
+        Order.objects.filter(user__username__startswith=f"{PREFIX.lower()}-").delete()
+        User.objects.filter(username__startswith=f"{PREFIX.lower()}-").delete()
+        Product.objects.filter(sku=PREFIX).delete()
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from store.ledger import compact
+
+
+class Command(BaseCommand):
+    help = "Sažima ledger zalihe: neprimijenjena kretanja u brojače i dnevni snapshoti."
+
+    def handle(self, *args, **options):
+        applied, snapshots = compact()
+        self.stdout.write(self.style.SUCCESS(f"Primijenjeno kretanja: {applied}, snapshota: {snapshots}"))
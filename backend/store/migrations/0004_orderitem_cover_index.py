@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0008_category_low_stock_threshold'),
+        ('store', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['order', 'product', 'quantity', 'final_price'], name='store_item_order_cover_idx'),
+        ),
+    ]
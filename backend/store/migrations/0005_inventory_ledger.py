@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0008_category_low_stock_threshold'),
+        ('store', '0004_orderitem_cover_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('opening', 'Početno stanje'), ('receipt', 'Prijem'), ('sale', 'Prodaja'), ('return', 'Povrat'), ('adjustment', 'Korekcija')], max_length=20)),
+                ('reference', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('applied', models.BooleanField(default=False)),
+                ('inventory', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movements', to='store.inventory')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='store.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movements', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['product', 'created_at'], name='store_move_product_time_idx'), models.Index(fields=['created_at'], name='store_move_time_idx'), models.Index(fields=['applied', 'id'], name='store_move_pending_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField()),
+                ('stock', models.IntegerField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='shop.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['taken_at'], name='store_snapshot_time_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'taken_at'), name='store_snapshot_product_time')],
+            },
+        ),
+    ]
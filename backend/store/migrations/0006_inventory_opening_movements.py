@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:46
+
+from django.db import migrations
+
+
+def opening_movements(apps, schema_editor):
+    """
+    Trenutna zaliha postojećih redova postaje početno (primijenjeno)
+    kretanje, da zbir ledgera odgovara brojačima.
+    """
+    Inventory = apps.get_model("store", "Inventory")
+    InventoryMovement = apps.get_model("store", "InventoryMovement")
+    batch = []
+    for inventory_id, product_id, stock in (
+        Inventory.objects.exclude(stock=0).values_list("id", "product_id", "stock").iterator()
+    ):
+        batch.append(InventoryMovement(
+            product_id=product_id, inventory_id=inventory_id, delta=stock, reason="opening", applied=True,
+        ))
+        if len(batch) >= 1000:
+            InventoryMovement.objects.bulk_create(batch)
+            batch = []
+    InventoryMovement.objects.bulk_create(batch)
+
+
+def remove_opening_movements(apps, schema_editor):
+    apps.get_model("store", "InventoryMovement").objects.filter(reason="opening").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0005_inventory_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(opening_movements, remove_opening_movements),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from core.models import User
-from shop.models import Product
+from shop.models import InventoryQuerySet, Product, StockMixin
 
 
 class Payment(models.Model):
@@ -29,6 +30,15 @@ class Order(models.Model):
     time_updated = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=50, default="pending")
 
+    class Meta:
+        indexes = [
+            # Grupisanje/filtriranje po vremenu (orders-by-month, rollup po danu)
+            models.Index(fields=["time_created"], name="store_order_created_idx"),
+            models.Index(fields=["status", "time_created"], name="store_order_status_created_idx"),
+            # High-water mark inkrementalnog rollupa
+            models.Index(fields=["time_updated"], name="store_order_updated_idx"),
+        ]
+
     def __str__(self):
         return f"Order {self.id} by {self.user.username}"
 
@@ -39,6 +49,16 @@ class OrderItem(models.Model):
     quantity = models.IntegerField(default=1)
     final_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Rang liste: narudžbe iz prozora (store_order_created_idx) -> stavke
+            # samo iz indeksa, bez čitanja redova tabele
+            models.Index(
+                fields=["order", "product", "quantity", "final_price"],
+                name="store_item_order_cover_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.order.id} - {self.product.name}"
 
@@ -51,6 +71,12 @@ class CartItem(models.Model):
     time_canceled = models.DateTimeField(blank=True, null=True)
     status = models.CharField(max_length=50, default="active")
 
+    class Meta:
+        indexes = [
+            # Aktivna korpa korisnika: ?user=..&status=active
+            models.Index(fields=["user", "status"], name="store_cart_user_status_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.product.name}"
 
@@ -71,16 +97,146 @@ class Discount(models.Model):
         return f"{self.amount} {self.discount_type.type}"
 
 
-class Inventory(models.Model):
+class Inventory(StockMixin, models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity_in = models.IntegerField(default=0)
     quantity_out = models.IntegerField(default=0)
+    # Zaliha se čuva i indeksira u bazi, pa se filtrira/sortira bez učitavanja redova
+    stock = models.GeneratedField(
+        expression=models.F("quantity_in") - models.F("quantity_out"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        db_index=True,
+    )
     status = models.CharField(max_length=50, default="available")
     discount = models.ForeignKey(Discount, on_delete=models.SET_NULL, null=True, blank=True)
 
-    @property
-    def stock(self):
-        return self.quantity_in - self.quantity_out
+    objects = InventoryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["product", "status"], name="store_inv_product_status_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Za upis razlike u InventoryMovement pri save()
+        instance._loaded_stock = instance.loaded_stock()
+        return instance
+
+    def loaded_stock(self):
+        quantity_in = self.__dict__.get("quantity_in")
+        quantity_out = self.__dict__.get("quantity_out")
+        if quantity_in is None or quantity_out is None:
+            return None
+        return quantity_in - quantity_out
+
+    def save(self, *args, **kwargs):
+        """
+        Ručna izmjena brojača (admin, PUT/PATCH, novi red) se bilježi kao
+        već primijenjeno kretanje zalihe.
+        """
+        loaded = getattr(self, "_loaded_stock", None) if self.pk else 0
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            current = self.quantity_in - self.quantity_out
+            if loaded is not None and current != loaded:
+                InventoryMovement.objects.create(
+                    product_id=self.product_id,
+                    inventory=self,
+                    delta=current - loaded,
+                    reason=InventoryMovement.ADJUSTMENT,
+                    applied=True,
+                )
+        self._loaded_stock = current
+
+    def adjust(self, received=0, shipped=0, reason=None, order=None, reference=""):
+        """
+        Atomska promjena brojača uz kretanja u ledgeru (ulaz i izlaz posebno).
+        Vraća False (bez kretanja) ako zaliha nije dovoljna za izlaz.
+        """
+        with transaction.atomic():
+            if not super().adjust(received=received, shipped=shipped):
+                return False
+            movements = []
+            if received:
+                movements.append((received, reason or InventoryMovement.RECEIPT))
+            if shipped:
+                movements.append((-shipped, reason or InventoryMovement.SALE))
+            InventoryMovement.objects.bulk_create([
+                InventoryMovement(
+                    product_id=self.product_id, inventory=self, delta=delta, reason=movement_reason,
+                    order=order, reference=reference, applied=True,
+                )
+                for delta, movement_reason in movements
+            ])
+        self._loaded_stock = self.loaded_stock()
+        return True
 
     def __str__(self):
         return f"{self.product.name} - Stock: {self.stock}"
+
+
+class InventoryMovement(models.Model):
+    """
+    Append-only ledger promjena zalihe. Kretanja sa `applied=False` čekaju
+    sažimanje (`store.ledger.apply_pending`) koje ih upisuje u brojače
+    Inventory reda; checkout i `adjust` upisuju već primijenjena kretanja.
+    """
+
+    OPENING = "opening"
+    RECEIPT = "receipt"
+    SALE = "sale"
+    RETURN = "return"
+    ADJUSTMENT = "adjustment"
+    REASONS = [
+        (OPENING, "Početno stanje"),
+        (RECEIPT, "Prijem"),
+        (SALE, "Prodaja"),
+        (RETURN, "Povrat"),
+        (ADJUSTMENT, "Korekcija"),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="movements")
+    # Red inventara u koji se kretanje upisuje; bez njega prvi red proizvoda
+    inventory = models.ForeignKey(
+        Inventory, on_delete=models.SET_NULL, null=True, blank=True, related_name="movements"
+    )
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=REASONS)
+    order = models.ForeignKey(Order, on_delete=models.SET_NULL, null=True, blank=True)
+    reference = models.CharField(max_length=100, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    applied = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Zaliha u trenutku: snapshot + kretanja proizvoda nakon njega
+            models.Index(fields=["product", "created_at"], name="store_move_product_time_idx"),
+            models.Index(fields=["created_at"], name="store_move_time_idx"),
+            # Sažimanje: kretanja koja još nisu u brojačima
+            models.Index(fields=["applied", "id"], name="store_move_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} {self.delta:+d} ({self.reason})"
+
+
+class InventorySnapshot(models.Model):
+    """
+    Zaliha proizvoda (zbir svih kretanja) na kraju perioda sažimanja.
+    """
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="snapshots")
+    taken_at = models.DateTimeField()
+    stock = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product", "taken_at"], name="store_snapshot_product_time"),
+        ]
+        indexes = [models.Index(fields=["taken_at"], name="store_snapshot_time_idx")]
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.taken_at}: {self.stock}"
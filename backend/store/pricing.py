@@ -0,0 +1,60 @@
+"""
+Cijena nakon popusta (store.Discount), zajednička za listing i checkout.
+
+Popust važi za proizvod ako je vezan direktno (`Discount.product`) ili
+preko inventara (`Inventory.discount`). Tip popusta čiji naziv sadrži
+"percent"/"procen"/"%" je procentualan, ostali su fiksni iznos. Kada
+proizvod ima više popusta, primjenjuje se onaj koji daje najnižu cijenu
+(popusti se ne sabiraju).
+"""
+
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from .models import Discount, Inventory
+
+PERCENT_MARKERS = ("percent", "procen", "%")
+CENT = Decimal("0.01")
+
+
+def is_percentage(discount_type):
+    name = (discount_type or "").lower()
+    return any(marker in name for marker in PERCENT_MARKERS)
+
+
+def apply_discount(price, amount, discount_type):
+    price = Decimal(price)
+    amount = Decimal(amount)
+    if is_percentage(discount_type):
+        discounted = price * (Decimal(100) - amount) / Decimal(100)
+    else:
+        discounted = price - amount
+    return max(Decimal(0), discounted).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def discounts_for_products(product_ids):
+    """
+    Mapa product_id -> lista (iznos, tip) za sve popuste koji važe za proizvod.
+    Dva upita bez obzira na broj proizvoda.
+    """
+    product_ids = list(product_ids)
+    result = defaultdict(set)
+    direct = Discount.objects.filter(product_id__in=product_ids).values_list(
+        "product_id", "amount", "discount_type__type"
+    )
+    via_inventory = Inventory.objects.filter(
+        product_id__in=product_ids, discount__isnull=False
+    ).values_list("product_id", "discount__amount", "discount__discount_type__type")
+    for product_id, amount, discount_type in list(direct) + list(via_inventory):
+        result[product_id].add((amount, discount_type))
+    return result
+
+
+def effective_price(price, discounts):
+    """
+    Najniža cijena koju daje neki od popusta (ili osnovna cijena).
+    """
+    best = Decimal(price).quantize(CENT)
+    for amount, discount_type in discounts:
+        best = min(best, apply_discount(price, amount, discount_type))
+    return best
@@ -1,5 +1,11 @@
 from rest_framework import serializers
-from .models import Payment, ShippingAddress, Order, OrderItem, CartItem, DiscountType, Discount, Inventory
+from core.models import User
+from shop.models import Product
+from shop.serializers import BulkListSerializer
+from .models import (
+    Payment, ShippingAddress, Order, OrderItem, CartItem, DiscountType, Discount, Inventory,
+    InventoryMovement,
+)
 
 
 class PaymentSerializer(serializers.ModelSerializer):
@@ -56,3 +62,43 @@ class InventorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Inventory
         fields = "__all__"
+
+
+class InventoryBulkSerializer(serializers.Serializer):
+    sku = serializers.CharField(max_length=100)
+    quantity_in = serializers.IntegerField(min_value=0)
+    quantity_out = serializers.IntegerField(min_value=0, required=False)
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+
+class InventoryMovementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InventoryMovement
+        fields = ["id", "product", "inventory", "delta", "reason", "order", "reference", "created_at", "applied"]
+        read_only_fields = ["created_at", "applied"]
+
+    def validate_delta(self, delta):
+        if delta == 0:
+            raise serializers.ValidationError("Promjena ne može biti 0.")
+        return delta
+
+    def validate(self, attrs):
+        inventory = attrs.get("inventory")
+        if inventory is not None and inventory.product_id != attrs["product"].pk:
+            raise serializers.ValidationError({"inventory": ["Red inventara pripada drugom proizvodu."]})
+        return attrs
+
+
+class StockHistorySerializer(serializers.Serializer):
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    days = serializers.IntegerField(min_value=1, max_value=366, default=30)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
+    payment = serializers.PrimaryKeyRelatedField(queryset=Payment.objects.all(), required=False, allow_null=True)
+    shipping_address = serializers.PrimaryKeyRelatedField(
+        queryset=ShippingAddress.objects.all(), required=False, allow_null=True
+    )
@@ -0,0 +1,8 @@
+from jobs.registry import task
+from .ledger import compact
+
+
+@task("store.compact_inventory")
+def compact_inventory_task():
+    applied, snapshots = compact()
+    return {"applied": applied, "snapshots": snapshots}
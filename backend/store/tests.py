@@ -1,3 +1,374 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from shop.models import Category, Product
+from .checkout import CheckoutError, checkout
+from .ledger import compact, stock_at, stock_history, take_snapshots
+from .models import (
+    CartItem, Discount, DiscountType, Inventory, InventoryMovement, InventorySnapshot, Order, OrderItem,
+)
+
+
+class OrderViewSetQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="kupac")
+        cls.products = Product.objects.bulk_create([
+            Product(name=f"Proizvod {i}", price=10 + i, sku=f"SKU-{i}")
+            for i in range(5)
+        ])
+
+    def _create_orders(self, count):
+        orders = Order.objects.bulk_create([Order(user=self.user) for _ in range(count)])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=product, quantity=2, final_price=product.price)
+            for order in orders
+            for product in self.products[:3]
+        ])
+
+    def test_list_query_count_is_constant(self):
+        url = reverse("order-list")
+        created = 0
+        for total in (1, 10, 1000):
+            with self.subTest(orders=total):
+                self._create_orders(total - created)
+                created = total
+                # COUNT za paginaciju + narudžbe sa korisnikom + prefetch stavki sa proizvodom
+                with self.assertNumQueries(3):
+                    response = self.client.get(url, {"page_size": total})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data["count"], total)
+                first = response.data["results"][0]
+                self.assertEqual(first["user_name"], "kupac")
+                self.assertEqual(len(first["items"]), 3)
+                self.assertEqual(first["items"][0]["product_name"], "Proizvod 0")
+
+
+class CheckoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create(username="kupac")
+        cls.other = User.objects.create(username="drugi")
+        cls.product = Product.objects.create(name="Laptop", price=200, sku="LAP-1")
+        cls.inventory = Inventory.objects.create(product=cls.product, quantity_in=3)
+        percentage = DiscountType.objects.create(type="Percentage")
+        Discount.objects.create(amount=25, discount_type=percentage, product=cls.product)
+
+    def _fill_cart(self, user, count):
+        CartItem.objects.bulk_create([CartItem(user=user, product=self.product) for _ in range(count)])
+
+    def test_checkout_creates_order_and_decrements_stock(self):
+        self._fill_cart(self.buyer, 2)
+        response = self.client.post(reverse("checkout"), {"user": self.buyer.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["items"]), 1)
+        item = response.data["items"][0]
+        self.assertEqual(item["quantity"], 2)
+        self.assertEqual(item["final_price"], "150.00")
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.stock, 1)
+        self.assertFalse(CartItem.objects.filter(user=self.buyer, status="active").exists())
+
+    def test_second_buyer_cannot_oversell(self):
+        self._fill_cart(self.buyer, 2)
+        self._fill_cart(self.other, 2)
+        first = self.client.post(reverse("checkout"), {"user": self.buyer.pk}, content_type="application/json")
+        second = self.client.post(reverse("checkout"), {"user": self.other.pk}, content_type="application/json")
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual(second.data["stock"][0]["available"], 1)
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.stock, 1)
+        self.assertEqual(Order.objects.filter(user=self.other).count(), 0)
+        self.assertEqual(CartItem.objects.filter(user=self.other, status="active").count(), 2)
+
+    def test_empty_cart(self):
+        response = self.client.post(reverse("checkout"), {"user": self.buyer.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(connection.features.has_select_for_update, "Baza ne zaključava redove (SELECT ... FOR UPDATE)")
+class ConcurrentCheckoutTests(TransactionTestCase):
+    def test_parallel_buyers_cannot_oversell(self):
+        product = Product.objects.create(name="Laptop", price=200, sku="LAP-1")
+        inventory = Inventory.objects.create(product=product, quantity_in=5)
+        User.objects.bulk_create([User(username=f"paralelni-{i}") for i in range(12)])
+        buyers = list(User.objects.filter(username__startswith="paralelni-"))
+        CartItem.objects.bulk_create([CartItem(user_id=buyer.pk, product_id=product.pk) for buyer in buyers])
+
+        start = threading.Barrier(len(buyers))
+        outcomes = []
+
+        def buy(buyer):
+            start.wait()
+            try:
+                # Deadlock / lock timeout poništava transakciju; kupac pokušava ponovo
+                for attempt in range(20):
+                    try:
+                        checkout(buyer)
+                        outcomes.append("ok")
+                        return
+                    except CheckoutError:
+                        outcomes.append("conflict")
+                        return
+                    except DatabaseError:
+                        time.sleep(0.01 * (attempt + 1))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buy, args=(buyer,)) for buyer in buyers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(outcomes), ["conflict"] * 7 + ["ok"] * 5)
+        inventory.refresh_from_db()
+        self.assertEqual((inventory.quantity_out, inventory.stock), (5, 0))
+        self.assertEqual(OrderItem.objects.filter(product=product).count(), 5)
+
+
+class LeanListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username="kupac šđ")
+        products = Product.objects.bulk_create([
+            Product(name=f"Proizvod „{i}“", price=f"{10 + i}.05", sku=f"SKU-{i}")
+            for i in range(3)
+        ])
+        percentage = DiscountType.objects.create(type="Percentage")
+        discount = Discount.objects.create(amount=10, discount_type=percentage, product=products[0])
+        Inventory.objects.create(product=products[0], quantity_in=5, quantity_out=5, discount=discount)
+        Inventory.objects.create(product=products[1], quantity_in=40)
+        orders = Order.objects.bulk_create([Order(user=user, status="shipped"), Order(user=user), Order(user=user)])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=orders[0], product=products[0], quantity=1, final_price="9.05"),
+            OrderItem(order=orders[0], product=products[2], quantity=3, final_price="12.05"),
+            OrderItem(order=orders[2], product=products[1], quantity=2, final_price=None),
+        ])
+
+    def _assert_identical(self, url_name, params):
+        with self.settings(LEAN_LIST_SERIALIZERS=True):
+            lean = self.client.get(reverse(url_name), params)
+        with self.settings(LEAN_LIST_SERIALIZERS=False):
+            full = self.client.get(reverse(url_name), params)
+        self.assertEqual(lean.status_code, 200)
+        self.assertEqual(lean.content, full.content)
+        self.assertEqual(lean.content, JSONRenderer().render(full.data))
+
+    def test_order_list_is_byte_identical(self):
+        self._assert_identical("order-list", {"page_size": 10})
+
+    def test_inventory_list_is_byte_identical(self):
+        for params in ({}, {"ordering": "-stock"}, {"status": "out_of_stock"}):
+            with self.subTest(**params):
+                self._assert_identical("inventory-list", params)
+
+
+class InventoryLedgerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="kupac")
+        cls.product = Product.objects.create(name="Laptop", price=200, sku="LAP-1")
+        cls.inventory = Inventory.objects.create(product=cls.product, quantity_in=10)
+
+    def _movements(self):
+        return list(
+            InventoryMovement.objects.filter(product=self.product).order_by("id").values_list("delta", "reason", "applied")
+        )
+
+    def test_counter_writes_are_recorded_as_applied(self):
+        self.inventory.adjust(received=5, shipped=2)
+        CartItem.objects.create(user=self.user, product=self.product)
+        self.client.post(reverse("checkout"), {"user": self.user.pk}, content_type="application/json")
+        self.assertEqual(self._movements(), [
+            (10, "adjustment", True), (5, "receipt", True), (-2, "sale", True), (-1, "sale", True),
+        ])
+        sale = InventoryMovement.objects.filter(product=self.product).last()
+        self.assertEqual(sale.order, Order.objects.get())
+
+    def test_posted_movements_are_applied_by_compaction(self):
+        response = self.client.post(reverse("inventorymovement-list"), [
+            {"product": self.product.pk, "delta": 7, "reason": "receipt", "reference": "PR-1"},
+            {"product": self.product.pk, "delta": -3, "reason": "adjustment"},
+        ], content_type="application/json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data, {"recorded": 2})
+        # Inventory red se ne dira dok se kretanja ne sažmu
+        self.inventory.refresh_from_db()
+        self.assertEqual((self.inventory.quantity_in, self.inventory.quantity_out), (10, 0))
+
+        applied, _ = compact()
+        self.assertEqual(applied, 2)
+        self.inventory.refresh_from_db()
+        self.assertEqual((self.inventory.quantity_in, self.inventory.quantity_out, self.inventory.stock), (17, 3, 14))
+        self.assertFalse(InventoryMovement.objects.filter(applied=False).exists())
+
+    def test_rejects_zero_delta_and_foreign_inventory(self):
+        other = Product.objects.create(name="Miš", price=5, sku="MIS-1")
+        response = self.client.post(reverse("inventorymovement-list"), {
+            "product": other.pk, "inventory": self.inventory.pk, "delta": 0, "reason": "receipt",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("delta", response.data)
+
+    def test_stock_at_uses_snapshot_and_bounded_scan(self):
+        now = timezone.now()
+        InventoryMovement.objects.filter(product=self.product).update(created_at=now - timedelta(days=3))
+        for days_ago, delta in ((2, -4), (1, 6)):
+            InventoryMovement.objects.create(
+                product=self.product, delta=delta, reason="adjustment", applied=True,
+                created_at=now - timedelta(days=days_ago),
+            )
+
+        self.assertGreater(take_snapshots(now), 0)
+        self.assertEqual(take_snapshots(now), 0)
+        self.assertTrue(InventorySnapshot.objects.filter(product=self.product).exists())
+
+        with self.assertNumQueries(2):
+            self.assertEqual(stock_at(self.product.pk, now - timedelta(days=1, hours=12)), 6)
+        self.assertEqual(stock_at(self.product.pk, now), 12)
+        self.assertEqual(stock_at(self.product.pk, now - timedelta(days=5)), 0)
+
+        history = stock_history(self.product.pk, days=4, now=now)
+        self.assertEqual([point["stock"] for point in history], [10, 6, 12, 12])
+
+
+class InventoryBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # "low_stock" ispod 30 za strogu kategoriju, inače ispod 10
+        strict = Category.objects.create(name="Stroga", low_stock_threshold=30)
+        cls.laptop = Product.objects.create(name="Laptop", price=200, sku="LAP-1")
+        cls.mouse = Product.objects.create(name="Miš", price=5, sku="MIS-1", category=strict)
+        cls.inventory = Inventory.objects.create(product=cls.laptop, quantity_in=10, quantity_out=2)
+
+    def _bulk(self, rows):
+        return self.client.post(reverse("inventory-bulk"), rows, content_type="application/json")
+
+    def test_upsert_recomputes_status_and_records_movements(self):
+        response = self._bulk([
+            {"sku": "LAP-1", "quantity_in": 12},
+            {"sku": "MIS-1", "quantity_in": 20, "quantity_out": 2},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"created": 1, "updated": 1, "errors": []})
+
+        self.inventory.refresh_from_db()
+        self.assertEqual((self.inventory.quantity_in, self.inventory.quantity_out), (12, 2))
+        self.assertEqual(self.inventory.status, "available")
+        # 18 je ispod praga kategorije (30)
+        mouse = Inventory.objects.get(product=self.mouse)
+        self.assertEqual((mouse.stock, mouse.status), (18, "low_stock"))
+
+        movements = InventoryMovement.objects.filter(reason="adjustment").order_by("product_id", "id")
+        self.assertEqual(
+            list(movements.values_list("product_id", "inventory_id", "delta", "applied")),
+            [(self.laptop.pk, self.inventory.pk, 8, True), (self.laptop.pk, self.inventory.pk, 2, True),
+             (self.mouse.pk, mouse.pk, 18, True)],
+        )
+
+    def test_new_rows_get_ids_without_returning(self):
+        # Kao na MySQL-u: bulk_create ne vraća id-eve novih redova
+        features = type(connections[DEFAULT_DB_ALIAS].features)
+        with mock.patch.object(features, "can_return_rows_from_bulk_insert", False):
+            response = self._bulk([{"sku": "MIS-1", "quantity_in": 4}])
+        self.assertEqual(response.data["created"], 1)
+        movement = InventoryMovement.objects.get(product=self.mouse)
+        self.assertEqual((movement.inventory, movement.delta), (Inventory.objects.get(product=self.mouse), 4))
+
+    def test_row_errors(self):
+        response = self._bulk([
+            {"sku": "LAP-1", "quantity_in": 12},
+            {"sku": "LAP-1", "quantity_in": 13},
+            {"sku": "NEMA-1", "quantity_in": 1},
+            {"sku": "MIS-1", "quantity_in": -1},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["updated"]), (0, 1))
+        self.assertEqual(
+            [(error["index"], set(error["errors"])) for error in response.data["errors"]],
+            [(1, {"sku"}), (2, {"sku"}), (3, {"quantity_in"})],
+        )
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.quantity_in, 12)
+
+    def test_all_rows_invalid(self):
+        response = self._bulk([{"sku": "NEMA-1", "quantity_in": 1}, {"sku": "LAP-1"}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.data["created"], response.data["updated"]), (0, 0))
+        self.assertEqual([error["index"] for error in response.data["errors"]], [0, 1])
+        # Samo kretanje od kreiranja reda u setUpTestData
+        self.assertEqual(InventoryMovement.objects.count(), 1)
+
+
+class StockAdjustmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.phone = Product.objects.create(name="Telefon", price=300, sku="TEL-1")
+        cls.case = Product.objects.create(name="Maska", price=10, sku="MAS-1")
+        cls.cable = Product.objects.create(name="Kabl", price=5, sku="KAB-1")
+        cls.inventory = Inventory.objects.create(product=cls.phone, quantity_in=7)
+        Inventory.objects.create(product=cls.case, quantity_in=30)
+        Inventory.objects.create(product=cls.cable, quantity_in=2, quantity_out=2)
+
+    def _ids(self, **params):
+        response = self.client.get(reverse("inventory-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.data["results"]]
+
+    def _adjust(self, **data):
+        return self.client.post(
+            reverse("inventory-adjust", args=[self.inventory.pk]), data, content_type="application/json"
+        )
+
+    def test_stock_filters_and_ordering(self):
+        phone, case, cable = Inventory.objects.order_by("id").values_list("id", flat=True)
+        self.assertEqual(self._ids(stock__gte=7), [phone, case])
+        self.assertEqual(self._ids(stock__lte=7), [phone, cable])
+        self.assertEqual(self._ids(stock__gte=1, stock__lte=10), [phone])
+        self.assertEqual(self._ids(ordering="stock"), [cable, phone, case])
+        self.assertEqual(self._ids(ordering="-stock"), [case, phone, cable])
+
+    def test_adjust_updates_stock_status_and_ledger(self):
+        response = self._adjust(received=5, shipped=9)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["stock"], response.data["status"]), (3, "low_stock"))
+        movements = InventoryMovement.objects.filter(inventory=self.inventory).order_by("id")
+        self.assertEqual(
+            list(movements.values_list("delta", "reason")), [(7, "adjustment"), (5, "receipt"), (-9, "sale")]
+        )
+
+    def test_adjust_below_zero_conflicts(self):
+        response = self._adjust(shipped=100)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["available"], 7)
+        # Ulaz iz istog zahtjeva se računa, ali ni on nije dovoljan
+        self.assertEqual(self._adjust(received=2, shipped=10).status_code, 409)
+        self.inventory.refresh_from_db()
+        self.assertEqual((self.inventory.quantity_in, self.inventory.quantity_out, self.inventory.stock), (7, 0, 7))
+        self.assertEqual(InventoryMovement.objects.filter(inventory=self.inventory).count(), 1)
+
+        # Tačno do nule je dozvoljeno
+        response = self._adjust(shipped=7)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["stock"], response.data["status"]), (0, "out_of_stock"))
+
+    def test_recompute_status_endpoint(self):
+        Inventory.objects.update(status="zastarjelo")
+        response = self.client.post(f"{reverse('inventory-recompute-status')}?stock__lte=7")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertEqual(
+            dict(Inventory.objects.values_list("product__sku", "status")),
+            {"TEL-1": "low_stock", "MAS-1": "zastarjelo", "KAB-1": "out_of_stock"},
+        )
@@ -3,7 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     PaymentViewSet, ShippingAddressViewSet, OrderViewSet, OrderItemViewSet,
     CartItemViewSet, DiscountTypeViewSet, DiscountViewSet, InventoryViewSet,
-    orders_by_month
+    InventoryMovementViewSet, checkout_view,
 )
 
 # Router za standardne ViewSet-ove
@@ -16,9 +16,10 @@ router.register(r'cart-items', CartItemViewSet)
 router.register(r'discount-types', DiscountTypeViewSet)
 router.register(r'discounts', DiscountViewSet)
 router.register(r'inventory', InventoryViewSet)
+router.register(r'inventory-movements', InventoryMovementViewSet)
 
 # Custom rute
 urlpatterns = [
     path('', include(router.urls)),
-    path('orders-by-month/', orders_by_month, name="orders-by-month"),
+    path('checkout/', checkout_view, name="checkout"),
 ]
@@ -1,19 +1,28 @@
-from rest_framework import viewsets
-from rest_framework.decorators import api_view
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
-from django.db.models.functions import TruncMonth
-from django.db.models import Count
+from django.db.models import Prefetch
+
+from ecommerce.cache import CachedResponseMixin
+from ecommerce.lean import LeanListMixin
+from shop.bulk import MAX_ROWS, bulk_response
+from shop.views import StockAdjustmentMixin
 
 from .models import (
     Payment, ShippingAddress, Order, OrderItem,
-    CartItem, DiscountType, Discount, Inventory
+    CartItem, DiscountType, Discount, Inventory, InventoryMovement,
 )
 
 from .serializers import (
     PaymentSerializer, ShippingAddressSerializer, OrderSerializer,
     OrderItemSerializer, CartItemSerializer, DiscountTypeSerializer,
-    DiscountSerializer, InventorySerializer
+    DiscountSerializer, InventorySerializer, InventoryBulkSerializer, CheckoutSerializer,
+    InventoryMovementSerializer, StockHistorySerializer,
 )
+from .bulk import upsert_inventory
+from .checkout import CheckoutError, checkout
+from .filters import InventoryFilter, InventoryMovementFilter
+from .ledger import record_movements, schedule_compaction, stock_history
 
 
 # ---------- ViewSets ----------
@@ -27,10 +36,28 @@ class ShippingAddressViewSet(viewsets.ModelViewSet):
     serializer_class = ShippingAddressSerializer
 
 
-class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.all()
+class OrderViewSet(LeanListMixin, viewsets.ModelViewSet):
+    queryset = Order.objects.all().order_by("id")
     serializer_class = OrderSerializer
 
+    def get_queryset(self):
+        """
+        Učitava korisnika i stavke (sa proizvodom) unaprijed, tako da lista
+        narudžbi ima konstantan broj upita bez obzira na broj redova.
+        """
+        items = OrderItem.objects.select_related("product").only(
+            "id", "order_id", "product_id", "product__name", "quantity", "final_price"
+        )
+        return (
+            super().get_queryset()
+            .select_related("user")
+            .prefetch_related(Prefetch("items", queryset=items))
+            .only(
+                "id", "user__username", "payment_id", "shipping_address_id",
+                "time_created", "time_updated", "status",
+            )
+        )
+
 
 class OrderItemViewSet(viewsets.ModelViewSet):
     queryset = OrderItem.objects.all()
@@ -47,26 +74,90 @@ class DiscountTypeViewSet(viewsets.ModelViewSet):
     serializer_class = DiscountTypeSerializer
 
 
-class DiscountViewSet(viewsets.ModelViewSet):
-    queryset = Discount.objects.all()
+class DiscountViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = (Discount,)
+    queryset = Discount.objects.all().order_by("id")
     serializer_class = DiscountSerializer
 
 
-class InventoryViewSet(viewsets.ModelViewSet):
-    queryset = Inventory.objects.all()
+class InventoryViewSet(StockAdjustmentMixin, LeanListMixin, viewsets.ModelViewSet):
+    queryset = Inventory.objects.all().order_by("id")
     serializer_class = InventorySerializer
+    filterset_class = InventoryFilter
+    ordering_fields = ["id", "quantity_in", "quantity_out", "stock"]
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Masovni upsert zaliha po SKU proizvoda, sa statusom izračunatim za
+        sve redove odjednom.
+        """
+        serializer = InventoryBulkSerializer(data=request.data, many=True, max_length=MAX_ROWS)
+        valid, errors = serializer.partition()
+        created, updated, upsert_errors = upsert_inventory(valid)
+        return bulk_response(created, updated, errors + upsert_errors)
+
 
 
-# ---------- Custom Analytics Endpoint ----------
-@api_view(["GET"])
-def orders_by_month(request):
+class InventoryMovementViewSet(
+    mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+):
     """
-    Vraća broj narudžbi grupisanih po mesecima.
+    Ledger kretanja zalihe: samo dodavanje i čitanje (bez izmjene/brisanja).
+    """
+
+    queryset = InventoryMovement.objects.all().order_by("-id")
+    serializer_class = InventoryMovementSerializer
+    filterset_class = InventoryMovementFilter
+    ordering_fields = ["id", "created_at", "delta"]
+
+    def create(self, request, *args, **kwargs):
+        """
+        Upisuje jedno kretanje ili listu kretanja bez diranja Inventory reda;
+        brojači se ažuriraju u pozadinskom sažimanju. Vraća 202 i broj upisanih.
+        """
+        many = isinstance(request.data, list)
+        extra = {"max_length": MAX_ROWS} if many else {}
+        serializer = self.get_serializer(data=request.data, many=many, **extra)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data if many else [serializer.validated_data]
+        recorded = record_movements(InventoryMovement(**row) for row in rows)
+        schedule_compaction()
+        return Response({"recorded": recorded}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"])
+    def history(self, request):
+        """
+        Zaliha proizvoda na kraju svakog dana: `?product=3&days=30`.
+        """
+        serializer = StockHistorySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        product = serializer.validated_data["product"]
+        return Response(stock_history(product.pk, days=serializer.validated_data["days"]))
+
+
+# ---------- Checkout ----------
+@api_view(["POST"])
+def checkout_view(request):
+    """
+    Pretvara aktivnu korpu u narudžbu u jednoj transakciji.
+
+    Tijelo: `{"user": 1, "payment": 2, "shipping_address": 3}` — `user` se
+    šalje samo ako zahtjev nije autentifikovan. Vraća 201 sa narudžbom,
+    400 za praznu korpu i 409 kada zaliha nije dovoljna.
     """
-    data = (
-        Order.objects.annotate(month=TruncMonth("time_created"))
-        .values("month")
-        .annotate(order_count=Count("id"))
-        .order_by("month")
-    )
-    return Response(data)
+    serializer = CheckoutSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    user = request.user if request.user.is_authenticated else data.get("user")
+    if user is None:
+        return Response({"user": ["Korisnik je obavezan."]}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        order = checkout(user, payment=data.get("payment"), shipping_address=data.get("shipping_address"))
+    except CheckoutError as error:
+        code = status.HTTP_409_CONFLICT if error.conflict else status.HTTP_400_BAD_REQUEST
+        return Response(error.errors, status=code)
+
+    order = Order.objects.select_related("user").prefetch_related("items__product").get(pk=order.pk)
+    return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)